@@ -1,7 +1,6 @@
 import json
 import re
 import os
-import time # 시간 지연을 위해 time 모듈 추가
 import argparse # 인자 처리를 위해 추가
 import datetime # 파일 저장을 위해 datetime 모듈 추가
 from glob import glob
@@ -18,6 +17,8 @@ from langchain_core.runnables import RunnablePassthrough, RunnableLambda, Runnab
 from langchain.retrievers.multi_query import MultiQueryRetriever
 import sys
 from langchain_core.embeddings import Embeddings
+from search_cache import cached_search
+from rate_limiter import get_limiter, limited_call
 
 # --- 0. 상수 정의 ---
 VECTOR_DB_PATH = "chroma_db_bge_m3_ko"
@@ -94,42 +95,48 @@ class CustomSentenceTransformerEmbeddings(Embeddings):
         return self.model.encode([text], normalize_embeddings=True)[0].tolist()
 
 # --- 웹 검색 기능 추가 ---
+def fetch_search_results(search_term: str) -> str:
+    """DuckDuckGo로 검색하고 결과(최대 5개)를 포맷팅합니다. 결과가 없으면 빈 문자열을 반환합니다. (캐시에 저장되지 않음)"""
+    # duckduckgo-search 패키지를 설치해야 함: pip install duckduckgo-search
+    from duckduckgo_search import DDGS
+    
+    print(f"  🔍 웹 검색: '{search_term}'")
+    
+    # 검색 결과를 가져옵니다 (최대 5개). 고정 대기 대신 DuckDuckGo 공유 토큰 버킷으로 속도를 제한합니다.
+    results = limited_call(get_limiter("duckduckgo.com"), DDGS().text, search_term, max_results=5,
+                           is_empty=lambda r: not r)
+    
+    if not results:
+        return ""
+    
+    # 검색 결과를 포맷팅합니다
+    formatted_results = []
+    for i, result in enumerate(results, 1):
+        title = result.get('title', 'N/A')
+        snippet = result.get('body', 'N/A')
+        url = result.get('href', 'N/A')
+        
+        formatted_result = f"""
+[검색 결과 {i}]
+제목: {title}
+내용: {snippet}
+출처: {url}
+"""
+        formatted_results.append(formatted_result)
+    
+    return "\n".join(formatted_results)
+
 def web_search_company_info(company_name: str, search_query: str) -> str:
     """
     웹 검색을 통해 회사 정보를 찾습니다.
     DuckDuckGo를 사용하여 안전하고 개인정보 보호에 중점을 둔 검색을 수행합니다.
+    같은(정규화 기준) 검색어는 search_cache에 저장된 결과를 사용합니다.
     """
     try:
-        # duckduckgo-search 패키지를 설치해야 함: pip install duckduckgo-search
-        from duckduckgo_search import DDGS
-        
-        ddgs = DDGS()
         search_term = f"{company_name} {search_query}"
-        
-        print(f"  🔍 웹 검색: '{search_term}'")
-        
-        # 검색 결과를 가져옵니다 (최대 5개)
-        results = ddgs.text(search_term, max_results=5)
-        
-        if not results:
-            return "웹 검색 결과를 찾을 수 없습니다."
-        
-        # 검색 결과를 포맷팅합니다
-        formatted_results = []
-        for i, result in enumerate(results, 1):
-            title = result.get('title', 'N/A')
-            snippet = result.get('body', 'N/A')
-            url = result.get('href', 'N/A')
-            
-            formatted_result = f"""
-[검색 결과 {i}]
-제목: {title}
-내용: {snippet}
-출처: {url}
-"""
-            formatted_results.append(formatted_result)
-        
-        return "\n".join(formatted_results)
+        result = cached_search(search_term, fetch_search_results, backend="duckduckgo_text")
+        # 빈 결과는 캐시에 저장되지 않도록 검색 함수는 빈 문자열을 돌려주고, 안내 문구는 여기서 만듭니다.
+        return result or "웹 검색 결과를 찾을 수 없습니다."
         
     except ImportError:
         print("  ⚠️ duckduckgo-search 패키지가 설치되지 않았습니다.")
@@ -396,7 +403,6 @@ def generate_ipo_report(company_name: str):
             for query in search_queries[:2]:  # 처음 2개 쿼리만 사용
                 web_result = web_search_company_info(company_name, query)
                 web_results.append(f"검색쿼리: {query}\n{web_result}")
-                time.sleep(2)  # 웹 검색 간 지연
             
             web_context = "\n\n---\n\n".join(web_results)
         else:
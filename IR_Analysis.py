@@ -1,7 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Optional, TypedDict
 from datetime import date
-from langchain_ollama import ChatOllama
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_core.tools import tool
@@ -10,6 +9,9 @@ import glob
 import os
 import json
 import re
+from llm_gateway import get_llm, get_gateway
+from md_retriever import get_retriever
+from llm_cache import get_response_cache
 
 class StartupInvestmentInfo(BaseModel):
     company_name: Optional[str] = Field(None, description="Official company name or corporate name(회사명)")
@@ -79,38 +81,52 @@ class ExtractionState(TypedDict):
     verification_index: int  # 현재 검증 중인 필드 인덱스
     verified_fields: List[str]  # 검증 완료된 필드 목록
 
-# 2. LLM 준비
-llm = ChatOllama(
-    model="qwen3:32b",
-    base_url="http://192.168.120.102:11434",
-    temperature=0
-)
+# 2. LLM 준비 (공용 게이트웨이)
+llm = get_llm(temperature=0)
 
 parser = JsonOutputParser(pydantic_object=StartupInvestmentInfo)
 
-# 필드 추출 함수 (원래 방식으로 복원)
-def extract_fields(state: ExtractionState) -> ExtractionState:
-    """MD 파일에서 빈 필드들을 추출합니다."""
-    info = state["info"]
-    md_content = state["md_content"]
-    analysis_feedback = state["analysis_feedback"]
-    iteration = state["iteration"] + 1
-    
-    # 빈 필드들 찾기
-    fields_to_fill = [field for field in StartupInvestmentInfo.model_fields if getattr(info, field) is None]
-    field_descriptions = [StartupInvestmentInfo.model_fields[field].description for field in fields_to_fill]
-    
-    # 진행 상황 출력
-    filled_count = state["total_fields"] - len(fields_to_fill)
-    fill_ratio = filled_count / state["total_fields"] * 100
-    print(f"\n[Iteration {iteration}] Filled: {filled_count}/{state['total_fields']} ({fill_ratio:.1f}%) | Remaining: {len(fields_to_fill)}")
-    print(f"  Remaining fields: {fields_to_fill[:10]}{'...' if len(fields_to_fill) > 10 else ''}")
-    
-    if not fields_to_fill:
-        return state
-    
+# 3. 필드별 검색 설정
+USE_RETRIEVAL = True          # False면 매 프롬프트에 문서 전체를 넣습니다.
+RETRIEVAL_TOP_K = 4           # 필드(질의)당 가져올 청크 수
+RETRIEVAL_MIN_CHARS = 8000    # 이보다 짧은 문서는 검색 없이 전체를 사용
+FIELD_GROUP_SIZE = 8          # 추출 프롬프트 하나에 넣을 필드 수
+
+def use_retrieval(md_content: str) -> bool:
+    return USE_RETRIEVAL and len(md_content) >= RETRIEVAL_MIN_CHARS and get_retriever(md_content) is not None
+
+def field_query(field: str) -> str:
+    """필드 검색에 사용할 질의 (필드 설명)"""
+    return StartupInvestmentInfo.model_fields[field].description or field
+
+def build_context(md_content: str, queries: List[str]) -> str:
+    """질의와 관련된 청크만 모은 컨텍스트를 반환합니다. 검색을 쓰지 않으면 문서 전체를 반환합니다."""
+    if not use_retrieval(md_content):
+        return md_content
+    return get_retriever(md_content).context_for(queries, k=RETRIEVAL_TOP_K)
+
+def parse_json_response(content) -> dict:
+    """LLM 응답에서 <think> 블록을 제거하고 JSON 객체를 파싱합니다."""
+    try:
+        if isinstance(content, str):
+            cleaned_content = re.sub(r'<think>.*?</think>', '', content, flags=re.DOTALL).strip()
+            json_match = re.search(r'\{.*\}', cleaned_content, flags=re.DOTALL)
+            if json_match:
+                return json.loads(json_match.group())
+            print(f"Warning: No JSON found in response: {cleaned_content[:100]}...")
+            return {}
+        return content
+    except json.JSONDecodeError as e:
+        print(f"Warning: Failed to parse JSON response: {content[:100]}...")
+        print(f"JSON Error: {e}")
+        return {}
+
+def extract_field_group(iteration: int, group_index: int, fields: List[str], md_content: str, feedback_prompt: str) -> dict:
+    """필드 그룹 하나에 대해 관련 청크만 넣은 프롬프트로 값을 추출합니다."""
+    field_descriptions = [field_query(field) for field in fields]
+    context = build_context(md_content, field_descriptions)
+
     # 추출 프롬프트 (실제 LLM 호출용)
-    feedback_prompt = f"\nPrevious analysis feedback: {analysis_feedback}\n" if analysis_feedback else ""
     prompt = f"""
 You are an expert data extractor for Korean startup IR documents. Extract specific values from the MD file for the given fields.
 
@@ -124,11 +140,11 @@ CRITICAL RULES:
 
 MD document content:
 ```
-{md_content}
+{context}
 {feedback_prompt}
 ```
 
-Fields to extract: ```{dict(zip(fields_to_fill, field_descriptions))}```
+Fields to extract: ```{dict(zip(fields, field_descriptions))}```
 
 Be sure to write only what is in the MD document content. If you don't know, write None.
 Return ONLY a valid JSON object with the specified field names. Extract real values from the document, not placeholder data.
@@ -155,41 +171,60 @@ Return ONLY a valid JSON object with the specified field names. Extract real val
         f"For competitors: Look for competitive analysis sections\n"
         f"For last_updated: Look for document dates, publication dates\n\n"
         f"NUMBER CONVERSION: 억=100million, 천만=10million, 만=10thousand\n\n"
-        f"MD content: [MD_CONTENT_OMITTED - {len(md_content)} characters]\n\n"
+        f"MD content: [MD_CONTENT_OMITTED - {len(context)}/{len(md_content)} characters]\n\n"
         f"{feedback_prompt}"
-        f"Fields to extract: {dict(zip(fields_to_fill, field_descriptions))}\n\n"
+        f"Fields to extract: {dict(zip(fields, field_descriptions))}\n\n"
         f"Return ONLY a valid JSON object with the specified field names."
     )
     
-    with open(f"prompt/iteration_{iteration:02d}_extract_prompt.txt", "w", encoding="utf-8") as f:
+    prompt_name = f"prompt/iteration_{iteration:02d}_g{group_index + 1:02d}_extract"
+    with open(f"{prompt_name}_prompt.txt", "w", encoding="utf-8") as f:
         f.write(prompt_for_save)
-    print(f"  Prompt saved to: prompt/iteration_{iteration:02d}_extract_prompt.txt")
+    print(f"  Prompt saved to: {prompt_name}_prompt.txt")
     
-    print(f"  Requesting extraction of {len(fields_to_fill)} fields...")
     result = llm.invoke(prompt)
     
     # LLM 응답 저장
-    with open(f"prompt/iteration_{iteration:02d}_extract_response.txt", "w", encoding="utf-8") as f:
+    with open(f"{prompt_name}_response.txt", "w", encoding="utf-8") as f:
         f.write(str(result.content))
-    print(f"  Response saved to: prompt/iteration_{iteration:02d}_extract_response.txt")
+    print(f"  Response saved to: {prompt_name}_response.txt")
     
-    # 결과 처리
-    try:
-        if isinstance(result.content, str):
-            cleaned_content = re.sub(r'<think>.*?</think>', '', result.content, flags=re.DOTALL).strip()
-            json_match = re.search(r'\{.*\}', cleaned_content, flags=re.DOTALL)
-            if json_match:
-                json_str = json_match.group()
-                extracted_data = json.loads(json_str)
-            else:
-                print(f"Warning: No JSON found in response: {cleaned_content[:100]}...")
-                extracted_data = {}
-        else:
-            extracted_data = result.content
-    except json.JSONDecodeError as e:
-        print(f"Warning: Failed to parse JSON response: {result.content[:100]}...")
-        print(f"JSON Error: {e}")
-        extracted_data = {}
+    return parse_json_response(result.content)
+
+# 필드 추출 함수 (원래 방식으로 복원)
+def extract_fields(state: ExtractionState) -> ExtractionState:
+    """MD 파일에서 빈 필드들을 추출합니다."""
+    info = state["info"]
+    md_content = state["md_content"]
+    analysis_feedback = state["analysis_feedback"]
+    iteration = state["iteration"] + 1
+    
+    # 빈 필드들 찾기
+    fields_to_fill = [field for field in StartupInvestmentInfo.model_fields if getattr(info, field) is None]
+    
+    # 진행 상황 출력
+    filled_count = state["total_fields"] - len(fields_to_fill)
+    fill_ratio = filled_count / state["total_fields"] * 100
+    print(f"\n[Iteration {iteration}] Filled: {filled_count}/{state['total_fields']} ({fill_ratio:.1f}%) | Remaining: {len(fields_to_fill)}")
+    print(f"  Remaining fields: {fields_to_fill[:10]}{'...' if len(fields_to_fill) > 10 else ''}")
+    
+    if not fields_to_fill:
+        return state
+    
+    # 필드 그룹별로 관련 청크만 골라 추출 (그룹은 게이트웨이를 통해 동시에 실행)
+    feedback_prompt = f"\nPrevious analysis feedback: {analysis_feedback}\n" if analysis_feedback else ""
+    if use_retrieval(md_content):
+        groups = [fields_to_fill[i:i + FIELD_GROUP_SIZE] for i in range(0, len(fields_to_fill), FIELD_GROUP_SIZE)]
+    else:
+        groups = [fields_to_fill]
+    print(f"  Requesting extraction of {len(fields_to_fill)} fields in {len(groups)} group(s)...")
+    group_results = get_gateway().map(
+        lambda args: extract_field_group(iteration, *args, md_content, feedback_prompt),
+        list(enumerate(groups))
+    )
+    extracted_data = {}
+    for group_data in group_results:
+        extracted_data.update(group_data)
     
     # 무효한 값들 필터링 (Not specified, 데이터 없음 등은 null로 처리)
     invalid_values = {
@@ -258,6 +293,7 @@ def analyze_failure(state: ExtractionState) -> ExtractionState:
     # 빈 필드들 찾기
     failed_fields = [field for field in StartupInvestmentInfo.model_fields if getattr(info, field) is None]
     failed_fields_sample = failed_fields # 이제 모든 실패한 필드를 사용합니다.
+    context = build_context(md_content, [field_query(field) for field in failed_fields_sample])
     
     print("No progress detected. Running failure analysis...")
     
@@ -274,7 +310,7 @@ def analyze_failure(state: ExtractionState) -> ExtractionState:
         prompt_text += f"- {field_name} ({description})\\n"
 
     prompt_text += (
-        f"\\nIR Document Content:\\n```\\n{md_content}\\n```\\n\\n"
+        f"\\nIR Document Content:\\n```\\n{context}\\n```\\n\\n"
         "For EACH failed field, provide concise, actionable advice. Consider:\\n"
         "1.  Alternative Korean keywords or phrases to search for related to the field's description.\\n"
         "2.  Specific document sections, headers, or table structures where this type of information is typically found in Korean IR/business documents.\\n"
@@ -290,7 +326,7 @@ def analyze_failure(state: ExtractionState) -> ExtractionState:
     prompt_for_save = (
         "Analyze why these fields couldn't be extracted and provide actionable tips.\\n\\n"
         f"Failed fields: { [f'{fn} ({StartupInvestmentInfo.model_fields[fn].description})' for fn in failed_fields_sample] }\\n\\n"
-        f"MD content: [MD_CONTENT_OMITTED - {len(md_content)} characters]\\n\\n"
+        f"MD content: [MD_CONTENT_OMITTED - {len(context)}/{len(md_content)} characters]\\n\\n"
         "Response should be actionable extraction tips for each field."
     )
     
@@ -363,31 +399,23 @@ def should_continue(state: ExtractionState) -> str:
     # 그 외에는 계속 추출
     return "extract"
 
-# 필드 검증 함수
-def verify_field(state: ExtractionState) -> ExtractionState:
-    """채워진 필드값을 MD 파일과 대조하여 검증합니다."""
-    info = state["info"]
-    md_content = state["md_content"]
-    verification_index = state["verification_index"]
-    verified_fields = state["verified_fields"].copy()
-    
-    # 채워진 필드들만 가져오기
-    filled_fields = [(field, getattr(info, field)) for field in StartupInvestmentInfo.model_fields 
-                    if getattr(info, field) is not None]
-    
-    if verification_index >= len(filled_fields):
-        print("모든 필드 검증 완료!")
-        return {
-            **state,
-            "last_action": "verify_complete"
-        }
-    
-    current_field, current_value = filled_fields[verification_index]
+# 필드 검증 설정
+VERIFY_MODE = "batch"         # "batch": 여러 필드를 한 프롬프트로 동시 검증, "single": 필드 하나씩 검증
+VERIFY_BATCH_SIZE = 6         # 검증 프롬프트 하나에 넣을 필드 수
+
+VERIFY_RULES = """중요한 규칙:
+- 문서에 명시적으로 나와있는 정보만 유효하다고 판단
+- 추론이나 추측은 유효하지 않음
+- 숫자의 경우 단위와 정확한 값 확인
+- 날짜의 경우 정확한 형식 확인
+- 근거가 불분명하면 is_valid를 false로 설정"""
+
+def verify_single_field(current_field: str, current_value, md_content: str) -> dict:
+    """필드 하나를 MD 문서와 대조해 검증 결과(dict)를 반환합니다."""
     field_description = StartupInvestmentInfo.model_fields[current_field].description
     
-    print(f"\n[Verification {verification_index + 1}/{len(filled_fields)}] 검증 중: {current_field}")
-    print(f"  현재 값: {current_value}")
-    print(f"  설명: {field_description}")
+    # 필드 설명과 추출된 값으로 근거가 있을 만한 청크만 검색
+    context = build_context(md_content, [field_description, f"{field_description}: {current_value}"])
     
     # 검증 프롬프트
     prompt = f"""
@@ -401,7 +429,7 @@ def verify_field(state: ExtractionState) -> ExtractionState:
 
 MD 문서 내용:
 ```
-{md_content}
+{context}
 ```
 
 검증 절차:
@@ -419,12 +447,7 @@ MD 문서 내용:
     "reasoning": "검증 근거 및 판단 이유"
 }}
 
-중요한 규칙:
-- 문서에 명시적으로 나와있는 정보만 유효하다고 판단
-- 추론이나 추측은 유효하지 않음
-- 숫자의 경우 단위와 정확한 값 확인
-- 날짜의 경우 정확한 형식 확인
-- 근거가 불분명하면 is_valid를 false로 설정
+{VERIFY_RULES}
 
 JSON만 반환해주세요.
 """
@@ -437,7 +460,7 @@ JSON만 반환해주세요.
         f"- 필드명: {current_field}\n"
         f"- 필드 설명: {field_description}\n"
         f"- 추출된 값: {current_value}\n\n"
-        f"MD 내용: [MD_CONTENT_OMITTED - {len(md_content)} 문자]\n\n"
+        f"MD 내용: [MD_CONTENT_OMITTED - {len(context)}/{len(md_content)} 문자]\n\n"
         f"검증 절차: MD 문서에서 근거 찾기, 값 일치 여부 판단, 구체적 인용\n"
         f"응답: JSON 형식으로 is_valid, evidence, corrected_value, reasoning 포함"
     )
@@ -460,20 +483,94 @@ JSON만 반환해주세요.
             json_match = re.search(r'\{.*\}', cleaned_content, flags=re.DOTALL)
             if json_match:
                 json_str = json_match.group()
-                verification_result = json.loads(json_str)
-            else:
-                print(f"경고: 응답에서 JSON을 찾을 수 없음: {cleaned_content[:100]}...")
-                verification_result = {"is_valid": True}  # 기본값으로 유효하다고 판단
-        else:
-            verification_result = result.content
+                return json.loads(json_str)
+            print(f"경고: 응답에서 JSON을 찾을 수 없음: {cleaned_content[:100]}...")
+            return {"is_valid": True}  # 기본값으로 유효하다고 판단
+        return result.content
     except json.JSONDecodeError as e:
         print(f"경고: JSON 파싱 실패: {result.content[:100]}...")
         print(f"JSON 오류: {e}")
-        verification_result = {"is_valid": True}  # 기본값으로 유효하다고 판단
+        return {"is_valid": True}  # 기본값으로 유효하다고 판단
+
+def verify_field_batch(batch_index: int, batch: List[tuple], md_content: str) -> dict:
+    """
+    필드 여러 개를 한 프롬프트로 검증하고 {필드명: 검증 결과}를 반환합니다.
+    응답 배열에서 판정을 파싱하지 못한 필드는 결과에 포함하지 않습니다.
+    """
+    field_names = [field for field, _ in batch]
+    queries = []
+    targets = []
+    for field, value in batch:
+        description = StartupInvestmentInfo.model_fields[field].description
+        queries += [description, f"{description}: {value}"]
+        targets.append(f"- 필드명: {field}\n  필드 설명: {description}\n  추출된 값: {json.dumps(value, ensure_ascii=False, default=str)}")
+    context = build_context(md_content, queries)
+    
+    # 배치 검증 프롬프트
+    prompt = f"""
+당신은 한국 스타트업 IR 문서의 데이터 검증 전문가입니다. 
+아래 추출된 필드값들이 MD 문서의 내용과 일치하는지 필드마다 검증하고 근거를 제시해주세요.
+
+검증 대상 ({len(batch)}개):
+{chr(10).join(targets)}
+
+MD 문서 내용:
+```
+{context}
+```
+
+응답 형식 (JSON 배열, 검증 대상마다 하나씩 같은 순서로):
+[
+    {{
+        "field_name": "필드명",
+        "is_valid": true/false,
+        "evidence": "문서에서 찾은 구체적인 근거 문장",
+        "corrected_value": "수정이 필요한 경우 올바른 값 (is_valid가 true면 null)",
+        "reasoning": "검증 근거 및 판단 이유"
+    }}
+]
+
+{VERIFY_RULES}
+
+JSON 배열만 반환해주세요.
+"""
     
-    # 검증 결과 처리
+    # 프롬프트 저장
+    os.makedirs("prompt/verification", exist_ok=True)
+    prompt_for_save = (
+        f"필드 배치 검증 프롬프트\n\n"
+        f"검증 대상:\n{chr(10).join(targets)}\n\n"
+        f"MD 내용: [MD_CONTENT_OMITTED - {len(context)}/{len(md_content)} 문자]\n\n"
+        f"응답: JSON 배열로 필드별 is_valid, evidence, corrected_value, reasoning 포함"
+    )
+    with open(f"prompt/verification/verify_batch_{batch_index:02d}.txt", "w", encoding="utf-8") as f:
+        f.write(prompt_for_save)
+    
+    result = llm.invoke(prompt)
+    
+    with open(f"prompt/verification/verify_batch_{batch_index:02d}_response.txt", "w", encoding="utf-8") as f:
+        f.write(str(result.content))
+    
+    # 결과 처리: 필드명이 일치하고 is_valid가 있는 판정만 채택
+    verdicts = {}
+    cleaned_content = re.sub(r'<think>.*?</think>', '', str(result.content), flags=re.DOTALL).strip()
+    json_match = re.search(r'\[.*\]', cleaned_content, flags=re.DOTALL)
+    try:
+        items = json.loads(json_match.group()) if json_match else []
+    except json.JSONDecodeError as e:
+        print(f"  경고: 배치 {batch_index} JSON 파싱 실패: {e}")
+        items = []
+    for item in items if isinstance(items, list) else []:
+        if isinstance(item, dict) and item.get("field_name") in field_names and isinstance(item.get("is_valid"), bool):
+            verdicts[item["field_name"]] = item
+    
+    print(f"  [배치 {batch_index + 1}] {len(verdicts)}/{len(batch)}개 필드 판정 수신")
+    return verdicts
+
+def apply_verification(info: StartupInvestmentInfo, current_field: str, current_value, verification_result: dict):
+    """검증 결과를 출력하고, 검증 실패 시 수정값(또는 null)을 반영합니다."""
     is_valid = verification_result.get("is_valid", True)
-    evidence = verification_result.get("evidence", "근거 없음")
+    evidence = verification_result.get("evidence") or "근거 없음"
     corrected_value = verification_result.get("corrected_value")
     reasoning = verification_result.get("reasoning", "검증 완료")
     
@@ -523,6 +620,35 @@ JSON만 반환해주세요.
             setattr(info, current_field, None)
             reason = "문서에 정보가 없어" if corrected_value in [None, "null", "None"] else "유효하지 않은 값이어서"
             print(f"  🗑️ {current_field} 값을 '{current_value}' → null로 변경 ({reason})")
+
+# 필드 검증 함수
+def verify_field(state: ExtractionState) -> ExtractionState:
+    """채워진 필드값을 MD 파일과 대조하여 검증합니다. (필드 하나씩)"""
+    info = state["info"]
+    md_content = state["md_content"]
+    verification_index = state["verification_index"]
+    verified_fields = state["verified_fields"].copy()
+    
+    # 채워진 필드들만 가져오기
+    filled_fields = [(field, getattr(info, field)) for field in StartupInvestmentInfo.model_fields 
+                    if getattr(info, field) is not None]
+    
+    if verification_index >= len(filled_fields):
+        print("모든 필드 검증 완료!")
+        return {
+            **state,
+            "last_action": "verify_complete"
+        }
+    
+    current_field, current_value = filled_fields[verification_index]
+    field_description = StartupInvestmentInfo.model_fields[current_field].description
+    
+    print(f"\n[Verification {verification_index + 1}/{len(filled_fields)}] 검증 중: {current_field}")
+    print(f"  현재 값: {current_value}")
+    print(f"  설명: {field_description}")
+    
+    verification_result = verify_single_field(current_field, current_value, md_content)
+    apply_verification(info, current_field, current_value, verification_result)
     
     # 검증 완료된 필드에 추가
     verified_fields.append(current_field)
@@ -535,13 +661,56 @@ JSON만 반환해주세요.
         "last_action": "verify"
     }
 
+def verify_fields_batched(state: ExtractionState) -> ExtractionState:
+    """채워진 필드 전체를 배치로 나눠 동시에 검증합니다. 판정을 파싱하지 못한 필드만 하나씩 재검증합니다."""
+    info = state["info"]
+    md_content = state["md_content"]
+    verified_fields = state["verified_fields"].copy()
+    
+    filled_fields = [(field, getattr(info, field)) for field in StartupInvestmentInfo.model_fields 
+                    if getattr(info, field) is not None and field not in verified_fields]
+    batches = [filled_fields[i:i + VERIFY_BATCH_SIZE] for i in range(0, len(filled_fields), VERIFY_BATCH_SIZE)]
+    print(f"\n[Verification] {len(filled_fields)}개 필드를 {len(batches)}개 배치로 동시 검증합니다...")
+    
+    batch_results = get_gateway().map(
+        lambda item: verify_field_batch(item[0], item[1], md_content),
+        list(enumerate(batches)),
+    )
+    verdicts = {}
+    for result in batch_results:
+        verdicts.update(result)
+    
+    # 배치 판정이 없는 필드만 단일 검증으로 재시도
+    fallback_fields = [(field, value) for field, value in filled_fields if field not in verdicts]
+    if fallback_fields:
+        print(f"  판정을 받지 못한 {len(fallback_fields)}개 필드를 하나씩 재검증합니다: {[field for field, _ in fallback_fields]}")
+        fallback_results = get_gateway().map(
+            lambda item: verify_single_field(item[0], item[1], md_content),
+            fallback_fields,
+        )
+        verdicts.update({field: result for (field, _), result in zip(fallback_fields, fallback_results)})
+    
+    for index, (current_field, current_value) in enumerate(filled_fields):
+        print(f"\n[Verification {index + 1}/{len(filled_fields)}] {current_field}: {current_value}")
+        apply_verification(info, current_field, current_value, verdicts[current_field])
+        verified_fields.append(current_field)
+    
+    print("모든 필드 검증 완료!")
+    return {
+        **state,
+        "info": info,
+        "verification_index": len(filled_fields),
+        "verified_fields": verified_fields,
+        "last_action": "verify_complete"
+    }
+
 # 그래프 생성
 workflow = StateGraph(ExtractionState)
 
 # 노드 추가
 workflow.add_node("extract", extract_fields)
 workflow.add_node("analyze", analyze_failure)
-workflow.add_node("verify", verify_field)
+workflow.add_node("verify", verify_fields_batched if VERIFY_MODE == "batch" else verify_field)
 
 # 시작점 설정
 workflow.set_entry_point("extract")
@@ -610,6 +779,10 @@ final_filled = len([field for field in StartupInvestmentInfo.model_fields if get
 final_ratio = final_filled / len(StartupInvestmentInfo.model_fields) * 100
 print(f"Total filled: {final_filled}/{len(StartupInvestmentInfo.model_fields)} ({final_ratio:.1f}%)")
 print(f"Verified fields: {len(final_state['verified_fields'])}")
+response_cache = get_response_cache()
+if response_cache:
+    cache_stats = response_cache.stats()
+    print(f"LLM cache: {cache_stats['hits']} hits / {cache_stats['misses']} misses ({cache_stats['hit_rate']:.0%})")
 print(f"Final result:")
 
 # 결과를 JSON으로 저장
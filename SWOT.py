@@ -1,19 +1,17 @@
-from langchain_ollama import ChatOllama
 from pydantic import BaseModel, Field
 from typing import List, Optional, TypedDict
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import JsonOutputParser, StrOutputParser
-from langchain_core.runnables import RunnableLambda
+from langchain_core.runnables import RunnableLambda, RunnableParallel
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
 import json
 import re
 from glob import glob
 import os
+from llm_gateway import get_llm
 
-llm = ChatOllama(
-    model="qwen3:32b",
-    base_url="http://192.168.120.102:11434",
-    temperature=0
-)
+llm = get_llm(temperature=0)
 
 class SWOT(BaseModel):
     strength: Optional[str] = Field(None, description="강점")
@@ -49,8 +47,7 @@ def clean_llm_output(text: str) -> str:
         return match.group(0)
     return text
     
-def get_s_analyzer_chain(text: str):
-    prompt = PromptTemplate.from_template("""
+S_PROMPT = PromptTemplate.from_template("""
 당신은 SWOT 분석 중 강점(S)을 분석하는 전문가입니다.
 The output should be formatted as a JSON instance that conforms to the JSON schema below.
 
@@ -72,12 +69,8 @@ Your response must be a JSON object with two keys:
 Here is the output schema:
 {{"properties": {{"reason": {{"description": "해당 부분을 강점이라고 한 근거 (실제 문서 내용을 기반으로 작성)", "type": "string"}}, "contexts": {{"description": "분석 결과를 바탕으로 핵심 강점들을 요약", "type": "array", "items": {{"type": "string"}}}}}}, "required": ["reason", "contexts"]}}
 """)
-    parser = JsonOutputParser(pydantic_object=S)
-    chain = prompt | llm | StrOutputParser() | RunnableLambda(clean_llm_output) | parser
-    return chain.invoke({"text":text})
     
-def get_w_analyzer_chain(text: str):
-    prompt = PromptTemplate.from_template("""
+W_PROMPT = PromptTemplate.from_template("""
 당신은 SWOT 분석 중 약점(W)을 분석하는 전문가입니다.
 The output should be formatted as a JSON instance that conforms to the JSON schema below.
 
@@ -101,14 +94,9 @@ Your response must be a JSON object with two keys:
 
 Here is the output schema:
 {{"properties": {{"reason": {{"description": "해당 부분을 약점이라고 한 근거 (실제 문서 내용을 기반으로 작성)", "type": "string"}}, "contexts": {{"description": "분석 결과를 바탕으로 핵심 약점들을 요약", "type": "array", "items": {{"type": "string"}}}}}}, "required": ["reason", "contexts"]}}
-        """)
-    parser = JsonOutputParser(pydantic_object=W)
-    chain = prompt | llm | StrOutputParser() | RunnableLambda(clean_llm_output) | parser
-    return chain.invoke({"text":text})
+""")
     
-def get_o_analyzer_chain(text: str):
-    prompt = PromptTemplate.from_template(
-        """
+O_PROMPT = PromptTemplate.from_template("""
 당신은 SWOT 분석 중 기회(O)를 분석하는 전문가입니다.
 The output should be formatted as a JSON instance that conforms to the JSON schema below.
 
@@ -129,15 +117,9 @@ Your response must be a JSON object with two keys:
 
 Here is the output schema:
 {{"properties": {{"reason": {{"description": "해당 부분을 기회라고 한 근거 (실제 문서 내용을 기반으로 작성)", "type": "string"}}, "contexts": {{"description": "분석 결과를 바탕으로 핵심 기회들을 요약", "type": "array", "items": {{"type": "string"}}}}}}, "required": ["reason", "contexts"]}}
-        """
-    )
-    parser = JsonOutputParser(pydantic_object=O)
-    chain = prompt | llm | StrOutputParser() | RunnableLambda(clean_llm_output) | parser
-    return chain.invoke({"text":text})
+""")
     
-def get_t_analyzer_chain(text: str):
-    prompt = PromptTemplate.from_template(
-        """
+T_PROMPT = PromptTemplate.from_template("""
 당신은 SWOT 분석 중 위협(T)을 분석하는 전문가입니다.
 The output should be formatted as a JSON instance that conforms to the JSON schema below.
 
@@ -160,66 +142,88 @@ Your response must be a JSON object with two keys:
 
 Here is the output schema:
 {{"properties": {{"reason": {{"description": "해당 부분을 위협이라고 한 근거 (실제 문서 내용을 기반으로 작성)", "type": "string"}}, "contexts": {{"description": "분석 결과를 바탕으로 핵심 위협들을 요약", "type": "array", "items": {{"type": "string"}}}}}}, "required": ["reason", "contexts"]}}
-        """
-    )
-    parser = JsonOutputParser(pydantic_object=T)
-    chain = prompt | llm | StrOutputParser() | RunnableLambda(clean_llm_output) | parser
-    return chain.invoke({"text":text})
-
-if __name__ == "__main__":
-    jsons = glob('./*.json')
-    
-    output_dir = 'result'
-    if not os.path.exists(output_dir):
-        os.makedirs(output_dir)
-
-    for name in jsons:
-        with open(name, 'r', encoding='utf-8') as f:
-            data = json.load(f)
-
-        cleaned_data = {k: v for k, v in data.items() if v is not None and v != ""}
-        text_input = json.dumps(cleaned_data, ensure_ascii=False, indent=2)
+""")
 
-        print("="*20 + " SWOT 분석 시작 " + "="*20)
-        print(f"입력 데이터:\n{text_input}\n")
+def build_quadrant_chain(prompt: PromptTemplate, schema):
+    """SWOT 한 사분면을 분석하는 체인을 만듭니다."""
+    parser = JsonOutputParser(pydantic_object=schema)
+    return prompt | llm | StrOutputParser() | RunnableLambda(clean_llm_output) | parser
+
+# 체인은 모듈 로드 시 한 번만 만들고 재사용합니다.
+s_analyzer_chain = build_quadrant_chain(S_PROMPT, S)
+w_analyzer_chain = build_quadrant_chain(W_PROMPT, W)
+o_analyzer_chain = build_quadrant_chain(O_PROMPT, O)
+t_analyzer_chain = build_quadrant_chain(T_PROMPT, T)
+
+# 네 사분면을 한 문서에 대해 동시에 실행하는 SWOT 엔진
+swot_chain = RunnableParallel(
+    strength=s_analyzer_chain,
+    weakness=w_analyzer_chain,
+    opportunity=o_analyzer_chain,
+    threat=t_analyzer_chain,
+)
 
-        s_result = get_s_analyzer_chain(text_input)
-        print("--- 강점 (Strength) 분석 결과 ---")
-        print(f"근거: {s_result['reason']}")
-        print(f"핵심 강점: {s_result['contexts']}")
-        print("-" * 50)
+def get_s_analyzer_chain(text: str):
+    return s_analyzer_chain.invoke({"text": text})
 
-        w_result = get_w_analyzer_chain(text_input)
-        print("--- 약점 (Weakness) 분석 결과 ---")
-        print(f"근거: {w_result['reason']}")
-        print(f"핵심 약점: {w_result['contexts']}")
-        print("-" * 50)
+def get_w_analyzer_chain(text: str):
+    return w_analyzer_chain.invoke({"text": text})
 
-        o_result = get_o_analyzer_chain(text_input)
-        print("--- 기회 (Opportunity) 분석 결과 ---")
-        print(f"근거: {o_result['reason']}")
-        print(f"핵심 기회: {o_result['contexts']}")
-        print("-" * 50)
+def get_o_analyzer_chain(text: str):
+    return o_analyzer_chain.invoke({"text": text})
 
-        t_result = get_t_analyzer_chain(text_input)
-        print("--- 위협 (Threat) 분석 결과 ---")
-        print(f"근거: {t_result['reason']}")
-        print(f"핵심 위협: {t_result['contexts']}")
+def get_t_analyzer_chain(text: str):
+    return t_analyzer_chain.invoke({"text": text})
+
+def analyze_swot(text: str) -> dict:
+    """네 사분면 분석을 병렬로 실행하여 {"strength", "weakness", "opportunity", "threat"} 결과를 반환합니다."""
+    return swot_chain.invoke({"text": text})
+
+def load_swot_input(name: str) -> str:
+    """입력 JSON에서 빈 값을 제거하고 분석용 텍스트로 변환합니다."""
+    with open(name, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    cleaned_data = {k: v for k, v in data.items() if v is not None and v != ""}
+    return json.dumps(cleaned_data, ensure_ascii=False, indent=2)
+
+def process_file(name: str, output_dir: str) -> str:
+    """단일 입력 파일의 SWOT 분석을 수행하고 결과 파일 경로를 반환합니다."""
+    text_input = load_swot_input(name)
+    swot_results = analyze_swot(text_input)
+
+    input_filename = os.path.splitext(os.path.basename(name))[0]
+    output_path = os.path.join(output_dir, f'swot_analysis_{input_filename}.json')
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(swot_results, f, ensure_ascii=False, indent=4)
+
+    labels = [("strength", "강점 (Strength)", "핵심 강점"), ("weakness", "약점 (Weakness)", "핵심 약점"),
+              ("opportunity", "기회 (Opportunity)", "핵심 기회"), ("threat", "위협 (Threat)", "핵심 위협")]
+    print("="*20 + f" SWOT 분석 결과: {name} " + "="*20)
+    for key, title, contexts_label in labels:
+        print(f"--- {title} 분석 결과 ---")
+        print(f"근거: {swot_results[key]['reason']}")
+        print(f"{contexts_label}: {swot_results[key]['contexts']}")
         print("-" * 50)
+    return output_path
 
-        # 전체 SWOT 분석 결과를 딕셔너리로 묶기
-        swot_results = {
-            "strength": s_result,
-            "weakness": w_result,
-            "opportunity": o_result,
-            "threat": t_result,
-        }
-
-        # JSON 파일로 저장
-        input_filename = os.path.splitext(os.path.basename(name))[0]
-        output_path = os.path.join(output_dir, f'swot_analysis_{input_filename}.json')
-        with open(output_path, 'w', encoding='utf-8') as f:
-            json.dump(swot_results, f, ensure_ascii=False, indent=4)
-        
-        print(f"\n✅ SWOT 분석 결과가 {output_path} 에 성공적으로 저장되었습니다.")
-    
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="입력 JSON 파일들에 대해 SWOT 분석을 수행합니다.")
+    parser.add_argument("--input-glob", type=str, default='./*.json', help="분석할 JSON 파일 glob 패턴")
+    parser.add_argument("--output-dir", type=str, default='result', help="결과 저장 디렉토리")
+    parser.add_argument("--workers", type=int, default=4, help="동시에 처리할 파일 수")
+    args = parser.parse_args()
+
+    jsons = glob(args.input_glob)
+    os.makedirs(args.output_dir, exist_ok=True)
+    print(f"🚀 {len(jsons)}개 파일 SWOT 분석 시작 (동시 처리: {args.workers}개 파일 x 4개 사분면)")
+
+    # 파일 단위로 병렬 처리하고, 각 파일 안에서는 네 사분면이 동시에 실행됩니다.
+    with ThreadPoolExecutor(max_workers=max(1, args.workers)) as executor:
+        futures = {executor.submit(process_file, name, args.output_dir): name for name in jsons}
+        for future in as_completed(futures):
+            name = futures[future]
+            try:
+                output_path = future.result()
+                print(f"\n✅ SWOT 분석 결과가 {output_path} 에 성공적으로 저장되었습니다.")
+            except Exception as e:
+                print(f"\n🚨 {name} SWOT 분석 실패: {e}")
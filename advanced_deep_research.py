@@ -1,7 +1,6 @@
 import json
 import re
 import os
-import time # 시간 지연을 위해 time 모듈 추가
 import argparse # 인자 처리를 위해 추가
 from glob import glob
 
@@ -9,7 +8,10 @@ def remove_think_tags(text: str) -> str:
     """<think> 태그를 제거합니다."""
     think_pattern = re.compile(r"<think>.*?</think>\s*", re.DOTALL)
     return think_pattern.sub("", text).strip()
-from langchain_ollama import ChatOllama
+from llm_gateway import get_llm, get_gateway
+from llm_cache import WEB_CACHE_TTL
+from search_cache import cached_search, is_empty_search_result
+from rate_limiter import get_limiter, limited_call
 from langchain_core.prompts import PromptTemplate
 from langchain_community.tools import DuckDuckGoSearchResults
 from langchain.agents import Tool, create_react_agent, AgentExecutor
@@ -18,19 +20,20 @@ from langchain_core.runnables import RunnablePassthrough
 import sys
 
 # --- 1. LLM 및 도구 설정 ---
-llm = ChatOllama(
-    model="qwen3:32b",
-    base_url="http://192.168.120.102:11434",
-    temperature=0
-)
+llm = get_llm(temperature=0, cache_ttl=WEB_CACHE_TTL)
 
 search = DuckDuckGoSearchResults()
+SEARCH_HOST = "duckduckgo.com"
+
+# Phase 3 요약을 동시에 실행할 개수 (None이면 LLM 서버 풀 용량)
+SUMMARY_CONCURRENCY = None
 
 def search_with_delay(query: str) -> str:
-    """사용량 제한을 피하기 위해 검색 전에 지연 시간을 추가하는 래퍼 함수입니다."""
-    print(f"\n> [Rate Limit] 2초 대기 후 검색 실행: {query}")
-    time.sleep(2)
-    return search.run(query)
+    """DuckDuckGo 호스트의 공유 토큰 버킷으로 요청 속도를 제한하는 검색 래퍼 함수입니다. (캐시에 있으면 바로 반환)"""
+    def fetch(q: str) -> str:
+        print(f"\n> [Rate Limit] 검색 실행: {q}")
+        return limited_call(get_limiter(SEARCH_HOST), search.run, q, is_empty=is_empty_search_result)
+    return cached_search(query, fetch, backend="duckduckgo_results")
 
 # 리서처 에이전트가 사용할 도구
 research_tools = [
@@ -228,18 +231,15 @@ Structure your answer clearly with markdown headings.
 
 # --- 3. 메인 실행 로직 ---
 def process_single_file(swot_file):
-    """단일 SWOT 파일을 처리하는 메인 로직"""
-    llm = ChatOllama(
-        model="qwen3:32b",
-        base_url="http://192.168.120.102:11434",
-        temperature=0
-    )
+    """단일 SWOT 파일을 처리하는 메인 로직. 저장한 보고서 데이터를 반환합니다. (실패 시 None)"""
+    llm = get_llm(temperature=0, cache_ttl=WEB_CACHE_TTL)
     search = DuckDuckGoSearchResults()
 
     def search_with_delay(query: str) -> str:
-        print(f"\n> [Rate Limit] 2초 대기 후 검색 실행: {query}")
-        time.sleep(2)
-        return search.run(query)
+        def fetch(q: str) -> str:
+            print(f"\n> [Rate Limit] 검색 실행: {q}")
+            return limited_call(get_limiter(SEARCH_HOST), search.run, q, is_empty=is_empty_search_result)
+        return cached_search(query, fetch, backend="duckduckgo_results")
 
     research_tools = [
         Tool(
@@ -271,6 +271,10 @@ def process_single_file(swot_file):
     gathered_info = None
 
     for i in range(max_retries):
+        if i == 1:
+            # 재시도는 같은 입력을 다시 보내므로, 캐시를 조회하지 않는 LLM으로 새 응답을 받습니다.
+            researcher_agent = create_researcher_agent(
+                get_llm(temperature=0, cache_ttl=WEB_CACHE_TTL, refresh_cache=True), research_tools)
         try:
             research_result = researcher_agent.invoke({"input": swot_input_string})
             output_text = research_result.get('output', '')
@@ -333,14 +337,20 @@ def process_single_file(swot_file):
 
     # --- 단계 3: 정보 요약 ---
     print("\n🤖 [Phase 3/4] Starting Summarizer Chain to condense information...")
+    # 스니펫별 요약은 서로 독립적이므로 동시에 실행합니다. (batch는 입력 순서대로 결과를 반환)
+    items = [info for info in validated_info if info.get('snippet')]
+    print(f"  - Summarizing {len(items)} snippets ({SUMMARY_CONCURRENCY or get_gateway().capacity} at a time)...")
+    summary_results = summarizer_chain.batch(
+        [{"article_text": info['snippet']} for info in items],
+        config={"max_concurrency": SUMMARY_CONCURRENCY or get_gateway().capacity},
+        return_exceptions=True,
+    )
+
     summarized_findings = []
-    for info in validated_info:
-        if not info.get('snippet'):
-            continue
-        
+    for info, summary_result in zip(items, summary_results):
         try:
-            print(f"  - Summarizing snippet for category '{info.get('category')}'...")
-            summary_result = summarizer_chain.invoke({"article_text": info['snippet']})
+            if isinstance(summary_result, Exception):
+                raise summary_result
             
             # JSON 문자열인 경우 think 태그 제거 후 파싱
             if isinstance(summary_result, str):
@@ -357,7 +367,7 @@ def process_single_file(swot_file):
                 "source": info.get('source', 'N/A')
             })
         except Exception as e:
-            print(f"🚨 Error during summarization: {e}")
+            print(f"🚨 Error during summarization ('{info.get('category')}'): {e}")
             summarized_findings.append({
                 "category": info.get('category', 'General'),
                 "summary": info['snippet'],
@@ -409,10 +419,15 @@ def process_single_file(swot_file):
     except Exception as e:
         print(f"🚨 ERROR: Failed to save report to {output_path}: {e}")
 
+    return report_data
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run advanced deep research on a single SWOT analysis file.")
     parser.add_argument("swot_file", type=str, help="The path to the input SWOT analysis JSON file.")
+    parser.add_argument("--summary-concurrency", type=int, default=None, help="Number of snippets summarized concurrently (default: LLM server pool capacity)")
     args = parser.parse_args()
+    if args.summary_concurrency:
+        SUMMARY_CONCURRENCY = args.summary_concurrency
     
     if not os.path.exists(args.swot_file):
         print(f"🚨 ERROR: Input file not found at '{args.swot_file}'")
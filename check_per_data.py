@@ -3,14 +3,20 @@ import duckdb
 DB_FILE = 'ipo_db/ipo_data.db'
 
 with duckdb.connect(DB_FILE, read_only=True) as conn:
+    has_metrics = conn.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_name = 'company_metrics'"
+    ).fetchone()[0]
+    if not has_metrics:
+        print("company_metrics 테이블이 없습니다. 먼저 'python ipo_db/save_ipo_data_to_db.py --rebuild-metrics'로 DB를 마이그레이션해주세요.")
+        raise SystemExit(1)
     try:
-        per_count_query = "SELECT count(*) FROM stock_indicators WHERE item LIKE '%PER%' AND value IS NOT NULL AND value != '-'"
+        per_count_query = "SELECT count(*) FROM company_metrics WHERE metric = 'PER'"
         per_count = conn.execute(per_count_query).fetchone()[0]
         print(f"데이터베이스에 저장된 유효한 PER 데이터 수: {per_count}개")
         
         if per_count > 0:
             print("\n--- PER 데이터 샘플 (상위 10개) ---")
-            per_sample_query = "SELECT company_no, item, value FROM stock_indicators WHERE item LIKE '%PER%' AND value IS NOT NULL AND value != '-' LIMIT 10"
+            per_sample_query = "SELECT company_no, item, period, value FROM company_metrics WHERE metric = 'PER' LIMIT 10"
             df = conn.execute(per_sample_query).fetchdf()
             print(df.to_markdown(index=False))
             
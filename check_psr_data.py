@@ -5,9 +5,15 @@ DB_FILE = 'ipo_db/ipo_data.db'
 company_nos = ['2064', '2138', '2192', '2146', '2102', '2151', '2048', '2200', '2167', '2162']
 
 with duckdb.connect(DB_FILE, read_only=True) as conn:
-    query = f"""SELECT company_no, item, value FROM stock_indicators 
+    has_metrics = conn.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_name = 'company_metrics'"
+    ).fetchone()[0]
+    if not has_metrics:
+        print("company_metrics 테이블이 없습니다. 먼저 'python ipo_db/save_ipo_data_to_db.py --rebuild-metrics'로 DB를 마이그레이션해주세요.")
+        raise SystemExit(1)
+    query = f"""SELECT company_no, item, period, value FROM company_metrics 
                WHERE company_no IN ({str(company_nos)[1:-1]}) 
-               AND item IN ('현재가', 'SPS (주당매출액)')"""
+               AND metric IN ('PRICE', 'SPS')"""
     df = conn.execute(query).fetchdf()
 
 print("--- 유사 기업 10곳의 현재가 및 SPS 데이터 ---")
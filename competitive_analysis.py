@@ -4,27 +4,35 @@ import os
 import time
 import argparse # 인자 처리를 위해 추가
 import sys
+import threading
 from glob import glob
-from langchain_ollama import ChatOllama
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from llm_gateway import get_llm, get_gateway
+from llm_cache import WEB_CACHE_TTL
+from search_cache import cached_search, is_empty_search_result, canonicalize_query
+from rate_limiter import get_limiter, limited_call
 from langchain_core.prompts import PromptTemplate
 from langchain_community.tools import DuckDuckGoSearchResults
 from langchain.agents import Tool, create_react_agent, AgentExecutor
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
+from langchain_core.callbacks import BaseCallbackHandler
 
 # --- 1. LLM 및 도구 설정 ---
-llm = ChatOllama(
-    model="qwen3:32b",
-    base_url="http://192.168.120.102:11434",
-    temperature=0
-)
+llm = get_llm(temperature=0, cache_ttl=WEB_CACHE_TTL)
 
 search = DuckDuckGoSearchResults()
+SEARCH_HOST = "duckduckgo.com"
+
+# Executor 단계 설정
+EXECUTOR_CONCURRENCY = None   # 동시에 실행할 조사 작업 수 (None이면 LLM 서버 풀 용량)
+TASK_TIMEOUT = 300            # 조사 작업 하나의 최대 실행 시간(초)
 
 def search_with_delay(query: str) -> str:
-    """사용량 제한을 피하기 위해 검색 전에 지연 시간을 추가하는 래퍼 함수입니다."""
-    print(f"\n> [Executor] 2초 대기 후 검색 실행: {query}")
-    time.sleep(2)
-    return search.run(query)
+    """DuckDuckGo 호스트의 공유 토큰 버킷으로 요청 속도를 제한하는 검색 래퍼 함수입니다. (캐시에 있으면 바로 반환)"""
+    def fetch(q: str) -> str:
+        print(f"\n> [Executor] 검색 실행: {q}")
+        return limited_call(get_limiter(SEARCH_HOST), search.run, q, is_empty=is_empty_search_result)
+    return cached_search(query, fetch, backend="duckduckgo_results")
 
 search_tool = Tool(
     name="web_search",
@@ -112,9 +120,82 @@ Final Answer: [Your synthesized answer text. Source: (URL)]
         tools=tools,
         verbose=True,
         handle_parsing_errors=True,
-        max_iterations=5
+        max_iterations=5,
+        max_execution_time=TASK_TIMEOUT
     )
 
+class TaskCancelled(Exception):
+    """시간 초과로 취소된 조사 작업이 다음 LLM 호출이나 검색을 시작하려 할 때 발생합니다."""
+
+
+class CancelOnEvent(BaseCallbackHandler):
+    """이벤트가 설정되면 에이전트의 다음 LLM 호출/도구 실행 직전에 TaskCancelled를 발생시키는 콜백"""
+
+    raise_error = True
+
+    def __init__(self, event):
+        self.event = event
+
+    def _check(self, *args, **kwargs):
+        if self.event.is_set():
+            raise TaskCancelled("Task cancelled after timeout")
+
+    on_llm_start = on_chat_model_start = on_tool_start = _check
+
+
+def execute_tasks(executor_agent, task_list, max_workers=None, timeout=TASK_TIMEOUT):
+    """
+    조사 작업들을 동시에 실행하고 task_list 순서대로 결과를 반환합니다.
+    - 검색어가 (정규화 기준으로) 같은 작업은 한 번만 실행하고 결과를 공유
+    - 실행 시간이 timeout을 넘은 작업은 시간 초과로 기록하고 취소 (다음 LLM 호출/검색 전에 멈춤)
+    검색 요청 속도는 검색 래퍼의 토큰 버킷이, LLM 동시 요청 수는 게이트웨이가 제한합니다.
+    취소된 작업까지 모두 멈춘 뒤에 반환하므로, 다음 보고서의 작업과 LLM 슬롯/검색 토큰을 나눠 쓰지 않습니다.
+    """
+    groups = {}
+    for task in task_list:
+        groups.setdefault(canonicalize_query(task['query']), []).append(task)
+    if len(groups) < len(task_list):
+        print(f"  ♻️ {len(task_list) - len(groups)} duplicate task(s) will reuse another task's result.")
+
+    started = {}
+    cancelled = {key: threading.Event() for key in groups}
+
+    def run_task(key, task):
+        started[key] = time.monotonic()
+        print(f"\n> Executing Task {task['task_id']}: {task['query']}")
+        result = executor_agent.invoke({"task_query": task['query']},
+                                       config={"callbacks": [CancelOnEvent(cancelled[key])]})
+        return result.get('output', 'No output from agent.')
+
+    outputs = {}
+    workers = max(1, min(len(groups), max_workers or get_gateway().capacity))
+    pool = ThreadPoolExecutor(max_workers=workers)
+    futures = {pool.submit(run_task, key, tasks[0]): key for key, tasks in groups.items()}
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=1, return_when=FIRST_COMPLETED)
+        for future in done:
+            key = futures[future]
+            try:
+                outputs[key] = future.result()
+            except Exception as e:
+                print(f"🚨 Error executing task {groups[key][0]['task_id']}: {e}")
+                outputs[key] = f"Execution failed: {e}"
+        now = time.monotonic()
+        for future in list(pending):
+            key = futures[future]
+            if key in started and now - started[key] > timeout:
+                print(f"⏱️ Task {groups[key][0]['task_id']} timed out after {timeout}s. Cancelling it.")
+                outputs[key] = f"Execution timed out after {timeout}s"
+                cancelled[key].set()
+                pending.discard(future)
+    # 취소된 작업은 진행 중인 LLM 호출/검색이 끝나면 TaskCancelled로 멈추므로, 스레드가 모두 끝날 때까지 기다립니다.
+    if any(event.is_set() for event in cancelled.values()):
+        print("  ⏳ Waiting for cancelled tasks to stop...")
+    pool.shutdown(wait=True, cancel_futures=True)
+
+    return [{"task": task, "result": outputs[canonicalize_query(task['query'])]} for task in task_list]
+
 def create_synthesizer_chain(llm):
     """모든 정보를 종합하여 최종 경쟁 분석 보고서를 작성하는 체인을 생성합니다."""
     prompt_template = """
@@ -165,19 +246,19 @@ Based on ALL the information above, create a final report with the following str
     prompt = PromptTemplate.from_template(prompt_template)
     return prompt | llm | StrOutputParser()
 
-def process_single_report(report_file):
-    """단일 보고서 파일을 처리하는 메인 로직"""
-    llm = ChatOllama(
-        model="qwen3:32b",
-        base_url="http://192.168.120.102:11434",
-        temperature=0
-    )
+def process_single_report(report_file, report_data=None):
+    """
+    단일 보고서 파일을 처리하는 메인 로직. 저장한 경쟁 분석 데이터를 반환합니다. (실패 시 None)
+    report_data가 주어지면 파일을 다시 읽지 않고 그대로 사용합니다. (파이프라인 실행기에서 메모리로 전달)
+    """
+    llm = get_llm(temperature=0, cache_ttl=WEB_CACHE_TTL)
     search = DuckDuckGoSearchResults()
 
     def search_with_delay(query: str) -> str:
-        print(f"\n> [Executor] 2초 대기 후 검색 실행: {query}")
-        time.sleep(2)
-        return search.run(query)
+        def fetch(q: str) -> str:
+            print(f"\n> [Executor] 검색 실행: {q}")
+            return limited_call(get_limiter(SEARCH_HOST), search.run, q, is_empty=is_empty_search_result)
+        return cached_search(query, fetch, backend="duckduckgo_results")
 
     search_tool = Tool(
         name="web_search",
@@ -191,8 +272,9 @@ def process_single_report(report_file):
     
     print(f"\n\n{'='*50}\nProcessing file: {report_file}\n{'='*50}")
     try:
-        with open(report_file, 'r', encoding='utf-8') as f:
-            report_data = json.load(f)
+        if report_data is None:
+            with open(report_file, 'r', encoding='utf-8') as f:
+                report_data = json.load(f)
         initial_report_text = report_data.get("final_report_korean", "")
         if not initial_report_text:
             print(f"Skipping {report_file} due to missing 'final_report_korean'.")
@@ -209,21 +291,7 @@ def process_single_report(report_file):
 
     # --- 단계 2: 계획 실행 ---
     print("\n🤖 [Phase 2/4] Starting Executor to gather information...")
-    execution_results = []
-    for task in task_list:
-        print(f"\n> Executing Task {task['task_id']}: {task['query']}")
-        try:
-            result = executor_agent.invoke({"task_query": task['query']})
-            execution_results.append({
-                "task": task,
-                "result": result.get('output', 'No output from agent.')
-            })
-        except Exception as e:
-            print(f"🚨 Error executing task {task['task_id']}: {e}")
-            execution_results.append({
-                "task": task,
-                "result": f"Execution failed: {e}"
-            })
+    execution_results = execute_tasks(executor_agent, task_list, max_workers=EXECUTOR_CONCURRENCY)
     print("\n✅ [Phase 2/4] All tasks executed.")
     
     # --- 단계 3: 보고서 종합 ---
@@ -270,6 +338,8 @@ def process_single_report(report_file):
     except Exception as e:
         print(f"🚨 ERROR: Failed to save report to {output_path}: {e}")
 
+    return final_data
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run competitive analysis on a single report file.")
     parser.add_argument("report_file", type=str, help="The path to the input advanced_deep_research_report JSON file.")
@@ -1,15 +1,10 @@
-from sentence_transformers import SentenceTransformer
 from langchain.text_splitter import RecursiveCharacterTextSplitter
 from langchain_ollama import ChatOllama
-import torch
+import numpy as np
 from glob import glob
 
-# GPU 장치 설정
-device = "cuda" if torch.cuda.is_available() else "cpu"
-print(f"Using device: {device}")
-
-# Download from the 🤗 Hub
-model = SentenceTransformer("dragonkue/bge-m3-ko", device=device)
+# 임베딩은 임베딩 저장소를 거치므로 바뀌지 않은 청크는 다시 인코딩하지 않습니다. (모델은 필요할 때만 로드)
+from md_retriever import encode_texts
 
 mds = glob("./data/*.md")
 
@@ -30,31 +25,31 @@ llm = ChatOllama(
 )
 
 # Run inference
-embeddings = model.encode(sentences)
+embeddings = encode_texts(sentences)
 print(f"Number of chunks: {len(sentences)}")
 print(embeddings.shape)
 
 # RAG 테스트
 query = "CEO 이름 알려줘"
-query_embedding = model.encode([query]) # 2D 배열로 유지
+query_embedding = encode_texts([query]) # 2D 배열로 유지
 
-# 질문 임베딩과 문서 청크 임베딩 간의 유사도 계산
-similarities_to_query = model.similarity(query_embedding, embeddings)[0]
+# 질문 임베딩과 문서 청크 임베딩 간의 유사도 계산 (정규화된 임베딩이므로 내적 = 코사인 유사도)
+similarities_to_query = (query_embedding @ embeddings.T)[0]
 
 # 가장 유사도가 높은 상위 K개 청크 인덱스 찾기
 k = 3
 if len(sentences) < k:
     k = len(sentences)
-top_k_indices = torch.topk(similarities_to_query, k=k).indices
+top_k_indices = np.argsort(-similarities_to_query)[:k]
 
 print(f"\n질문: {query}")
 print(f"\n검색된 상위 {k}개 청크:")
 retrieved_chunks = []
 for i, index in enumerate(top_k_indices):
-    chunk_index = index.item()
+    chunk_index = int(index)
     chunk_text = sentences[chunk_index]
     retrieved_chunks.append(chunk_text)
-    print(f"--- 청크 {chunk_index} (유사도: {similarities_to_query[index]:.4f}) ---")
+    print(f"--- 청크 {chunk_index} (유사도: {similarities_to_query[chunk_index]:.4f}) ---")
     print(chunk_text)
     print("-" * (20 + len(str(chunk_index))))
 
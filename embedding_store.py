@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+청크 임베딩 디스크 저장소 (memmap)
+
+(임베딩 모델 ID, 텍스트 해시)를 키로 임베딩 벡터를 저장합니다.
+- 모델별 디렉토리에 벡터 행렬(vectors.bin, 행 추가만 하는 float16/float32 배열)과
+  메타데이터 사이드카(index.json: 차원, dtype, 텍스트 해시 -> 행 번호)를 둡니다.
+- 벡터는 np.memmap으로 읽으므로 바뀌지 않은 청크는 다시 인코딩하지 않고 바로 불러옵니다.
+- 쓰기는 파일 잠금으로 한 프로세스씩 하고, 사이드카는 벡터를 쓴 뒤 원자적으로 교체하므로
+  여러 프로세스가 읽기 전용으로 동시에 공유할 수 있습니다.
+
+환경 변수로 설정합니다.
+    QVP_EMBEDDING_STORE          0이면 저장소 비활성화 (기본 1)
+    QVP_EMBEDDING_STORE_DIR      저장소 디렉토리
+    QVP_EMBEDDING_STORE_DTYPE    저장 dtype (float16 또는 float32)
+
+사용법:
+    python embedding_store.py stats    # 모델별 저장 항목 수와 크기 출력
+    python embedding_store.py clear    # 전체 삭제
+"""
+
+import os
+import re
+import json
+import shutil
+import hashlib
+import argparse
+import threading
+from pathlib import Path
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows 등에서는 프로세스 간 쓰기 잠금 없이 동작
+    fcntl = None
+
+# --- 설정 ---
+STORE_ENABLED = os.environ.get("QVP_EMBEDDING_STORE", "1") not in ("0", "false", "False", "")
+STORE_DIR = os.environ.get("QVP_EMBEDDING_STORE_DIR", ".cache/embeddings")
+STORE_DTYPE = os.environ.get("QVP_EMBEDDING_STORE_DTYPE", "float16")
+
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class EmbeddingStore:
+    """한 임베딩 모델의 텍스트별 벡터를 memmap 행렬로 저장하는 저장소"""
+
+    def __init__(self, model_id: str, root: str = STORE_DIR, dtype: str = STORE_DTYPE):
+        self.model_id = model_id
+        self.dir = Path(root) / re.sub(r"[^\w.-]+", "__", model_id)
+        self.vectors_path = self.dir / "vectors.bin"
+        self.index_path = self.dir / "index.json"
+        self.lock_path = self.dir / ".lock"
+        self.dtype = dtype
+        self.dim: Optional[int] = None
+        self.rows = 0
+        self.keys: Dict[str, int] = {}
+        self._index_mtime: Optional[int] = None
+        self._memmap: Optional[np.memmap] = None
+        self._lock = threading.Lock()
+        self._load_index()
+
+    def _load_index(self):
+        """사이드카가 바뀌었으면 다시 읽습니다. (다른 프로세스가 추가한 항목 반영)"""
+        try:
+            mtime = self.index_path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return
+        if mtime == self._index_mtime:
+            return
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        self.dtype, self.dim, self.rows, self.keys = index["dtype"], index["dim"], index["rows"], index["keys"]
+        self._index_mtime = mtime
+        self._memmap = None
+
+    def _write_index(self):
+        index = {"model_id": self.model_id, "dtype": self.dtype, "dim": self.dim, "rows": self.rows, "keys": self.keys}
+        tmp_path = self.index_path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+        self._index_mtime = self.index_path.stat().st_mtime_ns
+
+    @contextmanager
+    def _file_lock(self):
+        """프로세스 간 쓰기 잠금"""
+        self.dir.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_path, "w") as lock_file:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _vectors(self) -> np.ndarray:
+        if self._memmap is None or len(self._memmap) != self.rows:
+            self._memmap = np.memmap(self.vectors_path, dtype=self.dtype, mode="r", shape=(self.rows, self.dim))
+        return self._memmap
+
+    def _append(self, keys: List[str], vectors: np.ndarray):
+        with self._file_lock():
+            self._load_index()
+            new = [(key, vector) for key, vector in zip(keys, vectors) if key not in self.keys]
+            if not new:
+                return
+            self.dim = self.dim or vectors.shape[1]
+            item_size = np.dtype(self.dtype).itemsize
+            with open(self.vectors_path, "ab") as f:
+                # 사이드카에 기록되지 않은 꼬리(쓰다 중단된 행)는 잘라내고 이어 씁니다.
+                f.truncate(self.rows * self.dim * item_size)
+                f.write(np.asarray([vector for _, vector in new], dtype=self.dtype).tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            for key, _ in new:
+                self.keys[key] = self.rows
+                self.rows += 1
+            self._write_index()
+            self._memmap = None
+
+    def get_or_encode(self, texts: Sequence[str], encode: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        텍스트별 임베딩을 (len(texts), dim) float32 행렬로 반환합니다.
+        저장소에 없는 텍스트만 encode(list)로 인코딩해 저장합니다. encode는 저장할 벡터를 그대로 반환해야 합니다.
+        """
+        keys = [text_key(text) for text in texts]
+        with self._lock:
+            self._load_index()
+            missing = {key: text for key, text in zip(keys, texts) if key not in self.keys}
+            if missing:
+                vectors = np.asarray(encode(list(missing.values())))
+                self._append(list(missing), vectors)
+            if not keys:
+                return np.zeros((0, self.dim or 0), dtype=np.float32)
+            return np.asarray(self._vectors()[[self.keys[key] for key in keys]], dtype=np.float32)
+
+    def stats(self) -> Dict[str, object]:
+        with self._lock:
+            self._load_index()
+            size = self.vectors_path.stat().st_size if self.vectors_path.exists() else 0
+            return {"model_id": self.model_id, "entries": self.rows, "dim": self.dim, "dtype": self.dtype,
+                    "bytes": size, "path": str(self.dir)}
+
+
+_stores: Dict[str, EmbeddingStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_embedding_store(model_id: str) -> Optional[EmbeddingStore]:
+    """모델별 기본 저장소를 반환합니다. 비활성화되어 있으면 None을 반환합니다."""
+    if not STORE_ENABLED:
+        return None
+    with _stores_lock:
+        store = _stores.get(model_id)
+        if store is None:
+            store = _stores[model_id] = EmbeddingStore(model_id)
+        return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="청크 임베딩 저장소 관리")
+    parser.add_argument("command", choices=["stats", "clear"], help="stats: 통계, clear: 전체 삭제")
+    parser.add_argument("--path", type=str, default=STORE_DIR, help="저장소 디렉토리")
+    args = parser.parse_args()
+
+    root = Path(args.path)
+    if args.command == "clear":
+        shutil.rmtree(root, ignore_errors=True)
+        print("🗑️ 임베딩 저장소를 모두 삭제했습니다.")
+        return
+    model_dirs = sorted(path for path in root.glob("*") if (path / "index.json").exists())
+    if not model_dirs:
+        print(f"📦 {root}: 저장된 임베딩이 없습니다.")
+    for model_dir in model_dirs:
+        with open(model_dir / "index.json", "r", encoding="utf-8") as f:
+            index = json.load(f)
+        stats = EmbeddingStore(index["model_id"], root=str(root)).stats()
+        print(f"📦 {stats['model_id']}: {stats['entries']}개 벡터 ({stats['dim']}차원, {stats['dtype']}), "
+              f"{stats['bytes'] / 1024 / 1024:.1f}MB - {stats['path']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,17 +4,13 @@ import os
 import argparse # 인자 처리를 위해 추가
 import sys
 from glob import glob
-from langchain_ollama import ChatOllama
+from llm_gateway import get_llm
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
 from langchain_core.runnables import RunnableLambda
 
 # --- 1. LLM 설정 ---
-llm = ChatOllama(
-    model="qwen3:32b",
-    base_url="http://192.168.120.102:11434",
-    temperature=0
-)
+llm = get_llm(temperature=0)
 
 def remove_think_tags(text: str) -> str:
     """<think> 태그를 제거합니다."""
@@ -69,14 +65,18 @@ please write in korean.
     parser = StrOutputParser() | RunnableLambda(remove_think_tags) | JsonOutputParser()
     return prompt | llm | parser
 
-def process_single_report(report_file):
-    """단일 보고서 파일에서 Lean Canvas를 추출하는 메인 로직"""
+def process_single_report(report_file, report_data=None):
+    """
+    단일 보고서 파일에서 Lean Canvas를 추출하는 메인 로직. 추출한 Lean Canvas를 반환합니다. (실패 시 None)
+    report_data가 주어지면 파일을 다시 읽지 않고 그대로 사용합니다.
+    """
     extractor_chain = create_extractor_chain(llm)
 
     print(f"\n\n{'='*50}\nProcessing file: {report_file}\n{'='*50}")
     try:
-        with open(report_file, 'r', encoding='utf-8') as f:
-            report_data = json.load(f)
+        if report_data is None:
+            with open(report_file, 'r', encoding='utf-8') as f:
+                report_data = json.load(f)
         
         report_text = report_data.get("final_competitive_report", "")
         if not report_text:
@@ -106,6 +106,8 @@ def process_single_report(report_file):
         except Exception as e:
             print(f"🚨 ERROR: Failed to save Lean Canvas to {output_path}: {e}")
 
+        return lean_canvas_json
+
     except Exception as e:
         print(f"🚨 An error occurred during the extraction process: {e}")
 
@@ -8,12 +8,12 @@ from typing import TypedDict, List, Annotated
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser, JsonOutputParser
 from langchain_core.runnables import RunnableLambda
-from langchain_ollama import ChatOllama
+from llm_gateway import get_llm
 from langgraph.graph import StateGraph, END
 
 # --- 1. LLM 및 상태 정의 ---
-llm = ChatOllama(model="qwen3:32b", base_url="http://192.168.120.102:11434", temperature=0.3)
-llm_validator = ChatOllama(model="qwen3:32b", base_url="http://192.168.120.102:11434", temperature=0.0) # 검증기는 엄격하게
+llm = get_llm(temperature=0.3)
+llm_validator = get_llm(temperature=0.0) # 검증기는 엄격하게
 
 class GraphState(TypedDict):
     """LangGraph의 상태를 정의합니다."""
@@ -37,7 +37,7 @@ def remove_think_tags(text: str) -> str:
 
 # --- 2. 핵심 체인 정의 (생성 및 검증) ---
 
-def create_briefing_notes_chain():
+def create_briefing_notes_chain(refresh: bool = False):
     prompt = PromptTemplate.from_template("""You are a junior analyst. Based on the provided data, create a detailed briefing note.
 If you are revising, incorporate the feedback to improve the notes.
 
@@ -57,7 +57,8 @@ The current date is {current_date}. Base your analysis on this date.
 **## 분석 브리핑 노트**
 ... (your detailed notes here) ...
 """)
-    return prompt | llm | StrOutputParser()
+    # 재작성 시 피드백이 이전과 같으면 프롬프트도 같으므로, 캐시를 조회하지 않고 새로 생성합니다.
+    return prompt | (get_llm(temperature=0.3, refresh_cache=True) if refresh else llm) | StrOutputParser()
 
 def create_note_validator_chain():
     prompt = PromptTemplate.from_template("""You are a meticulous fact-checker and strategist. Your task is to validate the Briefing Notes against the Source Data.
@@ -149,12 +150,16 @@ def load_data(state: GraphState):
     lean_path = f'bm_result/lean_canvas_{identifier}.json'
     
     try:
-        with open(adv_path, 'r', encoding='utf-8') as f:
-            state['initial_analysis'] = json.load(f).get("final_report_korean", "")
-        with open(comp_path, 'r', encoding='utf-8') as f:
-            state['competitor_analysis'] = json.load(f).get("final_competitive_report", "")
-        with open(lean_path, 'r', encoding='utf-8') as f:
-            state['lean_canvas'] = json.dumps(json.load(f), ensure_ascii=False, indent=2)
+        # 파이프라인 실행기가 이전 단계 결과를 메모리로 넘겨준 경우 파일을 읽지 않습니다.
+        if not state.get('initial_analysis'):
+            with open(adv_path, 'r', encoding='utf-8') as f:
+                state['initial_analysis'] = json.load(f).get("final_report_korean", "")
+        if not state.get('competitor_analysis'):
+            with open(comp_path, 'r', encoding='utf-8') as f:
+                state['competitor_analysis'] = json.load(f).get("final_competitive_report", "")
+        if not state.get('lean_canvas'):
+            with open(lean_path, 'r', encoding='utf-8') as f:
+                state['lean_canvas'] = json.dumps(json.load(f), ensure_ascii=False, indent=2)
         
         if not all([state['initial_analysis'], state['competitor_analysis'], state['lean_canvas']]):
             raise ValueError("One or more input files are missing necessary content.")
@@ -178,7 +183,7 @@ def load_data(state: GraphState):
 def generate_briefing_notes(state: GraphState):
     print(f"--- 2. 브리핑 노트 생성 중 (시도: {state['current_retry'] + 1}) ---")
     try:
-        chain = create_briefing_notes_chain()
+        chain = create_briefing_notes_chain(refresh=state['current_retry'] > 0)
         notes_raw = chain.invoke(state)
         notes_cleaned = remove_think_tags(notes_raw)
         
@@ -306,10 +311,14 @@ def build_graph():
     return workflow.compile()
 
 
-def run_pipeline(identifier: str):
+def run_pipeline(identifier: str, inputs: dict = None):
+    """
+    전략 보고서를 생성해 저장하고 저장한 데이터를 반환합니다. (실패 시 None)
+    inputs로 initial_analysis / competitor_analysis / lean_canvas를 넘기면 bm_result 파일 대신 사용합니다.
+    """
     try:
         app = build_graph()
-        final_state = app.invoke({"identifier": identifier})
+        final_state = app.invoke({"identifier": identifier, **(inputs or {})})
 
         print("\n--- 파이프라인 최종 결과 ---")
         if final_state.get('final_report'):
@@ -336,6 +345,7 @@ def run_pipeline(identifier: str):
                 
             except Exception as e:
                 print(f"🚨 ERROR: Failed to save strategic report: {e}")
+            return output_data
         else:
             print("🚨 최종 보고서를 생성하지 못했습니다.")
             
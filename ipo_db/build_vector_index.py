@@ -5,11 +5,17 @@ IPO 기업 데이터 벡터 인덱스 빌더
 Sentence-BERT 모델을 사용하여 의미 벡터(Embedding)로 변환하고,
 FAISS를 이용해 빠른 검색을 위한 벡터 인덱스 파일을 생성합니다.
 
+인덱스는 `company_no`를 벡터 ID로 쓰는 IndexIDMap이며, 기업별 사업 개요 해시를 함께 저장합니다.
+다시 실행하면 새로 추가되었거나 내용이 바뀐 기업만 임베딩하고, DB에서 사라진 기업의 벡터는 지웁니다.
+(바뀐 기업이 없으면 임베딩 모델도 로드하지 않습니다.)
+
 [생성되는 파일]
-1. `ipo_vectors.index`: FAISS 벡터 인덱스 파일
-2. `company_mapping.json`: 인덱스 순서와 `company_no`를 매핑하는 파일
+1. `ipo_vectors.index`: FAISS 벡터 인덱스 파일 (벡터 ID = company_no)
+2. `company_mapping.json`: 벡터 ID와 `company_no`를 매핑하는 파일
+3. `company_hashes.json`: 임베딩 모델 이름과 기업별 사업 개요 해시 (증분 갱신용)
 
-이 스크립트는 DB에 중요한 변경이 있을 때마다 한 번씩 실행해주면 됩니다.
+이 스크립트는 수집(run_batch_ipo_scraper.py) 후 한 번씩 실행해주면 됩니다.
+전체를 다시 만들려면 `--full` 옵션을 사용합니다.
 """
 import duckdb
 import pandas as pd
@@ -19,17 +25,52 @@ import faiss
 from sentence_transformers import SentenceTransformer
 import time
 import os
+import hashlib
+import argparse
 from dotenv import load_dotenv
 
 # --- 설정 ---
 DB_FILE = "ipo_db/ipo_data.db"
 INDEX_FILE = "ipo_db/ipo_vectors.index"
 MAPPING_FILE = "ipo_db/company_mapping.json"
+HASH_FILE = "ipo_db/company_hashes.json"
 # 한국어 문장 임베딩에 특화된 모델 사용 (오타 수정)
 MODEL_NAME = 'jhgan/ko-sroberta-multitask'
 
-def build_index():
-    """DB에서 데이터를 읽어 FAISS 인덱스를 구축하고 저장합니다."""
+def summary_hash(text):
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def load_index_state():
+    """기존 인덱스와 기업별 해시를 읽습니다. 없거나 ID 기반 인덱스가 아니거나 모델이 바뀌었으면 (None, {})"""
+    try:
+        index = faiss.read_index(INDEX_FILE)
+        with open(HASH_FILE, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+    except Exception:
+        return None, {}
+    # 예전 방식(위치 기반 IndexFlatL2) 인덱스나 다른 모델로 만든 인덱스는 재사용하지 않습니다.
+    if not isinstance(index, faiss.IndexIDMap) or state.get('model') != MODEL_NAME:
+        return None, {}
+    hashes = state.get('hashes', {})
+    if index.ntotal != len(hashes):
+        return None, {}
+    return index, hashes
+
+def save_index_state(index, hashes):
+    """인덱스, 매핑, 해시 파일을 임시 파일에 쓴 뒤 교체합니다. (중간에 중단돼도 서로 어긋나지 않도록)"""
+    faiss.write_index(index, f"{INDEX_FILE}.tmp")
+    # 검색 결과의 벡터 ID로 company_no를 찾을 수 있도록 ID -> company_no 매핑을 저장합니다.
+    mapping = {str(int(no)): no for no in hashes}
+    with open(f"{MAPPING_FILE}.tmp", 'w', encoding='utf-8') as f:
+        json.dump(mapping, f)
+    with open(f"{HASH_FILE}.tmp", 'w', encoding='utf-8') as f:
+        json.dump({'model': MODEL_NAME, 'hashes': hashes}, f)
+    os.replace(f"{INDEX_FILE}.tmp", INDEX_FILE)
+    os.replace(f"{MAPPING_FILE}.tmp", MAPPING_FILE)
+    os.replace(f"{HASH_FILE}.tmp", HASH_FILE)
+
+def build_index(full=False):
+    """DB에서 데이터를 읽어 FAISS 인덱스를 증분 갱신(또는 full=True면 새로 구축)하고 저장합니다."""
     start_time = time.time()
     
     # .env 파일에서 환경 변수 로드
@@ -55,54 +96,96 @@ def build_index():
         print("오류: 벡터로 변환할 사업 개요 데이터가 DB에 없습니다.")
         return
 
-    print(f"총 {len(df)}개의 기업 개요를 벡터로 변환합니다.")
+    # 벡터 ID로 쓸 수 있도록 company_no가 숫자인 기업만 사용합니다.
+    numeric = df['company_no'].str.fullmatch(r'\d+')
+    if not numeric.all():
+        print(f"경고: company_no가 숫자가 아닌 기업 {int((~numeric).sum())}개는 제외합니다.")
+        df = df[numeric]
+    df = df.drop_duplicates('company_no', keep='last')
+    # 앞자리 0만 다른 번호('012'와 '12')는 같은 벡터 ID가 되므로 마지막 기업만 남깁니다.
+    vector_ids = df['company_no'].astype('int64')
+    collided = vector_ids.duplicated(keep=False)
+    if collided.any():
+        print(f"경고: 벡터 ID가 겹치는 company_no {sorted(df.loc[collided, 'company_no'])} 중 마지막 기업만 사용합니다.")
+        df = df[~vector_ids.duplicated(keep='last')]
+    df = df.reset_index(drop=True)
+    if df.empty:
+        print("오류: 벡터로 변환할 사업 개요 데이터가 DB에 없습니다. (숫자 company_no 기업 없음)")
+        return
+    df['hash'] = df['business_summary'].map(summary_hash)
 
-    # 2. 문장 임베딩 모델 로드
-    print(f"'{MODEL_NAME}' 임베딩 모델을 로드하는 중... (최초 실행 시 시간이 소요될 수 있습니다)")
-    try:
-        model = SentenceTransformer(MODEL_NAME, use_auth_token=hf_token)
-    except Exception as e:
-        print(f"모델 로드 중 오류 발생: {e}")
-        print("인터넷 연결을 확인하거나, 'pip install -U sentence-transformers'로 라이브러리를 업데이트해보세요.")
+    # 2. 기존 인덱스와 비교해 추가/변경/삭제 대상 계산
+    index, hashes = (None, {}) if full else load_index_state()
+    if index is None:
+        hashes = {}
+        print("새 인덱스를 구축합니다." if full else "재사용할 수 있는 기존 인덱스가 없어 새로 구축합니다.")
+    current = dict(zip(df['company_no'], df['hash']))
+    to_embed = df[[hashes.get(no) != h for no, h in zip(df['company_no'], df['hash'])]]
+    changed = [no for no in to_embed['company_no'] if no in hashes]
+    stale = [no for no in hashes if no not in current]
+    print(f"전체 {len(df)}개 중 신규 {len(to_embed) - len(changed)}개, 변경 {len(changed)}개, 삭제 {len(stale)}개")
+
+    if index is not None and to_embed.empty and not stale:
+        print("변경된 기업이 없어 인덱스를 그대로 사용합니다.")
         return
+
+    embeddings = None
+    if not to_embed.empty:
+        # 3. 문장 임베딩 모델 로드
+        print(f"'{MODEL_NAME}' 임베딩 모델을 로드하는 중... (최초 실행 시 시간이 소요될 수 있습니다)")
+        try:
+            model = SentenceTransformer(MODEL_NAME, use_auth_token=hf_token)
+        except Exception as e:
+            print(f"모델 로드 중 오류 발생: {e}")
+            print("인터넷 연결을 확인하거나, 'pip install -U sentence-transformers'로 라이브러리를 업데이트해보세요.")
+            return
+            
+        # 4. 텍스트를 벡터로 변환 (임베딩)
+        print(f"사업 개요 텍스트 {len(to_embed)}개를 임베딩 벡터로 변환하는 중...")
+        # 모델의 최대 시퀀스 길이에 맞춰 텍스트 자르기 (안정성 확보)
+        max_seq_length = model.get_max_seq_length()
+        summaries = to_embed['business_summary'].str.slice(0, max_seq_length).tolist()
         
-    # 3. 텍스트를 벡터로 변환 (임베딩)
-    print("사업 개요 텍스트를 임베딩 벡터로 변환하는 중...")
-    # 모델의 최대 시퀀스 길이에 맞춰 텍스트 자르기 (안정성 확보)
-    max_seq_length = model.get_max_seq_length()
-    summaries = df['business_summary'].str.slice(0, max_seq_length).tolist()
-    
-    embeddings = model.encode(summaries, show_progress_bar=True, convert_to_numpy=True)
-    
-    # 벡터 차원 확인
-    d = embeddings.shape[1]
-    print(f"임베딩 벡터 생성 완료. 벡터 차원: {d}")
+        embeddings = model.encode(summaries, show_progress_bar=True, convert_to_numpy=True).astype('float32') # FAISS는 float32 타입을 사용
+        print(f"임베딩 벡터 생성 완료. 벡터 차원: {embeddings.shape[1]}")
 
-    # 4. FAISS 인덱스 구축
-    print("FAISS 인덱스를 구축하는 중...")
-    index = faiss.IndexFlatL2(d)  # L2 거리(유클리드 거리)를 사용하는 기본 인덱스
-    index.add(embeddings.astype('float32')) # FAISS는 float32 타입을 사용
+    # 5. FAISS 인덱스 갱신
+    print("FAISS 인덱스를 갱신하는 중...")
+    if index is None:
+        if embeddings is None:
+            print("오류: 새 인덱스를 만들 임베딩 벡터가 없습니다.")
+            return
+        # L2 거리(유클리드 거리)를 사용하는 기본 인덱스를 company_no ID로 감쌉니다.
+        index = faiss.IndexIDMap(faiss.IndexFlatL2(embeddings.shape[1]))
+    remove_nos = stale + changed
+    if remove_nos:
+        index.remove_ids(np.array([int(no) for no in remove_nos], dtype='int64'))
+        for no in stale:
+            hashes.pop(no, None)
+    if embeddings is not None:
+        index.add_with_ids(embeddings, np.array([int(no) for no in to_embed['company_no']], dtype='int64'))
+        hashes.update(zip(to_embed['company_no'], to_embed['hash']))
 
-    # 5. 인덱스 및 매핑 파일 저장
+    # 6. 인덱스, 매핑, 해시 파일 저장
     print(f"'{INDEX_FILE}' 파일에 인덱스를 저장하는 중...")
-    faiss.write_index(index, INDEX_FILE)
-
-    # 인덱스 순서에 맞는 company_no 매핑 정보 저장
-    mapping = {i: row['company_no'] for i, row in df.iterrows()}
-    with open(MAPPING_FILE, 'w', encoding='utf-8') as f:
-        json.dump(mapping, f)
+    save_index_state(index, hashes)
         
     end_time = time.time()
     print("\n" + "="*50)
-    print("      벡터 인덱스 생성 완료!")
+    print("      벡터 인덱스 갱신 완료!")
     print("="*50)
-    print(f"  - 처리한 기업 수: {index.ntotal}개")
+    print(f"  - 인덱스 기업 수: {index.ntotal}개 (임베딩 {len(to_embed)}개, 삭제 {len(stale)}개)")
     print(f"  - 총 소요 시간: {time.strftime('%M분 %S초', time.gmtime(end_time - start_time))}")
     print(f"  - 인덱스 파일: '{INDEX_FILE}'")
     print(f"  - 매핑 파일: '{MAPPING_FILE}'")
+    print(f"  - 해시 파일: '{HASH_FILE}'")
     print("="*50)
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="IPO 기업 사업 개요 벡터 인덱스를 구축/갱신합니다.")
+    parser.add_argument("--full", action="store_true", help="기존 인덱스를 무시하고 전체를 다시 임베딩합니다.")
+    args = parser.parse_args()
+
     # 필수 라이브러리 확인
     try:
         import sentence_transformers
@@ -112,4 +195,4 @@ if __name__ == "__main__":
         print("'pip install sentence-transformers faiss-cpu' 명령어로 설치해주세요.")
         exit()
         
-    build_index()
+    build_index(full=args.full)
@@ -16,4 +16,10 @@ print(conn.fetch_df())
 
 conn.execute("SELECT * FROM stock_indicators LIMIT 10")
 
-print(conn.fetch_df())
\ No newline at end of file
+print(conn.fetch_df())
+
+
+
+conn.execute("SELECT * FROM company_metrics LIMIT 10")
+
+print(conn.fetch_df())
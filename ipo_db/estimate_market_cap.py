@@ -6,6 +6,8 @@ import faiss
 from sentence_transformers import SentenceTransformer
 import re
 import os
+from glob import glob
+from datetime import datetime
 from dotenv import load_dotenv
 import argparse
 
@@ -15,6 +17,10 @@ INDEX_FILE = "ipo_db/ipo_vectors.index"
 MAPPING_FILE = "ipo_db/company_mapping.json"
 MODEL_NAME = 'jhgan/ko-sroberta-multitask'
 TOP_K = 50  # 필터링을 고려하여 검색 대상을 늘림
+PEER_COUNT = 10  # 유사 기업 그룹 크기
+BATCH_OUTPUT_DIR = "analysis_results"
+REQUIRED_TABLES = ("companies", "valuation_multiples")
+MIGRATION_COMMAND = "python ipo_db/save_ipo_data_to_db.py --rebuild-metrics"
 
 def generate_business_summary(data):
     """종합 데이터 JSON에서 비즈니스 요약 텍스트를 생성합니다."""
@@ -55,70 +61,93 @@ def parse_financial_value(value_str):
     if '만' in value_str: return float(re.sub(r'[^\d.]', '', value_str)) * 1e4
     return pd.to_numeric(value_str, errors='coerce')
 
+def extract_financials(data):
+    """종합 데이터 JSON에서 최근(2024년 개별) 자본과 매출을 꺼냅니다."""
+    financials = {}
+    if data.get("innoforest_data"):
+        financial_data = data["innoforest_data"].get("financial", {})
+        profit_loss_data = data["innoforest_data"].get("profit_loss", {})
+        financials['latest_equity'] = parse_financial_value(financial_data.get("자본", {}).get("2024년 (개별)"))
+        financials['latest_revenue'] = parse_financial_value(profit_loss_data.get("매출액", {}).get("2024년 (개별)"))
+    else:
+        financials['latest_equity'] = 0
+        financials['latest_revenue'] = 0
+    return financials
+
+def missing_tables(conn, tables=REQUIRED_TABLES):
+    """DB에 없는 테이블 이름 목록을 반환합니다. (읽기 전용 연결에서는 테이블을 만들 수 없으므로 미리 확인)"""
+    existing = {row[0] for row in conn.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+    return [table for table in tables if table not in existing]
+
+def print_migration_hint(tables):
+    print(f"오류: DB에 {', '.join(tables)} 테이블이 없습니다. 이전 스키마의 DB라면 먼저 마이그레이션을 실행해주세요:")
+    print(f"  {MIGRATION_COMMAND}")
+
 def get_listed_company_nos(conn):
     """PBR 또는 PSR 데이터가 있는 상장 기업의 company_no 목록을 반환합니다."""
     query = """
-    SELECT DISTINCT company_no
-    FROM stock_indicators
-    WHERE item IN ('PBR (주가순자산비율)', 'SPS (주당매출액)') AND value IS NOT NULL
+    SELECT company_no
+    FROM valuation_multiples
+    WHERE pbr IS NOT NULL OR sps IS NOT NULL
     """
     return conn.execute(query).fetchdf()['company_no'].tolist()
 
+def load_vector_index():
+    """FAISS 인덱스와 (벡터 ID -> company_no) 매핑을 읽습니다."""
+    index = faiss.read_index(INDEX_FILE)
+    with open(MAPPING_FILE, 'r') as f:
+        mapping = json.load(f)
+    return index, mapping
+
+def find_similar_companies_batch(target_summaries, model, listed_nos_set, index, mapping):
+    """
+    여러 기업의 요약을 한 번에 임베딩/검색하고, 기업마다 상장 기업만 필터링한 상위 PEER_COUNT개의
+    (유사 기업 번호 목록, 유사도 목록)을 입력 순서대로 반환합니다.
+    """
+    target_vectors = np.asarray(model.encode(list(target_summaries)), dtype='float32')
+    faiss.normalize_L2(target_vectors)
+
+    distances, indices = index.search(target_vectors, TOP_K)
+
+    peer_groups = []
+    for row_distances, row_indices in zip(distances, indices):
+        results = []
+        for distance, idx in zip(row_distances, row_indices):
+            company_no = mapping.get(str(idx))
+            if company_no and company_no in listed_nos_set:
+                results.append({'company_no': company_no, 'similarity': 1 - distance})
+
+        # 유사도 기준으로 정렬 후 상위 10개 선택
+        results = sorted(results, key=lambda x: x['similarity'], reverse=True)[:PEER_COUNT]
+        peer_groups.append(([r['company_no'] for r in results], [r['similarity'] for r in results]))
+    return peer_groups
+
 def find_similar_companies_by_vector(target_summary, model, listed_nos_set):
     """FAISS로 유사 기업을 찾고, 상장 기업만 필터링하여 상위 10개를 반환합니다."""
     try:
-        index = faiss.read_index(INDEX_FILE)
-        with open(MAPPING_FILE, 'r') as f:
-            mapping = json.load(f)
+        index, mapping = load_vector_index()
     except Exception as e:
         print(f"오류: 인덱스 또는 매핑 파일을 로드할 수 없습니다. '{e}'")
         return [], []
-
-    target_vector = model.encode([target_summary])
-    faiss.normalize_L2(target_vector)
-
-    distances, indices = index.search(target_vector, TOP_K)
-    
-    results = []
-    for i, idx in enumerate(indices[0]):
-        company_no = mapping.get(str(idx))
-        if company_no and company_no in listed_nos_set:
-            similarity = 1 - distances[0][i]
-            results.append({'company_no': company_no, 'similarity': similarity})
-
-    # 유사도 기준으로 정렬 후 상위 10개 선택
-    results = sorted(results, key=lambda x: x['similarity'], reverse=True)[:10]
-    
-    similar_nos = [r['company_no'] for r in results]
-    similarities = [r['similarity'] for r in results]
-    
-    return similar_nos, similarities
+    return find_similar_companies_batch([target_summary], model, listed_nos_set, index, mapping)[0]
 
 def get_valuation_multiples(conn, company_nos):
-    """주어진 기업 목록의 PBR, PSR 지표를 계산하여 반환합니다."""
+    """주어진 기업 목록의 PBR, PSR(확정공모가 / SPS) 지표를 valuation_multiples 테이블에서 읽어 반환합니다."""
     if not company_nos: return pd.DataFrame()
     placeholders = ', '.join(['?'] * len(company_nos))
     query = f"""
-        SELECT c.company_no, c.company_name, c.data_payload,
-               (SELECT si.value FROM stock_indicators si WHERE si.company_no = c.company_no AND si.item = 'PBR (주가순자산비율)' LIMIT 1) AS pbr_value,
-               (SELECT si.value FROM stock_indicators si WHERE si.company_no = c.company_no AND si.item = 'SPS (주당매출액)' LIMIT 1) AS sps_value
-        FROM companies c WHERE c.company_no IN ({placeholders})
+        SELECT company_no, company_name, pbr, offering_psr AS psr
+        FROM valuation_multiples
+        WHERE company_no IN ({placeholders}) AND (pbr IS NOT NULL OR offering_psr IS NOT NULL)
     """
-    df = conn.execute(query, company_nos).fetchdf()
+    return conn.execute(query, list(company_nos)).fetchdf()
 
-    df['pbr'] = pd.to_numeric(df['pbr_value'].str.extract(r'([-]?\d+\.?\d*)')[0], errors='coerce')
-    df['sps'] = pd.to_numeric(df['sps_value'].str.replace(',', '').str.extract(r'(\d+)')[0], errors='coerce')
-    
-    def extract_price(payload):
-        try:
-            price_str = json.loads(payload).get('확정공모가', '0')
-            return float(re.sub(r'[^\d.]', '', price_str))
-        except: return 0
-
-    df['offering_price'] = df['data_payload'].apply(extract_price)
-    df['psr'] = df.apply(lambda row: row['offering_price'] / row['sps'] if row['sps'] and row['sps'] > 0 else np.nan, axis=1)
-
-    return df[['company_no', 'company_name', 'pbr', 'psr']].dropna(subset=['pbr', 'psr'], how='all')
+def summarize_multiples(multiples_df):
+    """유사 기업 그룹의 PBR/PSR 평균과 중앙값을 계산합니다."""
+    return {
+        "PBR_avg": multiples_df['pbr'].mean(), "PBR_median": multiples_df['pbr'].median(),
+        "PSR_avg": multiples_df['psr'].mean(), "PSR_median": multiples_df['psr'].median(),
+    }
 
 def format_currency(value):
     if pd.isna(value): return "N/A"
@@ -133,16 +162,7 @@ def main(target_file_path):
 
     target_company_name = data.get("company_name", "알 수 없는 기업")
     business_summary = generate_business_summary(data)
-
-    financials = {}
-    if data.get("innoforest_data"):
-        financial_data = data["innoforest_data"].get("financial", {})
-        profit_loss_data = data["innoforest_data"].get("profit_loss", {})
-        financials['latest_equity'] = parse_financial_value(financial_data.get("자본", {}).get("2024년 (개별)"))
-        financials['latest_revenue'] = parse_financial_value(profit_loss_data.get("매출액", {}).get("2024년 (개별)"))
-    else:
-        financials['latest_equity'] = 0
-        financials['latest_revenue'] = 0
+    financials = extract_financials(data)
 
     print("="*60 + f"\n     '{target_company_name}' 예상 시가총액 분석 (벡터 검색 기반)\n" + "="*60)
     print("\n[0] 생성된 비즈니스 요약:\n" + business_summary)
@@ -152,6 +172,9 @@ def main(target_file_path):
 
     print("\n[1] 유사 기업 그룹(Comparable Companies) 선정 중...")
     conn = duckdb.connect(DB_FILE, read_only=True)
+    missing = missing_tables(conn)
+    if missing:
+        print_migration_hint(missing); conn.close(); return
     listed_nos_set = set(get_listed_company_nos(conn))
     print(f"▶ 총 {len(listed_nos_set)}개의 상장기업을 대상으로 검색합니다.")
 
@@ -178,10 +201,7 @@ def main(target_file_path):
     if multiples_df.empty:
         print("유사 기업의 가치평가 지표를 계산할 수 없습니다."); conn.close(); return
 
-    metrics = {
-        "PBR_avg": multiples_df['pbr'].mean(), "PBR_median": multiples_df['pbr'].median(),
-        "PSR_avg": multiples_df['psr'].mean(), "PSR_median": multiples_df['psr'].median(),
-    }
+    metrics = summarize_multiples(multiples_df)
     
     print("\n▶ 요약 지표:")
     print(f"  - 평균 PBR: {metrics['PBR_avg']:.2f}x | 중앙값 PBR: {metrics['PBR_median']:.2f}x")
@@ -202,10 +222,102 @@ def main(target_file_path):
     print("\n" + "-"*60 + "\n[주의사항]\n- 본 분석은 DB 데이터와 의미 유사도에 기반한 개략적인 추정치입니다.\n- 실제 기업 가치는 시장 상황, 성장 잠재력 등 여러 요인에 따라 달라질 수 있습니다.\n" + "="*60)
     conn.close()
 
+def _number(value):
+    """JSON 보고서용 숫자 변환 (NaN/inf는 None)"""
+    return float(value) if value is not None and pd.notna(value) and np.isfinite(value) else None
+
+def run_batch(target_files, output_dir=BATCH_OUTPUT_DIR):
+    """
+    여러 기업의 종합 데이터 JSON을 한 번에 분석합니다.
+    임베딩 모델 로드, FAISS 인덱스 읽기, 유사 기업 검색, 가치평가 지표 조회를 모두 한 번씩만 수행하고
+    기업별 유사 기업 그룹과 예상 시가총액을 배치 보고서(JSON)로 저장합니다.
+    """
+    targets, results = [], {}
+    for path in target_files:
+        try:
+            with open(path, 'r', encoding='utf-8') as f: data = json.load(f)
+        except (FileNotFoundError, json.JSONDecodeError) as e:
+            results[path] = {"file": path, "status": "failed", "error": f"입력 파일 오류: {e}"}
+            continue
+        targets.append({
+            "file": path,
+            "company_name": data.get("company_name", "알 수 없는 기업"),
+            "business_summary": generate_business_summary(data),
+            "financials": extract_financials(data),
+        })
+
+    if targets:
+        load_dotenv()
+        hf_token = os.getenv("HF_TOKEN")
+        with duckdb.connect(DB_FILE, read_only=True) as conn:
+            missing = missing_tables(conn)
+            if missing:
+                print_migration_hint(missing)
+                return []
+            listed_nos_set = set(get_listed_company_nos(conn))
+            print(f"▶ {len(targets)}개 기업, {len(listed_nos_set)}개 상장기업 대상 유사 기업 검색")
+
+            print("임베딩 모델을 로드합니다...")
+            model = SentenceTransformer(MODEL_NAME, use_auth_token=hf_token)
+            index, mapping = load_vector_index()
+            peer_groups = find_similar_companies_batch([t["business_summary"] for t in targets], model, listed_nos_set, index, mapping)
+
+            # 모든 기업의 유사 기업 지표를 쿼리 한 번으로 조회합니다.
+            all_peer_nos = sorted({no for similar_nos, _ in peer_groups for no in similar_nos})
+            multiples_all = get_valuation_multiples(conn, all_peer_nos)
+            names = dict(conn.execute(
+                f"SELECT company_no, company_name FROM companies WHERE company_no IN ({', '.join(['?'] * len(all_peer_nos))})", all_peer_nos
+            ).fetchall()) if all_peer_nos else {}
+
+        for target, (similar_nos, similarities) in zip(targets, peer_groups):
+            peers = [{"company_no": no, "company_name": names.get(no), "similarity": _number(sim)}
+                     for no, sim in zip(similar_nos, similarities)]
+            multiples_df = multiples_all[multiples_all['company_no'].isin(similar_nos)] if not multiples_all.empty else multiples_all
+            result = {"file": target["file"], "company_name": target["company_name"], "peers": peers}
+            if not similar_nos:
+                result.update(status="failed", error="의미적으로 유사한 상장 기업을 찾을 수 없습니다.")
+            elif multiples_df.empty:
+                result.update(status="failed", error="유사 기업의 가치평가 지표를 계산할 수 없습니다.")
+            else:
+                metrics = summarize_multiples(multiples_df)
+                financials = target["financials"]
+                result.update(
+                    status="success",
+                    multiples=multiples_df.assign(pbr=multiples_df['pbr'].map(_number), psr=multiples_df['psr'].map(_number)).to_dict("records"),
+                    metrics={k: _number(v) for k, v in metrics.items()},
+                    financials={k: _number(v) for k, v in financials.items()},
+                    estimates={
+                        "pbr_median": _number(financials['latest_equity'] * metrics['PBR_median']),
+                        "psr_median": _number(financials['latest_revenue'] * metrics['PSR_median']),
+                    },
+                )
+            results[target["file"]] = result
+
+    files = [results[path] for path in target_files if path in results]
+    for r in files:
+        if r["status"] == "success":
+            print(f"  - {r['company_name']}: 유사 기업 {len(r['peers'])}곳, "
+                  f"PBR 기반 {format_currency(r['estimates']['pbr_median'])}, PSR 기반 {format_currency(r['estimates']['psr_median'])}")
+        else:
+            print(f"  - {r.get('company_name', r['file'])}: 실패 ({r['error']})")
+
+    os.makedirs(output_dir, exist_ok=True)
+    report_path = os.path.join(output_dir, f"valuation_batch_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump({"created_at": datetime.now().isoformat(timespec="seconds"), "files": files}, f, ensure_ascii=False, indent=2)
+    succeeded = sum(1 for r in files if r["status"] == "success")
+    print(f"\n📋 {succeeded}/{len(files)}개 성공. 배치 보고서: {report_path}")
+    return files
+
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="IPO 예정 기업의 예상 시가총액을 분석합니다.")
-    parser.add_argument("target_file", help="분석할 기업의 종합 데이터 JSON 파일 경로")
+    parser.add_argument("target_file", nargs="?", help="분석할 기업의 종합 데이터 JSON 파일 경로")
+    parser.add_argument("--batch", nargs="+", metavar="GLOB",
+                        help="배치 모드: 종합 데이터 JSON glob 패턴 (예: 'company_summary/*.json')")
+    parser.add_argument("--output-dir", type=str, default=BATCH_OUTPUT_DIR, help="배치 모드: 보고서 저장 디렉토리")
     args = parser.parse_args()
+    if not args.target_file and not args.batch:
+        parser.error("target_file 또는 --batch가 필요합니다.")
 
     try:
         import sentence_transformers, faiss, dotenv
@@ -213,5 +325,11 @@ if __name__ == "__main__":
         print(f"오류: 필수 라이브러리가 설치되지 않았습니다 - {e.name}")
         print("uv pip install sentence-transformers faiss-cpu python-dotenv' 명령어로 설치해주세요.")
         exit()
-        
-    main(args.target_file)
\ No newline at end of file
+
+    if args.batch:
+        target_files = list(dict.fromkeys(path for pattern in args.batch for path in sorted(glob(pattern))))
+        if not target_files:
+            parser.error(f"JSON 파일을 찾을 수 없습니다: {args.batch}")
+        run_batch(target_files, output_dir=args.output_dir)
+    else:
+        main(args.target_file)
\ No newline at end of file
@@ -33,6 +33,8 @@ INDEX_FILE = "ipo_db/ipo_vectors.index"
 MAPPING_FILE = "ipo_db/company_mapping.json"
 MODEL_NAME = 'jhgan/ko-sroberta-multitask'
 TOP_K = 50  # 필터링을 고려하여 검색 대상을 늘림
+REQUIRED_TABLES = ("companies", "valuation_multiples")
+MIGRATION_COMMAND = "python ipo_db/save_ipo_data_to_db.py --rebuild-metrics"
 
 def generate_business_summary(data):
     '''종합 데이터 JSON에서 비즈니스 요약 텍스트를 생성합니다.'''
@@ -77,17 +79,23 @@ def parse_financial_value(value_str):
         return float(num_part.group()) * 1e4 if num_part else 0
     return pd.to_numeric(value_str, errors='coerce')
 
+def missing_tables(conn, tables=REQUIRED_TABLES):
+    '''DB에 없는 테이블 이름 목록을 반환합니다. (읽기 전용 연결에서는 테이블을 만들 수 없으므로 미리 확인)'''
+    existing = {row[0] for row in conn.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+    return [table for table in tables if table not in existing]
+
+def print_migration_hint(tables):
+    print(f"오류: DB에 {', '.join(tables)} 테이블이 없습니다. 이전 스키마의 DB라면 먼저 마이그레이션을 실행해주세요:")
+    print(f"  {MIGRATION_COMMAND}")
+
 def get_listed_company_nos(conn):
     '''PBR, PSR, PER 데이터 중 하나라도 있는 상장 기업의 company_no 목록을 반환합니다.'''
     query = '''
-    SELECT DISTINCT company_no
-    FROM stock_indicators
-    WHERE item IN ('PBR (주가수익비율)', 'SPS (주당매출액)', 'PER (주가수익비율)  공모가 대비') AND value IS NOT NULL AND value != '-'
+    SELECT company_no
+    FROM valuation_multiples
+    WHERE pbr IS NOT NULL OR sps IS NOT NULL OR per IS NOT NULL
     '''
-    try:
-        return conn.execute(query).fetchdf()['company_no'].tolist()
-    except Exception:
-        return []
+    return conn.execute(query).fetchdf()['company_no'].tolist()
 
 def find_similar_companies_by_vector(target_summary, model, listed_nos_set):
     '''FAISS로 유사 기업을 찾고, 상장 기업만 필터링하여 상위 10개를 반환합니다.'''
@@ -117,60 +125,17 @@ def find_similar_companies_by_vector(target_summary, model, listed_nos_set):
     return similar_nos, similarities
 
 def get_valuation_multiples(conn, company_nos):
-    '''주어진 기업 목록의 PBR, PSR, PER 지표를 계산하여 반환합니다.'''
+    '''주어진 기업 목록의 PBR, PSR(수집한 PSR, 없으면 현재가 / SPS), PER 지표를 valuation_multiples 테이블에서 읽어 반환합니다.'''
     if not company_nos: return pd.DataFrame()
     placeholders = ', '.join(['?'] * len(company_nos))
     
-    # 가능한 모든 지표 항목명 조회하여 실제 존재하는 것 찾기
-    check_query = '''
-    SELECT DISTINCT item 
-    FROM stock_indicators 
-    WHERE value IS NOT NULL AND value != '-' AND item LIKE '%PBR%' OR item LIKE '%PER%' OR item LIKE '%SPS%' OR item LIKE '%현재가%' OR item LIKE '%주가%'
-    '''
-    available_items = conn.execute(check_query).fetchdf()['item'].tolist()
-    
-    # PBR 관련 항목 찾기
-    pbr_items = [item for item in available_items if 'PBR' in item or '주가순자산비율' in item]
-    per_items = [item for item in available_items if 'PER' in item or '주가수익비율' in item]
-    sps_items = [item for item in available_items if 'SPS' in item or '주당매출' in item]
-    price_items = [item for item in available_items if '현재가' in item or '주가' in item]
-    
-    # 첫 번째로 찾은 항목 사용 (없으면 원래 항목명 유지)
-    pbr_item = pbr_items[0] if pbr_items else 'PBR (주가수익비율)'
-    per_item = per_items[0] if per_items else 'PER (주가수익비율)  공모가 대비'
-    sps_item = sps_items[0] if sps_items else 'SPS (주당매출액)'
-    price_item = price_items[0] if price_items else '현재가'
-    
+    # valuation_multiples는 수집 후 갱신되는 기업별 지표 테이블이므로 기업별 하위 쿼리나 문자열 파싱 없이 조회합니다.
     query = f'''
-        SELECT
-            c.company_no,
-            c.company_name,
-            (SELECT si.value FROM stock_indicators si WHERE si.company_no = c.company_no AND si.item = '{pbr_item}' AND si.value IS NOT NULL AND si.value != '-' LIMIT 1) AS pbr_str,
-            (SELECT si.value FROM stock_indicators si WHERE si.company_no = c.company_no AND si.item = '{per_item}' AND si.value IS NOT NULL AND si.value != '-' LIMIT 1) AS per_str,
-            (SELECT si.value FROM stock_indicators si WHERE si.company_no = c.company_no AND si.item = '{sps_item}' AND si.value IS NOT NULL AND si.value != '-' LIMIT 1) AS sps_str,
-            (SELECT si.value FROM stock_indicators si WHERE si.company_no = c.company_no AND si.item = '{price_item}' AND si.value IS NOT NULL AND si.value != '-' LIMIT 1) AS price_str
-        FROM companies c
-        WHERE c.company_no IN ({placeholders})
+        SELECT company_no, company_name, pbr, psr, per
+        FROM valuation_multiples
+        WHERE company_no IN ({placeholders}) AND (pbr IS NOT NULL OR psr IS NOT NULL OR per IS NOT NULL)
     '''
-    df = conn.execute(query, company_nos).fetchdf()
-
-    # 데이터 클리닝 및 숫자 변환 (null 체크 추가)
-    def safe_extract_numeric(series, pattern=r'([-]?\d+\.?\d*)'):
-        if series is None:
-            return pd.Series([np.nan] * len(df))
-        return pd.to_numeric(series.fillna('').str.replace(',', '').str.extract(pattern)[0], errors='coerce')
-    
-    df['pbr'] = safe_extract_numeric(df['pbr_str'])
-    df['per'] = safe_extract_numeric(df['per_str'])
-    df['sps'] = safe_extract_numeric(df['sps_str'], r'(\d+\.?\d*)')
-    df['price'] = safe_extract_numeric(df['price_str'], r'(\d+\.?\d*)')
-
-    # PSR 계산 (안전한 계산)
-    df['psr'] = df.apply(lambda row: row['price'] / row['sps'] if pd.notna(row['sps']) and row['sps'] > 0 and pd.notna(row['price']) else np.nan, axis=1)
-
-    # 최소한 하나의 유효한 지표라도 있는 기업만 반환
-    result_df = df[['company_no', 'company_name', 'pbr', 'psr', 'per']]
-    return result_df[result_df[['pbr', 'psr', 'per']].notna().any(axis=1)]
+    return conn.execute(query, list(company_nos)).fetchdf()
 
 def format_currency(value):
     if pd.isna(value) or not np.isfinite(value): return "N/A"
@@ -206,6 +171,11 @@ def main(target_file_path):
     hf_token = os.getenv("HF_TOKEN")
 
     conn = duckdb.connect(DB_FILE, read_only=True)
+    missing = missing_tables(conn)
+    if missing:
+        print_migration_hint(missing)
+        conn.close()
+        return
     listed_nos_set = set(get_listed_company_nos(conn))
     
     if not listed_nos_set:
@@ -7,6 +7,12 @@
 
 [주요 기능]
 - 여러 기업 정보를 동시에 스크래핑하여 작업 시간을 단축합니다.
+- 기업 페이지는 정적 HTML이므로 연결을 재사용하는 HTTP 클라이언트로 받아 lxml로 파싱합니다.
+  HTTP 수집이 예외로 실패한 기업만 Playwright(Chromium)로 다시 시도하며, 브라우저는 처음 필요할 때 띄웁니다.
+  (FETCH_MODE = "playwright"로 두면 기존처럼 모든 기업을 Playwright로 수집합니다.)
+- 스크래핑 작업자는 결과를 큐에 넣기만 하고, 하나의 DB 작성자가 큐를 모아 한 트랜잭션으로 일괄 저장합니다.
+  (DuckDB는 쓰기 프로세스/연결이 하나일 때 가장 빠르고, 작업자마다 연결을 열지 않아도 됩니다.)
+- 수집이 끝나면 기업별 가치평가 지표(valuation_multiples) 테이블을 한 번 갱신합니다.
 - DB에 이미 존재하는 기업 정보는 건너뜁니다.
 - 스크래핑 시 필수 데이터가 없으면 저장하지 않습니다.
 - 진행 상황과 최종 결과를 요약하여 보여줍니다.
@@ -19,7 +25,8 @@ import time
 from collections import Counter
 
 # 다른 파일에서 함수 임포트
-from save_ipo_data_to_db import create_tables, scrape_company_data, save_data_to_db
+from save_ipo_data_to_db import (create_tables, scrape_company_data, build_records, save_records_batch, refresh_valuation_multiples,
+                                 HTTP_FETCH_AVAILABLE, USER_AGENT, create_http_client, scrape_company_data_http)
 
 # --- 설정 ---
 DB_FILE = "ipo_db/ipo_data.db"
@@ -27,39 +34,107 @@ START_NO = 1
 END_NO = 5000
 # 동시에 실행할 최대 작업 수. 너무 높게 설정하면 서버에 부담을 주거나 차단될 수 있습니다. (5 ~ 10 권장)
 CONCURRENCY_LIMIT = 10 
+WRITE_BATCH_SIZE = 50       # 한 트랜잭션에 저장할 최대 기업 수
+WRITE_FLUSH_SECONDS = 5.0   # 배치가 다 차지 않아도 이 시간이 지나면 저장
+FETCH_MODE = "http"         # "http": HTTP 수집 후 실패 시 Playwright, "playwright": 모두 Playwright로 수집
 
-async def worker(semaphore: asyncio.Semaphore, browser: Browser, company_no: str):
+class PlaywrightFallback:
+    """HTTP 수집이 실패한 기업만 처리하는 Playwright 경로. 브라우저는 처음 필요할 때 한 번만 띄웁니다."""
+
+    def __init__(self, playwright):
+        self.playwright = playwright
+        self.browser: Browser = None
+        self.lock = asyncio.Lock()
+        self.used = 0
+
+    async def scrape(self, company_no: str):
+        async with self.lock:
+            if self.browser is None:
+                self.browser = await self.playwright.chromium.launch(headless=True)
+        self.used += 1
+        context = await self.browser.new_context(user_agent=USER_AGENT)
+        page = await context.new_page()
+        try:
+            return await scrape_company_data(page, company_no)
+        finally:
+            await context.close()
+
+    async def close(self):
+        if self.browser is not None:
+            await self.browser.close()
+
+async def fetch_company(client, fallback: PlaywrightFallback, company_no: str):
+    """HTTP로 먼저 수집하고, 요청/파싱이 예외로 실패하면 Playwright로 다시 시도합니다. (None은 '필수 정보 없음'이므로 재시도하지 않음)"""
+    if client is not None:
+        try:
+            return await scrape_company_data_http(client, company_no)
+        except Exception:
+            pass
+    return await fallback.scrape(company_no)
+
+async def worker(semaphore: asyncio.Semaphore, client, fallback: PlaywrightFallback, company_no: str, queue: asyncio.Queue):
     """
     세마포어로 제어되는 작업자 함수.
-    독립적인 브라우저 컨텍스트에서 단일 기업 정보를 처리합니다.
+    공유 HTTP 클라이언트(실패 시 Playwright)로 단일 기업 정보를 처리하고, 저장할 레코드를 큐에 넣습니다.
     """
     async with semaphore:
-        context = await browser.new_context(
-            user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        )
-        page = await context.new_page()
         try:
-            # with-as 구문으로 DB 연결을 작업 단위로 관리
-            with duckdb.connect(DB_FILE) as conn:
-                data = await scrape_company_data(page, company_no)
-                if data:
-                    save_data_to_db(conn, company_no, **data)
-                    return "저장 완료"
-                else:
-                    return "필수 정보 없음"
+            data = await fetch_company(client, fallback, company_no)
+            if data:
+                await queue.put(build_records(company_no, **data))
+                return "수집 완료"
+            else:
+                return "필수 정보 없음"
         except TimeoutError:
             return "타임아웃"
         except Exception as e:
             error_message = str(e).replace('\n', ' ')
             return f"오류: {error_message[:70]}"
-        finally:
-            await context.close()
+
+async def db_writer(queue: asyncio.Queue, conn, write_stats: Counter):
+    """
+    큐에 쌓인 기업 레코드를 WRITE_BATCH_SIZE개(또는 WRITE_FLUSH_SECONDS초)씩 모아 한 트랜잭션으로 저장하는 단일 작성자.
+    None을 받으면 남은 배치를 저장하고 종료합니다.
+    """
+    loop = asyncio.get_running_loop()
+    done = False
+    while not done:
+        record = await queue.get()
+        if record is None:
+            break
+        batch = [record]
+        deadline = loop.time() + WRITE_FLUSH_SECONDS
+        while len(batch) < WRITE_BATCH_SIZE:
+            try:
+                record = await asyncio.wait_for(queue.get(), timeout=max(0.0, deadline - loop.time()))
+            except asyncio.TimeoutError:
+                break
+            if record is None:
+                done = True
+                break
+            batch.append(record)
+
+        try:
+            # 저장은 스레드에서 실행해 스크래핑 이벤트 루프를 막지 않습니다. (연결은 이 작성자만 사용)
+            await asyncio.to_thread(save_records_batch, conn, batch)
+            write_stats["저장 완료"] += len(batch)
+        except Exception as e:
+            # 배치 하나의 문제 레코드 때문에 전체를 잃지 않도록 기업별로 다시 저장합니다.
+            print(f"\n일괄 저장 실패 ({len(batch)}건), 기업별로 재시도합니다: {str(e)[:70]}")
+            for record in batch:
+                try:
+                    await asyncio.to_thread(save_records_batch, conn, [record])
+                    write_stats["저장 완료"] += 1
+                except Exception:
+                    write_stats["저장 실패"] += 1
 
 async def main():
     """메인 실행 함수"""
     start_time = time.time()
-    print(f"--- IPO 데이터 대량 수집 시작 (동시 작업 수: {CONCURRENCY_LIMIT}) ---")
+    use_http = FETCH_MODE == "http" and HTTP_FETCH_AVAILABLE
+    print(f"--- IPO 데이터 대량 수집 시작 (동시 작업 수: {CONCURRENCY_LIMIT}, 수집 방식: {'HTTP' if use_http else 'Playwright'}) ---")
     
+    # DB 연결은 작성자 하나만 사용합니다.
     with duckdb.connect(DB_FILE) as conn:
         create_tables(conn)
         try:
@@ -70,28 +145,43 @@ async def main():
             existing_nos = set()
             print("신규 DB. 처음부터 수집을 시작합니다.")
 
-    # 처리해야 할 기업 번호 목록 준비
-    numbers_to_process = [str(i) for i in range(START_NO, END_NO + 1) if str(i) not in existing_nos]
-    
-    if not numbers_to_process:
-        print("새롭게 처리할 기업이 없습니다. 작업을 종료합니다.")
-        return
+        # 처리해야 할 기업 번호 목록 준비
+        numbers_to_process = [str(i) for i in range(START_NO, END_NO + 1) if str(i) not in existing_nos]
+        
+        if not numbers_to_process:
+            print("새롭게 처리할 기업이 없습니다. 작업을 종료합니다.")
+            return
 
-    print(f"총 {len(numbers_to_process)}개의 신규 기업 정보를 수집합니다.")
+        print(f"총 {len(numbers_to_process)}개의 신규 기업 정보를 수집합니다.")
 
-    semaphore = asyncio.Semaphore(CONCURRENCY_LIMIT)
-    
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=True)
+        semaphore = asyncio.Semaphore(CONCURRENCY_LIMIT)
+        # 저장이 밀리면 작업자가 기다리도록 큐 크기를 제한합니다.
+        queue = asyncio.Queue(maxsize=WRITE_BATCH_SIZE * 4)
+        write_stats = Counter()
+        writer_task = asyncio.create_task(db_writer(queue, conn, write_stats))
         
-        tasks = [worker(semaphore, browser, num) for num in numbers_to_process]
-        
-        results = []
-        # tqdm을 사용하여 실시간 진행률 표시
-        for f in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="수집 진행률"):
-            results.append(await f)
-            
-        await browser.close()
+        async with async_playwright() as p:
+            fallback = PlaywrightFallback(p)
+            client = create_http_client(max_connections=CONCURRENCY_LIMIT) if use_http else None
+            try:
+                tasks = [worker(semaphore, client, fallback, num, queue) for num in numbers_to_process]
+                
+                results = []
+                # tqdm을 사용하여 실시간 진행률 표시
+                for f in tqdm.tqdm(asyncio.as_completed(tasks), total=len(tasks), desc="수집 진행률"):
+                    results.append(await f)
+            finally:
+                if client is not None:
+                    await client.aclose()
+                await fallback.close()
+
+        # 남은 레코드를 모두 저장할 때까지 기다립니다.
+        await queue.put(None)
+        await writer_task
+
+        # 유사 기업 분석이 조회하는 기업별 가치평가 지표 테이블을 갱신합니다.
+        if write_stats['저장 완료']:
+            print(f"가치평가 지표 테이블 갱신: {refresh_valuation_multiples(conn)}개 기업")
 
     end_time = time.time()
     
@@ -104,7 +194,11 @@ async def main():
     print(f"총 실행 시간: {time.strftime('%H시간 %M분 %S초', time.gmtime(end_time - start_time))}")
     print(f"총 시도한 신규 기업 수: {len(numbers_to_process)}개")
     print("-" * 50)
-    print(f"성공 (신규 추가): {counts['저장 완료']} 건")
+    print(f"성공 (신규 추가): {write_stats['저장 완료']} 건")
+    if write_stats['저장 실패']:
+        print(f"실패 (DB 저장 오류): {write_stats['저장 실패']} 건")
+    if use_http and fallback.used:
+        print(f"Playwright 재시도: {fallback.used} 건")
     print(f"실패 (필수 정보 없음): {counts['필수 정보 없음']} 건")
     print(f"실패 (타임아웃): {counts['타임아웃']} 건")
     # 기타 오류 상세 출력
@@ -2,6 +2,9 @@
 [Refactored]
 38커뮤니케이션즈(38.co.kr)의 IPO 기업 정보를 스크래핑하고 DuckDB에 저장합니다.
 이 모듈은 다른 스크립트에서 가져와 사용할 수 있도록 함수 단위로 분리되었습니다.
+
+기업 페이지는 서버에서 렌더링되는 정적 HTML이므로 기본적으로 HTTP로 받아 lxml로 파싱하고
+(scrape_company_data_http), Playwright 경로(scrape_company_data)는 HTTP 수집이 실패할 때의 대안으로 남겨 둡니다.
 """
 
 import asyncio
@@ -10,10 +13,23 @@ from playwright.async_api import async_playwright, Page, TimeoutError
 import pandas as pd
 import io
 import duckdb
-from datetime import datetime
+from datetime import datetime, date
+import calendar
 import re
 import json
 
+# HTTP 수집 경로 (없으면 Playwright만 사용)
+try:
+    import httpx
+    import lxml.html
+    HTTP_FETCH_AVAILABLE = True
+except ImportError:
+    HTTP_FETCH_AVAILABLE = False
+
+COMPANY_URL = "https://www.38.co.kr/html/fund/?o=v&no={company_no}&l=&page=1"
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+HTTP_TIMEOUT = 10
+
 # --- 데이터베이스 관련 함수 ---
 
 def clean_text(text):
@@ -60,9 +76,180 @@ def create_tables(conn):
         UNIQUE(company_no, item, period)
     );
     """)
+    # 재무비율/주가지표/확정공모가를 숫자(DOUBLE)와 표준 지표 코드, 기간 날짜로 정규화한 테이블 (수집 시 함께 저장)
+    metrics_exists = conn.execute(
+        "SELECT count(*) FROM information_schema.tables WHERE table_name = 'company_metrics'"
+    ).fetchone()[0] > 0
+    conn.execute("""
+    CREATE TABLE IF NOT EXISTS company_metrics (
+        company_no VARCHAR,
+        source VARCHAR,
+        category VARCHAR,
+        item VARCHAR,
+        metric VARCHAR,
+        period VARCHAR,
+        period_date DATE,
+        value DOUBLE,
+        last_updated TIMESTAMP
+    );
+    """)
+    if not metrics_exists and conn.execute("SELECT count(*) FROM companies").fetchone()[0] > 0:
+        # 지표 테이블이 없던 기존 DB는 저장된 문자열 데이터로 한 번 채웁니다.
+        print(f"기존 데이터로 company_metrics 테이블을 채웠습니다: {rebuild_metrics(conn)}행")
+    if conn.execute("SELECT count(*) FROM information_schema.tables WHERE table_name = 'valuation_multiples'").fetchone()[0] == 0:
+        refresh_valuation_multiples(conn)
 
-def save_data_to_db(conn, company_no, company_name, company_overview, offering_info, subscription_schedule, business_summary, financial_ratios_df, stock_indicators_df):
-    """추출된 모든 데이터를 DuckDB에 저장합니다."""
+# --- 지표 정규화 (문자열 값 -> 숫자, 항목명 -> 표준 코드) ---
+
+# 영문 약어로 시작하지 않는 항목의 표준 코드 (공백 제거 후 비교)
+METRIC_ALIASES = {
+    '현재가': 'PRICE',
+    '확정공모가': 'OFFERING_PRICE',
+}
+MISSING_VALUES = {'', '-', 'nan', 'NaN', 'None', 'N/A'}
+METRIC_COLUMNS = ['company_no', 'source', 'category', 'item', 'metric', 'period', 'period_date', 'value', 'last_updated']
+
+def canonical_metric(item):
+    """
+    항목명을 표준 지표 코드로 바꿉니다.
+    'PBR (주가순자산비율)', 'PER (주가수익비율)  공모가 대비'처럼 영문 약어로 시작하면 약어(PBR, PER)를,
+    그 외에는 METRIC_ALIASES의 코드 또는 정리한 항목명을 그대로 반환합니다.
+    """
+    item = clean_text(str(item)) if item is not None else ''
+    match = re.match(r'([A-Za-z]{2,6})(?![A-Za-z])', item)
+    if match:
+        return match.group(1).upper()
+    return METRIC_ALIASES.get(item.replace(' ', ''), item)
+
+def parse_metric_value(value):
+    """'1,234원', '12.5배', '-3.2%', '△1,000', '(1,000)' 같은 값을 float로 변환합니다. 숫자가 없으면 None"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return None if pd.isna(value) else float(value)
+    text = clean_text(str(value)).replace(',', '')
+    if text in MISSING_VALUES:
+        return None
+    match = re.search(r'-?\d+(?:\.\d+)?', text)
+    if not match:
+        return None
+    number = float(match.group())
+    if text.startswith('△') or (text.startswith('(') and text.endswith(')')):
+        number = -abs(number)
+    return number
+
+def parse_period_date(period):
+    """'2023.12', '2023/06', '2023년 12월', '2023.12(E)' 같은 기간 헤더를 기간 마지막 날로 변환합니다. (연도만 있으면 12월 31일)"""
+    if period is None:
+        return None
+    match = re.search(r'((?:19|20)\d{2})(?:\s*[./\-년]\s*(\d{1,2})(?!\d))?', str(period))
+    if not match:
+        return None
+    year, month = int(match.group(1)), int(match.group(2) or 12)
+    if not 1 <= month <= 12:
+        month = 12
+    return date(year, month, calendar.monthrange(year, month)[1])
+
+def _offering_price(payload):
+    try:
+        return json.loads(payload).get('확정공모가') if payload else None
+    except (TypeError, json.JSONDecodeError):
+        return None
+
+def build_metrics(financial_ratios=None, stock_indicators=None, companies=None, now=None):
+    """
+    문자열로 저장되는 재무비율/주가지표 행(company_no, [category,] item, period, value)과
+    기업 행(company_no, data_payload)의 확정공모가를 company_metrics 행으로 변환합니다. 숫자가 없는 행은 버립니다.
+    """
+    now = now or datetime.now()
+    frames = []
+    if financial_ratios is not None and not financial_ratios.empty:
+        df = financial_ratios[['company_no', 'category', 'item', 'period', 'value']].copy()
+        df['source'] = 'financial_ratios'
+        frames.append(df)
+    if stock_indicators is not None and not stock_indicators.empty:
+        df = stock_indicators[['company_no', 'item', 'period', 'value']].copy()
+        df['category'] = None
+        df['source'] = 'stock_indicators'
+        frames.append(df)
+    if companies is not None and not companies.empty:
+        frames.append(pd.DataFrame({
+            'company_no': companies['company_no'].values,
+            'category': None,
+            'item': '확정공모가',
+            'period': None,
+            'value': companies['data_payload'].map(_offering_price).values,
+            'source': 'companies',
+        }))
+    if not frames:
+        return pd.DataFrame(columns=METRIC_COLUMNS)
+
+    df = pd.concat(frames, ignore_index=True)
+    df['value'] = df['value'].map(parse_metric_value).astype('float64')
+    df = df.dropna(subset=['value']).reset_index(drop=True)
+    df['metric'] = df['item'].map(canonical_metric)
+    df['period'] = df['period'].map(lambda p: None if p is None else str(p))
+    df['period_date'] = df['period'].map(parse_period_date)
+    df['last_updated'] = now
+    return df[METRIC_COLUMNS]
+
+def rebuild_metrics(conn):
+    """저장된 재무비율/주가지표/기업 데이터로 company_metrics 테이블 전체를 다시 만듭니다. 만든 행 수를 반환합니다."""
+    metrics_df = build_metrics(
+        conn.execute("SELECT company_no, category, item, period, value FROM financial_ratios").fetchdf(),
+        conn.execute("SELECT company_no, item, period, value FROM stock_indicators").fetchdf(),
+        conn.execute("SELECT company_no, CAST(data_payload AS VARCHAR) AS data_payload FROM companies").fetchdf(),
+    )
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.register("metrics_rebuild", metrics_df)
+        conn.execute("DELETE FROM company_metrics")
+        conn.execute(f"INSERT INTO company_metrics ({', '.join(METRIC_COLUMNS)}) SELECT {', '.join(METRIC_COLUMNS)} FROM metrics_rebuild")
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        conn.unregister("metrics_rebuild")
+    return len(metrics_df)
+
+def refresh_valuation_multiples(conn):
+    """
+    기업별 가치평가 지표(valuation_multiples) 테이블을 company_metrics에서 다시 만듭니다. 만든 행 수를 반환합니다.
+    지표마다 가장 최근 기간 값을 사용하며, 수집(저장)이 끝난 뒤 한 번 호출해 유사 기업 분석이 바로 조회하도록 합니다.
+    - psr: 수집한 PSR 지표(주가지표 표에는 현재가 행이 없으므로), 없으면 현재가 / SPS
+    - offering_psr: 확정공모가 / SPS
+    """
+    conn.execute("""
+    CREATE OR REPLACE TABLE valuation_multiples AS
+    WITH latest AS (
+        SELECT company_no, metric, arg_max(value, coalesce(period_date, DATE '1900-01-01')) AS value
+        FROM company_metrics
+        WHERE (source = 'stock_indicators' AND metric IN ('PBR', 'PER', 'PSR', 'SPS', 'PRICE')) OR metric = 'OFFERING_PRICE'
+        GROUP BY company_no, metric
+    ), pivoted AS (
+        SELECT c.company_no, c.company_name,
+               max(l.value) FILTER (WHERE l.metric = 'PBR') AS pbr,
+               max(l.value) FILTER (WHERE l.metric = 'PER') AS per,
+               max(l.value) FILTER (WHERE l.metric = 'PSR') AS scraped_psr,
+               max(l.value) FILTER (WHERE l.metric = 'SPS') AS sps,
+               max(l.value) FILTER (WHERE l.metric = 'PRICE') AS price,
+               max(l.value) FILTER (WHERE l.metric = 'OFFERING_PRICE') AS offering_price
+        FROM companies c JOIN latest l ON l.company_no = c.company_no
+        GROUP BY c.company_no, c.company_name
+    )
+    SELECT company_no, company_name, pbr, per, sps, price, offering_price,
+           coalesce(scraped_psr, CASE WHEN sps > 0 THEN price / sps END) AS psr,
+           CASE WHEN sps > 0 THEN offering_price / sps END AS offering_psr,
+           now()::TIMESTAMP AS refreshed_at
+    FROM pivoted
+    """)
+    return conn.execute("SELECT count(*) FROM valuation_multiples").fetchone()[0]
+
+COMPANY_COLUMNS = ['company_no', 'company_name', 'business_summary', 'data_payload', 'last_updated']
+
+def build_records(company_no, company_name, company_overview, offering_info, subscription_schedule, business_summary, financial_ratios_df, stock_indicators_df):
+    """스크래핑 결과를 DB에 넣을 형태(기업 행 + 길게 변환한 재무비율/주가지표 DataFrame)로 만듭니다."""
     now = datetime.now()
     
     # payload에는 모든 텍스트 데이터를 포함시키고, business_summary는 별도 컬럼에도 저장
@@ -75,53 +262,173 @@ def save_data_to_db(conn, company_no, company_name, company_overview, offering_i
     cleaned_payload = {clean_text(k): clean_text(v) for k, v in payload.items()}
     json_payload = json.dumps(cleaned_payload, ensure_ascii=False)
 
-    conn.execute(
-        """
-        INSERT INTO companies (company_no, company_name, business_summary, data_payload, last_updated)
-        VALUES (?, ?, ?, ?, ?)
-        ON CONFLICT (company_no) DO UPDATE SET
-            company_name = EXCLUDED.company_name,
-            business_summary = EXCLUDED.business_summary,
-            data_payload = EXCLUDED.data_payload,
-            last_updated = EXCLUDED.last_updated;
-        """,
-        (company_no, clean_text(company_name), clean_text(business_summary), json_payload, now)
-    )
+    records = {
+        "company": (company_no, clean_text(company_name), clean_text(business_summary), json_payload, now),
+        "financial_ratios": None,
+        "stock_indicators": None,
+        "metrics": None,
+    }
 
     if financial_ratios_df is not None and not financial_ratios_df.empty:
-        conn.execute("DELETE FROM financial_ratios WHERE company_no = ?", (company_no,))
         df_melted = financial_ratios_df.melt(id_vars=['구분', '항목'], var_name='period', value_name='value')
         df_melted.rename(columns={'구분': 'category', '항목': 'item'}, inplace=True)
         df_melted['company_no'] = company_no
         df_melted['last_updated'] = now
         df_melted['value'] = df_melted['value'].astype(str)
-        conn.execute("INSERT INTO financial_ratios (company_no, category, item, period, value, last_updated) SELECT company_no, category, item, period, value, last_updated FROM df_melted")
+        records["financial_ratios"] = df_melted[['company_no', 'category', 'item', 'period', 'value', 'last_updated']]
 
     if stock_indicators_df is not None and not stock_indicators_df.empty:
-        conn.execute("DELETE FROM stock_indicators WHERE company_no = ?", (company_no,))
         df_melted = stock_indicators_df.melt(id_vars=['항목'], var_name='period', value_name='value')
         df_melted.rename(columns={'항목': 'item'}, inplace=True)
         df_melted['company_no'] = company_no
         df_melted['last_updated'] = now
         df_melted['value'] = df_melted['value'].astype(str)
-        conn.execute("INSERT INTO stock_indicators (company_no, item, period, value, last_updated) SELECT company_no, item, period, value, last_updated FROM df_melted")
+        records["stock_indicators"] = df_melted[['company_no', 'item', 'period', 'value', 'last_updated']]
+
+    records["metrics"] = build_metrics(records["financial_ratios"], records["stock_indicators"],
+                                       pd.DataFrame([{"company_no": company_no, "data_payload": json_payload}]), now)
+    return records
+
+def save_records_batch(conn, records):
+    """
+    여러 기업의 레코드를 DataFrame으로 모아 한 트랜잭션에 일괄 저장합니다.
+    재무비율/주가지표는 배치에 포함된 기업의 기존 행을 한 번에 지우고 새 행을 한 번에 추가합니다.
+    정규화 지표(company_metrics)도 같은 트랜잭션에서 출처(source)별로 같은 방식으로 교체합니다.
+    """
+    if not records:
+        return
+    companies_df = pd.DataFrame([r["company"] for r in records], columns=COMPANY_COLUMNS)
+    companies_df = companies_df.drop_duplicates('company_no', keep='last')
+    ratio_dfs = [r["financial_ratios"] for r in records if r["financial_ratios"] is not None]
+    indicator_dfs = [r["stock_indicators"] for r in records if r["stock_indicators"] is not None]
+    metric_dfs = [r["metrics"] for r in records if r.get("metrics") is not None and not r["metrics"].empty]
+
+    registered = []
+    conn.execute("BEGIN TRANSACTION")
+    try:
+        conn.register("companies_batch", companies_df)
+        registered.append("companies_batch")
+        conn.execute(
+            """
+            INSERT INTO companies (company_no, company_name, business_summary, data_payload, last_updated)
+            SELECT company_no, company_name, business_summary, data_payload, last_updated FROM companies_batch
+            ON CONFLICT (company_no) DO UPDATE SET
+                company_name = EXCLUDED.company_name,
+                business_summary = EXCLUDED.business_summary,
+                data_payload = EXCLUDED.data_payload,
+                last_updated = EXCLUDED.last_updated;
+            """
+        )
+        conn.execute("DELETE FROM company_metrics WHERE source = 'companies' AND company_no IN (SELECT company_no FROM companies_batch)")
+
+        if ratio_dfs:
+            conn.register("financial_ratios_batch", pd.concat(ratio_dfs, ignore_index=True))
+            registered.append("financial_ratios_batch")
+            conn.execute("DELETE FROM financial_ratios WHERE company_no IN (SELECT DISTINCT company_no FROM financial_ratios_batch)")
+            conn.execute("DELETE FROM company_metrics WHERE source = 'financial_ratios' AND company_no IN (SELECT DISTINCT company_no FROM financial_ratios_batch)")
+            conn.execute("INSERT INTO financial_ratios (company_no, category, item, period, value, last_updated) SELECT company_no, category, item, period, value, last_updated FROM financial_ratios_batch")
+
+        if indicator_dfs:
+            conn.register("stock_indicators_batch", pd.concat(indicator_dfs, ignore_index=True))
+            registered.append("stock_indicators_batch")
+            conn.execute("DELETE FROM stock_indicators WHERE company_no IN (SELECT DISTINCT company_no FROM stock_indicators_batch)")
+            conn.execute("DELETE FROM company_metrics WHERE source = 'stock_indicators' AND company_no IN (SELECT DISTINCT company_no FROM stock_indicators_batch)")
+            conn.execute("INSERT INTO stock_indicators (company_no, item, period, value, last_updated) SELECT company_no, item, period, value, last_updated FROM stock_indicators_batch")
+
+        if metric_dfs:
+            conn.register("company_metrics_batch", pd.concat(metric_dfs, ignore_index=True))
+            registered.append("company_metrics_batch")
+            conn.execute(f"INSERT INTO company_metrics ({', '.join(METRIC_COLUMNS)}) SELECT {', '.join(METRIC_COLUMNS)} FROM company_metrics_batch")
+
+        conn.execute("COMMIT")
+    except Exception:
+        conn.execute("ROLLBACK")
+        raise
+    finally:
+        for name in registered:
+            conn.unregister(name)
+
+def save_data_to_db(conn, company_no, company_name, company_overview, offering_info, subscription_schedule, business_summary, financial_ratios_df, stock_indicators_df):
+    """추출된 모든 데이터를 DuckDB에 저장합니다."""
+    save_records_batch(conn, [build_records(company_no, company_name, company_overview, offering_info, subscription_schedule,
+                                            business_summary, financial_ratios_df, stock_indicators_df)])
+
+# --- 파싱 공통 함수 (Playwright/HTTP 경로 공용) ---
+
+def rows_to_key_value(rows):
+    """행별 셀 텍스트 목록을 (키, 값) 쌍이 번갈아 나오는 것으로 보고 딕셔너리로 만듭니다."""
+    data = {}
+    for cells in rows:
+        if len(cells) >= 2:
+            for i in range(0, len(cells), 2):
+                if i + 1 < len(cells):
+                    key = cells[i].strip()
+                    value = cells[i+1].strip()
+                    if key: data[key] = value
+    return data
+
+def table_html_to_df(html_content, title_pattern):
+    """데이터 테이블의 inner HTML을 DataFrame으로 읽고 재무비율/주가지표 형식에 맞게 정리합니다."""
+    df_list = pd.read_html(io.StringIO(html_content), header=0, flavor='html5lib')
+
+    if not df_list or df_list[0].empty:
+        return None
+
+    df = df_list[0]
+    df = df.dropna(how='all').reset_index(drop=True)
+    df = df.dropna(axis=1, how='all')
+
+    if "재 무 비 율" in title_pattern:
+        if isinstance(df.columns, pd.MultiIndex):
+            df.columns = ['_'.join(map(str, col)).strip() for col in df.columns.values]
+        if df.iloc[:, 0].isnull().any():
+            df.iloc[:, 0] = df.iloc[:, 0].ffill()
+        if len(df.columns) > 1:
+            df.rename(columns={df.columns[0]: '구분', df.columns[1]: '항목'}, inplace=True)
+    
+    elif "주 가 지 표" in title_pattern:
+        if len(df.columns) > 0:
+            df.rename(columns={df.columns[0]: '항목'}, inplace=True)
+    
+    return df
+
+def split_business_summary(full_text):
+    """'1.사업현황'과 '2.매출현황' 또는 '3.재무현황' 사이의 텍스트를 추출합니다."""
+    summary_text = None
+    if '1.사업현황' in full_text:
+        parts = full_text.split('1.사업현황', 1)
+        if len(parts) > 1:
+            content_after_start = parts[1]
+            if '2.매출현황' in content_after_start:
+                summary_text = content_after_start.split('2.매출현황')[0].strip()
+            elif '3.재무현황' in content_after_start:
+                summary_text = content_after_start.split('3.재무현황')[0].strip()
+            else:
+                summary_text = content_after_start.strip()
+    return summary_text
+
+def assemble_company_data(company_overview, offering_info, subscription_schedule, business_summary, financial_ratios_df, stock_indicators_df):
+    """추출 결과를 save_data_to_db/build_records 인자 형태로 모읍니다. 종목명이 없으면 None"""
+    if not company_overview or not company_overview.get('종목명'):
+        return None # 필수 데이터 없으면 None 반환
+
+    company_name = company_overview.pop('종목명')
+    return {
+        "company_name": company_name, "company_overview": company_overview,
+        "offering_info": offering_info, "subscription_schedule": subscription_schedule,
+        "business_summary": business_summary, "financial_ratios_df": financial_ratios_df,
+        "stock_indicators_df": stock_indicators_df
+    }
 
 # --- 스크래핑 함수 ---
 
 async def extract_key_value_table(page: Page, summary_title):
     try:
         table_element = await page.wait_for_selector(f"//table[@summary='{summary_title}']", timeout=3000)
-        data = {}
-        rows = await table_element.query_selector_all("tr")
-        for row in rows:
-            cells = await row.query_selector_all("th, td")
-            if len(cells) >= 2:
-                for i in range(0, len(cells), 2):
-                    if i + 1 < len(cells):
-                        key = (await cells[i].inner_text()).strip()
-                        value = (await cells[i+1].inner_text()).strip()
-                        if key: data[key] = value
-        return data
+        rows = []
+        for row in await table_element.query_selector_all("tr"):
+            rows.append([await cell.inner_text() for cell in await row.query_selector_all("th, td")])
+        return rows_to_key_value(rows)
     except TimeoutError: return None
     except Exception: return None
 
@@ -144,28 +451,7 @@ async def find_and_extract_df_table(page_or_element, title_pattern):
             return None
         
         html_content = await data_table.inner_html()
-        df_list = pd.read_html(io.StringIO(html_content), header=0, flavor='html5lib')
-
-        if not df_list or df_list[0].empty:
-            return None
-
-        df = df_list[0]
-        df = df.dropna(how='all').reset_index(drop=True)
-        df = df.dropna(axis=1, how='all')
-
-        if "재 무 비 율" in title_pattern:
-            if isinstance(df.columns, pd.MultiIndex):
-                df.columns = ['_'.join(map(str, col)).strip() for col in df.columns.values]
-            if df.iloc[:, 0].isnull().any():
-                df.iloc[:, 0] = df.iloc[:, 0].ffill()
-            if len(df.columns) > 1:
-                df.rename(columns={df.columns[0]: '구분', df.columns[1]: '항목'}, inplace=True)
-        
-        elif "주 가 지 표" in title_pattern:
-            if len(df.columns) > 0:
-                df.rename(columns={df.columns[0]: '항목'}, inplace=True)
-        
-        return df
+        return table_html_to_df(html_content, title_pattern)
 
     except Exception:
         return None
@@ -181,21 +467,7 @@ async def extract_business_summary(page: Page):
             return None
 
         full_text = await container_td.inner_text()
-        
-        # '1.사업현황'과 '2.매출현황' 또는 '3.재무현황' 사이의 텍스트를 추출합니다.
-        summary_text = None
-        if '1.사업현황' in full_text:
-            parts = full_text.split('1.사업현황', 1)
-            if len(parts) > 1:
-                content_after_start = parts[1]
-                if '2.매출현황' in content_after_start:
-                    summary_text = content_after_start.split('2.매출현황')[0].strip()
-                elif '3.재무현황' in content_after_start:
-                    summary_text = content_after_start.split('3.재무현황')[0].strip()
-                else:
-                    summary_text = content_after_start.strip()
-        
-        return summary_text
+        return split_business_summary(full_text)
 
     except Exception:
         return None
@@ -203,14 +475,16 @@ async def extract_business_summary(page: Page):
 
 async def scrape_company_data(page: Page, company_no: str):
     """주어진 Playwright 페이지 객체를 사용하여 특정 기업의 모든 데이터를 스크래핑합니다."""
-    url = f"https://www.38.co.kr/html/fund/?o=v&no={company_no}&l=&page=1"
+    url = COMPANY_URL.format(company_no=company_no)
     await page.goto(url, wait_until="domcontentloaded", timeout=10000)
-    
+    return await extract_company_data(page)
+
+async def extract_company_data(page: Page):
+    """이미 기업 페이지가 열린 Playwright 페이지에서 데이터를 추출합니다. 종목명이 없으면 None"""
     company_overview = await extract_key_value_table(page, "기업개요")
     if not company_overview or not company_overview.get('종목명'):
         return None # 필수 데이터 없으면 None 반환
 
-    company_name = company_overview.pop('종목명')
     offering_info = await extract_key_value_table(page, "공모정보")
     subscription_schedule = await extract_key_value_table(page, "공모청약일정")
     business_summary = await extract_business_summary(page)
@@ -223,17 +497,211 @@ async def scrape_company_data(page: Page, company_no: str):
     except TimeoutError:
         pass # 재무 정보는 선택 사항
 
-    return {
-        "company_name": company_name, "company_overview": company_overview,
-        "offering_info": offering_info, "subscription_schedule": subscription_schedule,
-        "business_summary": business_summary, "financial_ratios_df": financial_ratios_df,
-        "stock_indicators_df": stock_indicators_df
-    }
+    return assemble_company_data(company_overview, offering_info, subscription_schedule, business_summary,
+                                 financial_ratios_df, stock_indicators_df)
+
+# --- HTTP 수집 함수 (정적 HTML + lxml) ---
+
+# inner_text()에서 줄바꿈/탭 경계가 되는 요소 (text_content()는 이 경계를 버려 앞뒤 텍스트가 붙어 버립니다.)
+BLOCK_TAGS = {'p', 'div', 'table', 'thead', 'tbody', 'tfoot', 'tr', 'ul', 'ol', 'li', 'dl', 'dt', 'dd',
+              'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'center', 'blockquote', 'pre', 'form', 'hr'}
+CELL_TAGS = {'td', 'th'}
+SKIP_TAGS = {'script', 'style', 'noscript', 'head', 'title'}
+
+def _collapse_spaces(text):
+    """HTML 공백 문자(스페이스, 탭, 줄바꿈)만 하나의 스페이스로 줄입니다. (&nbsp;는 유지)"""
+    return re.sub(r'[ \t\n\r\f]+', ' ', text)
+
+def _inner_text(element):
+    """
+    Playwright inner_text()와 같은 규칙으로 요소 텍스트를 만듭니다.
+    <br>과 블록 요소 경계는 줄바꿈, 표 셀 경계는 탭으로 두고, 그 외의 연속 공백은 하나로 줄입니다.
+    (브라우저처럼 &nbsp;는 줄이지 않고 남겨 두며, 저장 시 clean_text가 공백으로 바꿉니다.)
+    """
+    chunks = []
+
+    def walk(el):
+        tag = el.tag if isinstance(el.tag, str) else None  # 주석 등은 tag가 문자열이 아님
+        if tag is not None and tag not in SKIP_TAGS:
+            if tag == 'br' or tag in BLOCK_TAGS:
+                chunks.append('\n')
+            if el.text:
+                chunks.append(_collapse_spaces(el.text))
+            for child in el:
+                walk(child)
+            if tag in BLOCK_TAGS:
+                chunks.append('\n')
+            elif tag in CELL_TAGS:
+                chunks.append('\t')
+        if el.tail:
+            chunks.append(_collapse_spaces(el.tail))
+
+    if element.text:
+        chunks.append(_collapse_spaces(element.text))
+    for child in element:
+        walk(child)
+
+    text = re.sub(r' {2,}', ' ', ''.join(chunks))
+    text = re.sub(r' *([\n\t]) *', r'\1', text)   # 줄/셀 경계 옆 공백 제거
+    text = re.sub(r'\t+\n', '\n', text)            # 행 끝 셀 구분자 제거
+    text = re.sub(r'\n+', '\n', text)
+    text = re.sub(r'\t+', '\t', text)
+    return text.strip()
+
+def _inner_html(element):
+    """요소 자신의 태그를 제외한 내부 HTML (Playwright inner_html()과 같은 범위)"""
+    return (element.text or '') + ''.join(lxml.html.tostring(child, encoding='unicode') for child in element)
+
+def parse_key_value_table(root, summary_title):
+    tables = root.xpath(f"//table[@summary='{summary_title}']")
+    if not tables:
+        return None
+    rows = [[_inner_text(cell) for cell in row.xpath(".//th | .//td")] for row in tables[0].xpath(".//tr")]
+    return rows_to_key_value(rows)
+
+def parse_df_table(container, title_pattern):
+    """find_and_extract_df_table과 같은 XPath로 제목 테이블 다음 형제 테이블을 DataFrame으로 읽습니다."""
+    try:
+        # 요소 기준 검색이므로 Playwright처럼 '//'를 './/'로 바꿔 요소 안에서만 찾습니다.
+        title_table_selector = f".//table[.//b[contains(text(), '{title_pattern}')] or .//font[contains(text(), '{title_pattern}')]]"
+        data_tables = container.xpath(f"{title_table_selector}/following-sibling::table[1]")
+        if not data_tables:
+            return None
+        return table_html_to_df(_inner_html(data_tables[0]), title_pattern)
+    except Exception:
+        return None
+
+def parse_business_summary(root):
+    containers = root.xpath("//td[.//font[contains(text(), '1.사업현황')]]")
+    if not containers:
+        return None
+    return split_business_summary(_inner_text(containers[0]))
+
+def parse_company_html(html):
+    """기업 페이지 HTML에서 scrape_company_data와 같은 형태의 데이터를 추출합니다. 종목명이 없으면 None"""
+    root = lxml.html.fromstring(html)
+    company_overview = parse_key_value_table(root, "기업개요")
+    if not company_overview or not company_overview.get('종목명'):
+        return None # 필수 데이터 없으면 None 반환
+
+    offering_info = parse_key_value_table(root, "공모정보")
+    subscription_schedule = parse_key_value_table(root, "공모청약일정")
+    business_summary = parse_business_summary(root)
+
+    financial_ratios_df, stock_indicators_df = None, None
+    containers = root.xpath("//td[.//img[@alt='본질가치분석']]")
+    if containers: # 재무 정보는 선택 사항
+        financial_ratios_df = parse_df_table(containers[0], "재 무 비 율")
+        stock_indicators_df = parse_df_table(containers[0], "주 가 지 표")
+
+    return assemble_company_data(company_overview, offering_info, subscription_schedule, business_summary,
+                                 financial_ratios_df, stock_indicators_df)
+
+def create_http_client(max_connections=10):
+    """연결을 재사용하는 비동기 HTTP 클라이언트를 만듭니다. (여러 작업자가 공유)"""
+    return httpx.AsyncClient(
+        headers={"User-Agent": USER_AGENT},
+        timeout=HTTP_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+    )
+
+def decode_html(content, encoding=None):
+    """
+    38.co.kr은 EUC-KR(CP949) 페이지입니다. 인코딩이 없거나 EUC-KR이면 상위 집합인 CP949로 디코딩합니다.
+    encoding이 없을 때는 브라우저에서 저장한 파일(UTF-8)일 수 있으므로 UTF-8을 먼저 시도합니다.
+    """
+    if not encoding:
+        try:
+            return content.decode('utf-8')
+        except UnicodeDecodeError:
+            encoding = 'cp949'
+    if encoding.lower().replace('-', '').replace('_', '') in ('euckr', 'ksc56011987', 'cp949'):
+        encoding = 'cp949'
+    return content.decode(encoding, errors='replace')
+
+async def scrape_company_data_http(client, company_no):
+    """
+    HTTP로 기업 페이지를 받아 파싱합니다. 반환 형식은 scrape_company_data와 같습니다.
+    요청/디코딩 실패는 예외로 올려 호출 측이 Playwright 경로로 다시 시도할 수 있게 합니다.
+    """
+    response = await client.get(COMPANY_URL.format(company_no=company_no))
+    response.raise_for_status()
+    html = decode_html(response.content, response.charset_encoding)
+    # lxml 파싱과 pandas.read_html은 CPU 작업이므로 이벤트 루프를 막지 않도록 스레드에서 실행합니다.
+    return await asyncio.to_thread(parse_company_html, html)
+
+async def compare_fetch_paths(html_path, company_no="0"):
+    """
+    저장한 기업 페이지 HTML을 HTTP 경로(lxml)와 Playwright 경로(inner_text/inner_html)로 각각 파싱해
+    DB에 저장될 값(build_records 결과)이 같은지 비교합니다. 모두 같으면 True
+    """
+    with open(html_path, 'rb') as f:
+        html = decode_html(f.read())
+    http_data = parse_company_html(html)
+
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=True)
+        try:
+            page = await browser.new_page()
+            await page.set_content(html, wait_until="domcontentloaded")
+            playwright_data = await extract_company_data(page)
+        finally:
+            await browser.close()
+
+    if http_data is None or playwright_data is None:
+        same = http_data is None and playwright_data is None
+        print(f"{'✅' if same else '❌'} 종목명 추출: HTTP={http_data is not None}, Playwright={playwright_data is not None}")
+        return same
+
+    http_records = build_records(company_no, **http_data)
+    playwright_records = build_records(company_no, **playwright_data)
+    same = True
+    for i, column in enumerate(COMPANY_COLUMNS[:-1]):  # last_updated 제외
+        http_value, playwright_value = http_records["company"][i], playwright_records["company"][i]
+        if column == 'data_payload':
+            http_value, playwright_value = json.loads(http_value), json.loads(playwright_value)
+        matched = http_value == playwright_value
+        same &= matched
+        print(f"{'✅' if matched else '❌'} {column}")
+        if not matched and column == 'data_payload':
+            for key in sorted(set(http_value) | set(playwright_value)):
+                if http_value.get(key) != playwright_value.get(key):
+                    print(f"    {key}: HTTP={http_value.get(key)!r} / Playwright={playwright_value.get(key)!r}")
+        elif not matched:
+            print(f"    HTTP={http_value!r}\n    Playwright={playwright_value!r}")
+    for key in ("financial_ratios", "stock_indicators", "metrics"):
+        http_df, playwright_df = http_records[key], playwright_records[key]
+        if http_df is None or playwright_df is None:
+            matched = http_df is None and playwright_df is None
+        else:
+            matched = http_df.drop(columns='last_updated').reset_index(drop=True).equals(
+                playwright_df.drop(columns='last_updated').reset_index(drop=True))
+        same &= matched
+        print(f"{'✅' if matched else '❌'} {key}")
+    print("두 경로의 저장 결과가 같습니다." if same else "두 경로의 저장 결과가 다릅니다.")
+    return same
 
 # --- 단일 실행을 위한 Main 함수 ---
-async def main(company_no, db_file="ipo_db/ipo_data.db"):
+async def main(company_no, db_file="ipo_db/ipo_data.db", use_http=True):
     with duckdb.connect(db_file) as conn:
         create_tables(conn)
+        if use_http and HTTP_FETCH_AVAILABLE:
+            # 수집만 try로 감쌉니다. (DB 저장 오류로 Playwright 재수집이 일어나지 않도록)
+            try:
+                async with create_http_client(max_connections=1) as client:
+                    print(f"--- 단일 기업 정보 추출 시작 (No: {company_no}, HTTP) ---")
+                    data = await scrape_company_data_http(client, company_no)
+            except Exception as e:
+                print(f"HTTP 수집 실패, Playwright로 다시 시도합니다: {e}")
+            else:
+                if data:
+                    save_data_to_db(conn, company_no, **data)
+                    refresh_valuation_multiples(conn)
+                    print(f"--- (No: {company_no}) 정보 저장 완료 ---")
+                else:
+                    print(f"--- (No: {company_no}) 필수 정보가 없어 저장하지 않음 ---")
+                return
         async with async_playwright() as p:
             browser = await p.chromium.launch(headless=True)
             page = await browser.new_page()
@@ -242,6 +710,7 @@ async def main(company_no, db_file="ipo_db/ipo_data.db"):
                 data = await scrape_company_data(page, company_no)
                 if data:
                     save_data_to_db(conn, company_no, **data)
+                    refresh_valuation_multiples(conn)
                     print(f"--- (No: {company_no}) 정보 저장 완료 ---")
                 else:
                     print(f"--- (No: {company_no}) 필수 정보가 없어 저장하지 않음 ---")
@@ -252,6 +721,20 @@ async def main(company_no, db_file="ipo_db/ipo_data.db"):
 
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="38커뮤니케이션즈에서 IPO 기업 정보를 추출하여 DB에 저장합니다.")
-    parser.add_argument("--no", required=True, help="38커뮤니케이션즈의 기업 고유 번호")
+    parser.add_argument("--no", help="38커뮤니케이션즈의 기업 고유 번호")
+    parser.add_argument("--playwright", action="store_true", help="HTTP 수집 없이 Playwright(Chromium)로만 수집합니다.")
+    parser.add_argument("--rebuild-metrics", action="store_true", help="저장된 데이터로 정규화 지표(company_metrics)와 가치평가 지표(valuation_multiples) 테이블을 다시 만듭니다.")
+    parser.add_argument("--compare-html", metavar="HTML_FILE",
+                        help="저장한 기업 페이지(예: page_content_2189.html)를 HTTP/Playwright 두 경로로 파싱해 결과를 비교합니다.")
     args = parser.parse_args()
-    asyncio.run(main(args.no))
+    if args.compare_html:
+        exit(0 if asyncio.run(compare_fetch_paths(args.compare_html)) else 1)
+    elif args.rebuild_metrics:
+        with duckdb.connect("ipo_db/ipo_data.db") as conn:
+            create_tables(conn)
+            print(f"company_metrics 테이블을 다시 만들었습니다: {rebuild_metrics(conn)}행")
+            print(f"valuation_multiples 테이블을 다시 만들었습니다: {refresh_valuation_multiples(conn)}개 기업")
+    elif args.no:
+        asyncio.run(main(args.no, use_http=not args.playwright))
+    else:
+        parser.error("--no, --rebuild-metrics, --compare-html 중 하나를 지정해주세요.")
@@ -5,14 +5,21 @@ IR 자료 PDF 파싱 및 요약 시스템
 - PyMuPDF를 사용한 텍스트 추출
 - 섹션별 분류 및 구조화
 - 표/차트 데이터 처리
-- 로컬 LLM(ChatOllama)을 사용한 자동 요약
+- 로컬 LLM(llm_gateway 경유 ChatOllama)을 사용한 자동 요약
 """
 
 import fitz  # PyMuPDF
 import pandas as pd
 import json
 import re
-from typing import Dict, List, Tuple, Any
+import os
+import time
+import asyncio
+import hashlib
+import inspect
+from glob import glob
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Dict, List, Tuple, Any, Iterator, Optional
 from pathlib import Path
 import logging
 from datetime import datetime
@@ -20,29 +27,260 @@ import argparse
 
 # 로컬 LLM 연동
 try:
-    from langchain_ollama import ChatOllama
+    from llm_gateway import get_llm
     OLLAMA_AVAILABLE = True
 except ImportError:
     OLLAMA_AVAILABLE = False
     print("⚠️ langchain_ollama가 설치되지 않았습니다. pip install langchain-ollama로 설치하세요.")
 
-# LLM 설정
+# LLM 설정 (서버 주소와 동시성은 llm_gateway에서 관리)
 MODEL_ID = "qwen3:32b"
-BASE_URL = "http://192.168.120.102:11434"
+
+# 페이지 추출 설정
+PAGE_CACHE_DIR = ".cache/pdf_pages"     # PDF 해시별 페이지 추출 결과 캐시
+EXTRACT_WORKERS = min(4, os.cpu_count() or 1)
+PARALLEL_MIN_PAGES = 16                 # 이보다 페이지가 적으면 프로세스 풀 없이 추출
+PAGES_PER_TASK = 8                      # 프로세스 작업 하나가 처리할 페이지 수
+TABLE_CACHE_DIR = ".cache/pdf_tables"   # PDF 해시별 페이지 표 추출 결과 캐시
+
+# 청크 추출 설정
+CHUNK_CACHE_DIR = ".cache/pdf_chunks"   # 청크 텍스트 해시별 LLM 추출 결과 캐시
+CHUNK_WORKERS = 4                       # 동시에 LLM 추출할 청크 수 (서버별 동시성은 llm_gateway가 제한)
+
+# 스마트 청크 타입별 키워드 (split_pdf_into_smart_chunks)
+CHUNK_KEYWORDS = {
+    # 조직/팀 관련 키워드
+    'organization': ['팀', '조직', '경영진', '멤버', '구성원', 'CEO', 'CTO', 'COO', '대표', '이사', '소장',
+                     '연구원', '개발자', '마케터', 'MD', '학력', '경력', '대학교', '석사', '박사', '전문학사'],
+    # 재무 관련 키워드
+    'finance': ['매출', '투자', '자금', '조달', '억', '원', '수익', '이익', '손실', '재무', '계획',
+                '기업가치', '투자유치', '라운드', 'Pre-A', 'Series'],
+    # 기술 관련 키워드
+    'technology': ['특허', '기술', 'R&D', '연구', '개발', '혁신', 'AI', '소프트웨어', '하드웨어',
+                   '알고리즘', '모델', '시스템', '플랫폼'],
+}
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+
+def file_sha256(path: str) -> str:
+    """파일 내용 해시 (페이지 캐시 키)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _extract_pages(pdf_path: str, page_indexes: List[int]) -> List[Dict[str, Any]]:
+    """페이지 묶음의 텍스트를 추출합니다. (프로세스 풀 작업자에서 실행)"""
+    results = []
+    with fitz.open(pdf_path) as doc:
+        for page_num in page_indexes:
+            page = doc[page_num]
+            raw_text = page.get_text()
+            results.append({
+                'page_number': page_num + 1,
+                'raw_text': raw_text,
+                'image_count': len(page.get_images()),
+                'word_count': len(raw_text.split())
+            })
+    return results
+
+
+class PDFPage(dict):
+    """
+    페이지 추출 결과. 'structured_text'(page.get_text("dict"))는 메모리를 많이 차지하므로
+    처음 접근할 때 PDF에서 해당 페이지만 읽어 만듭니다.
+    """
+
+    def __init__(self, data: Dict[str, Any], pdf_path: str):
+        super().__init__(data)
+        self.pdf_path = pdf_path
+
+    def __missing__(self, key):
+        if key != 'structured_text':
+            raise KeyError(key)
+        with fitz.open(self.pdf_path) as doc:
+            value = doc[self['page_number'] - 1].get_text("dict")
+        self[key] = value
+        return value
+
+
+def _page_cache_path(pdf_hash: str, page_number: int) -> Path:
+    return Path(PAGE_CACHE_DIR) / pdf_hash / f"page_{page_number:04d}.json"
+
+
+def _load_cached_page(pdf_hash: str, page_number: int) -> Optional[Dict[str, Any]]:
+    try:
+        with open(_page_cache_path(pdf_hash, page_number), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def _save_cached_page(pdf_hash: str, page_data: Dict[str, Any]):
+    path = _page_cache_path(pdf_hash, page_data['page_number'])
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(dict(page_data), f, ensure_ascii=False)
+
+
+def iter_pdf_pages(pdf_path: str, workers: int = EXTRACT_WORKERS, use_cache: bool = True) -> Iterator[PDFPage]:
+    """
+    PDF 페이지를 순서대로 하나씩 내보내는 스트리밍 추출기.
+    - 캐시(PDF 내용 해시 기준)에 있는 페이지는 다시 추출하지 않음
+    - 나머지 페이지는 페이지 묶음 단위로 프로세스 풀에서 병렬 추출
+    - structured_text는 PDFPage에서 필요할 때만 추출
+    """
+    with fitz.open(pdf_path) as doc:
+        page_count = doc.page_count
+    pdf_hash = file_sha256(pdf_path) if use_cache else None
+
+    cached = {}
+    if use_cache:
+        for page_num in range(page_count):
+            page_data = _load_cached_page(pdf_hash, page_num + 1)
+            if page_data is not None:
+                cached[page_num] = page_data
+    missing = [page_num for page_num in range(page_count) if page_num not in cached]
+    if cached:
+        logger.info(f"페이지 캐시 적중: {len(cached)}/{page_count} 페이지")
+
+    batches = [missing[i:i + PAGES_PER_TASK] for i in range(0, len(missing), PAGES_PER_TASK)]
+    executor = None
+    if workers > 1 and len(missing) >= PARALLEL_MIN_PAGES:
+        executor = ProcessPoolExecutor(max_workers=min(workers, len(batches)))
+        futures = [executor.submit(_extract_pages, pdf_path, batch) for batch in batches]
+        pending = (future.result() for future in futures)
+    else:
+        pending = (_extract_pages(pdf_path, batch) for batch in batches)
+
+    try:
+        extracted: Dict[int, Dict[str, Any]] = {}
+        for page_num in range(page_count):
+            # 아직 추출되지 않은 페이지면 다음 묶음 결과를 기다립니다. (묶음은 페이지 순서대로 제출됨)
+            while page_num not in cached and page_num not in extracted:
+                for page_data in next(pending):
+                    extracted[page_data['page_number'] - 1] = page_data
+                    if use_cache:
+                        _save_cached_page(pdf_hash, page_data)
+            page_data = cached.pop(page_num, None) or extracted.pop(page_num)
+            yield PDFPage(page_data, pdf_path)
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+def _extract_page_tables(pdf_path: str, page_number: int) -> List[Dict[str, Any]]:
+    """한 페이지의 표를 camelot으로 추출합니다. (프로세스 풀 작업자에서 실행, JSON으로 저장 가능한 형태로 반환)"""
+    import camelot
+    results = []
+    for table in camelot.read_pdf(pdf_path, pages=str(page_number), flavor='lattice'):
+        results.append({
+            'page': table.page,
+            'rows': table.df.values.tolist(),
+            'accuracy': table.accuracy if hasattr(table, 'accuracy') else 0.0
+        })
+    return results
+
+
+def _table_cache_path(pdf_hash: str, page_number: int) -> Path:
+    return Path(TABLE_CACHE_DIR) / pdf_hash / f"page_{page_number:04d}.json"
+
+
+def load_page_tables(pdf_path: str, page_numbers: List[int], workers: int = EXTRACT_WORKERS,
+                     use_cache: bool = True) -> Dict[int, List[Dict[str, Any]]]:
+    """
+    지정한 페이지들의 표를 페이지별로 추출합니다.
+    (PDF 해시, 페이지)별로 캐시하고, 캐시에 없는 페이지는 프로세스 풀에서 병렬 추출합니다.
+    추출에 실패한 페이지는 결과에서 빠지고 캐시하지 않습니다.
+    """
+    pdf_hash = file_sha256(pdf_path) if use_cache else None
+    page_tables: Dict[int, List[Dict[str, Any]]] = {}
+    missing = []
+    for page_number in page_numbers:
+        try:
+            with open(_table_cache_path(pdf_hash, page_number), 'r', encoding='utf-8') as f:
+                page_tables[page_number] = json.load(f)
+        except (TypeError, OSError, json.JSONDecodeError):
+            missing.append(page_number)
+    if page_tables:
+        logger.info(f"표 캐시 적중: {len(page_tables)}/{len(page_numbers)} 페이지")
+
+    def store(page_number: int, tables: List[Dict[str, Any]]):
+        page_tables[page_number] = tables
+        if use_cache:
+            path = _table_cache_path(pdf_hash, page_number)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(tables, f, ensure_ascii=False)
+
+    if workers > 1 and len(missing) > 1:
+        with ProcessPoolExecutor(max_workers=min(workers, len(missing))) as executor:
+            futures = {page_number: executor.submit(_extract_page_tables, pdf_path, page_number) for page_number in missing}
+            for page_number, future in futures.items():
+                try:
+                    store(page_number, future.result())
+                except Exception as e:
+                    logger.warning(f"페이지 {page_number} 표 추출 중 오류: {str(e)}")
+    else:
+        for page_number in missing:
+            try:
+                store(page_number, _extract_page_tables(pdf_path, page_number))
+            except Exception as e:
+                logger.warning(f"페이지 {page_number} 표 추출 중 오류: {str(e)}")
+    return page_tables
+
+
+class KeywordClassifier:
+    """
+    그룹별 키워드 목록을 하나의 정규식으로 합쳐 페이지 텍스트를 한 번만 스캔하는 분류기.
+    ignore_case=True면 대소문자를 무시하고, False면 키워드를 적힌 그대로 찾습니다.
+    키워드가 서로 겹쳐도('대표'/'대표이사', '원'/'연구원') 기존 `keyword in text` 검사와
+    같은 결과가 나오도록, 각 위치에서 가장 긴 키워드를 찾고 그 키워드의 접두사인
+    키워드도 함께 매칭된 것으로 처리합니다.
+    """
+    
+    def __init__(self, groups: Dict[str, List[str]], ignore_case: bool = True):
+        self.groups = {group: list(keywords) for group, keywords in groups.items()}
+        self.normalize = str.lower if ignore_case else (lambda keyword: keyword)
+        # 정규화한 키워드 -> [(그룹, 원래 키워드), ...] (같은 키워드가 여러 그룹에 있을 수 있음)
+        self.owners: Dict[str, List[Tuple[str, str]]] = {}
+        for group, keywords in self.groups.items():
+            for keyword in keywords:
+                self.owners.setdefault(self.normalize(keyword), []).append((group, keyword))
+        keys = sorted(self.owners, key=len, reverse=True)
+        self.prefixes = {key: [other for other in keys if key.startswith(other)] for key in keys}
+        # 전방 탐색으로 겹치는 위치의 매칭도 모두 찾고, 긴 키워드를 먼저 시도합니다.
+        self.pattern = re.compile("(?=(" + "|".join(map(re.escape, keys)) + "))",
+                                  re.IGNORECASE if ignore_case else 0)
+    
+    def scan(self, text: str) -> Dict[str, Dict[str, List[int]]]:
+        """그룹별로 {매칭된 키워드: [시작 위치, ...]}를 반환합니다."""
+        hits: Dict[str, Dict[str, List[int]]] = {group: {} for group in self.groups}
+        for match in self.pattern.finditer(text):
+            for key in self.prefixes.get(self.normalize(match.group(1)), ()):
+                for group, keyword in self.owners[key]:
+                    hits[group].setdefault(keyword, []).append(match.start())
+        return hits
+    
+    def scores(self, text: str) -> Dict[str, int]:
+        """그룹별로 매칭된 서로 다른 키워드 수"""
+        return {group: len(found) for group, found in self.scan(text).items()}
+
+
 class IRPDFParser:
     """IR 자료 PDF 파싱 및 분석 클래스"""
     
-    def __init__(self, use_llm: bool = True):
+    def __init__(self, use_llm: bool = True, extract_workers: int = EXTRACT_WORKERS):
         self.use_llm = use_llm and OLLAMA_AVAILABLE
+        self.extract_workers = extract_workers  # 페이지/표 추출 프로세스 수 (배치 작업자 안에서는 1)
         
         if self.use_llm:
             try:
-                self.llm = ChatOllama(model=MODEL_ID, base_url=BASE_URL, temperature=0)
+                self.llm = get_llm(model=MODEL_ID, temperature=0)
                 logger.info(f"로컬 LLM 초기화 완료: {MODEL_ID}")
             except Exception as e:
                 logger.warning(f"LLM 초기화 실패: {str(e)}. 프롬프트만 생성합니다.")
@@ -83,40 +321,21 @@ class IRPDFParser:
                 '투자계획', '자금계획', '증자', '펀딩'
             ]
         }
+        # 섹션 분류는 기존처럼 소문자로 바꾼 페이지 텍스트에서 키워드를 적힌 그대로 찾습니다.
+        self.section_classifier = KeywordClassifier(self.section_keywords, ignore_case=False)
+        self.chunk_classifier = KeywordClassifier(CHUNK_KEYWORDS)
     
     def extract_text_from_pdf(self, pdf_path: str) -> Dict[str, Any]:
         """PDF에서 페이지별 텍스트 추출"""
         logger.info(f"PDF 파일 처리 시작: {pdf_path}")
         
         try:
-            doc = fitz.open(pdf_path)
             pages_data = []
             
-            for page_num in range(doc.page_count):
-                page = doc[page_num]
-                
-                # 기본 텍스트 추출
-                raw_text = page.get_text()
-                
-                # 구조화된 텍스트 정보 추출
-                text_dict = page.get_text("dict")
-                
-                # 이미지 정보
-                images = page.get_images()
-                
-                # 페이지 정보 저장
-                page_data = {
-                    'page_number': page_num + 1,
-                    'raw_text': raw_text,
-                    'structured_text': text_dict,
-                    'image_count': len(images),
-                    'word_count': len(raw_text.split())
-                }
-                
+            # 페이지별 텍스트 추출 (병렬, 캐시 사용, structured_text는 지연 추출)
+            for page_data in iter_pdf_pages(pdf_path, workers=self.extract_workers):
                 pages_data.append(page_data)
-                logger.info(f"페이지 {page_num + 1} 처리 완료 - 단어 수: {len(raw_text.split())}")
-            
-            doc.close()
+                logger.info(f"페이지 {page_data['page_number']} 처리 완료 - 단어 수: {page_data['word_count']}")
             
             return {
                 'total_pages': len(pages_data),
@@ -136,15 +355,15 @@ class IRPDFParser:
         classified_sections['uncategorized'] = []
         
         for page_data in pages_data:
-            page_text = page_data['raw_text'].lower()
+            page_hits = self.section_classifier.scan(page_data['raw_text'].lower())
             page_classified = False
             
             # 각 섹션별 키워드 매칭
             for section, keywords in self.section_keywords.items():
-                keyword_matches = sum(1 for keyword in keywords if keyword in page_text)
+                keyword_matches = len(page_hits[section])
                 
                 # 키워드가 2개 이상 매칭되거나, 강한 키워드가 있으면 해당 섹션으로 분류
-                if keyword_matches >= 2 or any(strong_keyword in page_text for strong_keyword in keywords[:3]):
+                if keyword_matches >= 2 or any(strong_keyword in page_hits[section] for strong_keyword in keywords[:3]):
                     classified_sections[section].append({
                         'page_number': page_data['page_number'],
                         'content': page_data['raw_text'],
@@ -171,26 +390,34 @@ class IRPDFParser:
         
         return classified_sections
     
-    def extract_financial_tables(self, pdf_path: str) -> List[pd.DataFrame]:
-        """재무제표 및 표 데이터 추출"""
+    def extract_financial_tables(self, pdf_path: str, pages: Optional[List[int]] = None) -> List[pd.DataFrame]:
+        """
+        재무제표 및 표 데이터 추출
+        pages(1부터 시작하는 페이지 번호)를 주면 해당 페이지만, 없으면 전체 페이지를 대상으로 합니다.
+        """
         logger.info("표 데이터 추출 시작")
         
         tables = []
         
         try:
-            # camelot을 사용한 표 추출
+            # camelot을 사용한 표 추출 (페이지별 병렬 추출, 캐시 사용)
             import camelot
-            camelot_tables = camelot.read_pdf(pdf_path, pages='all', flavor='lattice')
+            if pages is None:
+                with fitz.open(pdf_path) as doc:
+                    pages = list(range(1, doc.page_count + 1))
+            page_tables = load_page_tables(pdf_path, sorted(set(pages)), workers=self.extract_workers)
             
+            camelot_tables = [table for page_number in sorted(page_tables) for table in page_tables[page_number]]
             for i, table in enumerate(camelot_tables):
-                if len(table.df.columns) > 1 and len(table.df) > 1:  # 유효한 표만
+                df = pd.DataFrame(table['rows'])
+                if len(df.columns) > 1 and len(df) > 1:  # 유효한 표만
                     tables.append({
                         'table_id': i + 1,
-                        'page': table.page,
-                        'dataframe': table.df,
-                        'accuracy': table.accuracy if hasattr(table, 'accuracy') else 0.0
+                        'page': table['page'],
+                        'dataframe': df,
+                        'accuracy': table['accuracy']
                     })
-                    logger.info(f"표 {i+1} 추출 완료 (페이지 {table.page}): {table.df.shape}")
+                    logger.info(f"표 {i+1} 추출 완료 (페이지 {table['page']}): {df.shape}")
             
         except ImportError:
             logger.warning("camelot 라이브러리가 없어 표 추출을 건너뜁니다")
@@ -241,29 +468,17 @@ class IRPDFParser:
         """PDF를 의미 기반 스마트 청크로 분할"""
         logger.info("PDF 스마트 청크 분할 시작")
         
-        # 조직/팀 관련 키워드 정의
-        org_keywords = ['팀', '조직', '경영진', '멤버', '구성원', 'CEO', 'CTO', 'COO', '대표', '이사', '소장', 
-                       '연구원', '개발자', '마케터', 'MD', '학력', '경력', '대학교', '석사', '박사', '전문학사']
-        
-        # 재무 관련 키워드 정의  
-        finance_keywords = ['매출', '투자', '자금', '조달', '억', '원', '수익', '이익', '손실', '재무', '계획', 
-                           '기업가치', '투자유치', '라운드', 'Pre-A', 'Series']
-        
-        # 기술 관련 키워드 정의
-        tech_keywords = ['특허', '기술', 'R&D', '연구', '개발', '혁신', 'AI', '소프트웨어', '하드웨어', 
-                        '알고리즘', '모델', '시스템', '플랫폼']
-        
         chunks = []
         current_chunk = {"type": "general", "pages": [], "text": "", "keywords_found": set()}
         
         for page in pdf_data['pages']:
             page_text = page['raw_text']
-            page_lower = page_text.lower()
+            page_hits = self.chunk_classifier.scan(page_text)
             
             # 페이지 타입 식별
-            org_score = sum(1 for keyword in org_keywords if keyword.lower() in page_lower)
-            finance_score = sum(1 for keyword in finance_keywords if keyword.lower() in page_lower)
-            tech_score = sum(1 for keyword in tech_keywords if keyword.lower() in page_lower)
+            org_score = len(page_hits['organization'])
+            finance_score = len(page_hits['finance'])
+            tech_score = len(page_hits['technology'])
             
             # 가장 높은 점수의 타입 결정
             page_type = "general"
@@ -294,12 +509,8 @@ class IRPDFParser:
                 current_chunk["text"] += f"\n=== 페이지 {page['page_number']} ===\n{page_text}"
             
             # 키워드 추가
-            if org_score > 0:
-                current_chunk["keywords_found"].update([kw for kw in org_keywords if kw.lower() in page_lower])
-            if finance_score > 0:
-                current_chunk["keywords_found"].update([kw for kw in finance_keywords if kw.lower() in page_lower])
-            if tech_score > 0:
-                current_chunk["keywords_found"].update([kw for kw in tech_keywords if kw.lower() in page_lower])
+            for found in page_hits.values():
+                current_chunk["keywords_found"].update(found)
         
         # 마지막 청크 추가
         if current_chunk["text"]:
@@ -874,18 +1085,33 @@ PDF 전체 내용:
     def process_ir_pdf_smart_chunks(self, pdf_path: str, output_dir: str = "raw_data_parsing") -> Dict[str, Any]:
         """스마트 청크 기반 2단계 IR PDF 처리 파이프라인"""
         logger.info(f"스마트 청크 방식으로 IR PDF 처리 시작: {pdf_path}")
-        
-        # 출력 디렉토리 생성
-        Path(output_dir).mkdir(parents=True, exist_ok=True)
-        
+        return self.analyze_smart_chunks(self.prepare_smart_chunks(pdf_path), output_dir)
+    
+    def prepare_smart_chunks(self, pdf_path: str) -> Dict[str, Any]:
+        """스마트 청크 처리의 CPU 단계: 텍스트 추출, 청크 분할, 표 추출 (LLM 호출 없음)"""
         # 1. 텍스트 추출
         pdf_data = self.extract_text_from_pdf(pdf_path)
         
         # 2. 스마트 청크 분할
         chunks = self.split_pdf_into_smart_chunks(pdf_data)
         
-        # 3. 표 추출 (전체 PDF 대상)
-        tables = self.extract_financial_tables(pdf_path)
+        # 3. 표 추출 (재무 청크 페이지만 대상)
+        finance_pages = [page for chunk in chunks if chunk['type'] == 'finance' for page in chunk['pages']]
+        if finance_pages:
+            tables = self.extract_financial_tables(pdf_path, pages=finance_pages)
+        else:
+            logger.info("재무 청크가 없어 표 추출을 건너뜁니다")
+            tables = []
+        
+        return {'pdf_path': pdf_path, 'pdf_data': pdf_data, 'chunks': chunks, 'tables': tables}
+    
+    def analyze_smart_chunks(self, prepared: Dict[str, Any], output_dir: str = "raw_data_parsing") -> Dict[str, Any]:
+        """스마트 청크 처리의 LLM 단계: 청크별 정보 추출, 통합 요약, 결과 저장"""
+        pdf_path, pdf_data = prepared['pdf_path'], prepared['pdf_data']
+        chunks, tables = prepared['chunks'], prepared['tables']
+        
+        # 출력 디렉토리 생성
+        Path(output_dir).mkdir(parents=True, exist_ok=True)
         
         # 4. 청크별 정보 추출
         extracted_info = {
@@ -895,46 +1121,17 @@ PDF 전체 내용:
             'general': []
         }
         
-        for chunk in chunks:
-            chunk_type = chunk['type']
-            chunk_text = chunk['text']
-            
-            if chunk_type == 'organization':
-                logger.info(f"조직 정보 청크 처리 중 (페이지 {chunk['pages']})")
-                org_info = self.extract_organization_info(chunk_text)
-                extracted_info['organization'].append({
-                    'pages': chunk['pages'],
-                    'content': org_info,
-                    'keywords_found': list(chunk['keywords_found'])
-                })
-            
-            elif chunk_type == 'finance':
-                logger.info(f"재무 정보 청크 처리 중 (페이지 {chunk['pages']})")
-                finance_info = self.extract_finance_info(chunk_text)
-                extracted_info['finance'].append({
-                    'pages': chunk['pages'],
-                    'content': finance_info,
-                    'keywords_found': list(chunk['keywords_found'])
-                })
-            
-            elif chunk_type == 'technology':
-                logger.info(f"기술 정보 청크 처리 중 (페이지 {chunk['pages']})")
-                tech_info = self.extract_technology_info(chunk_text)
-                extracted_info['technology'].append({
-                    'pages': chunk['pages'],
-                    'content': tech_info,
-                    'keywords_found': list(chunk['keywords_found'])
-                })
-            
-            else:  # general
-                # 일반 청크는 기존 통합 템플릿 방식으로 처리
-                logger.info(f"일반 정보 청크 처리 중 (페이지 {chunk['pages']})")
-                general_info = self.extract_general_info(chunk_text)
-                extracted_info['general'].append({
-                    'pages': chunk['pages'],
-                    'content': general_info,
-                    'keywords_found': list(chunk['keywords_found'])
-                })
+        # 청크는 merge 전까지 서로 독립적이므로 동시에 처리하고, 결과는 청크 순서대로 합칩니다.
+        with ThreadPoolExecutor(max_workers=CHUNK_WORKERS) as executor:
+            contents = list(executor.map(self.extract_chunk_info, chunks))
+        
+        for chunk, content in zip(chunks, contents):
+            chunk_type = chunk['type'] if chunk['type'] in extracted_info else 'general'
+            extracted_info[chunk_type].append({
+                'pages': chunk['pages'],
+                'content': content,
+                'keywords_found': list(chunk['keywords_found'])
+            })
         
         # 5. 통합 요약 생성
         final_summary = self.merge_extracted_info(extracted_info)
@@ -969,6 +1166,40 @@ PDF 전체 내용:
         
         return results
 
+    def extract_chunk_info(self, chunk: Dict[str, Any]) -> str:
+        """
+        청크 타입에 맞는 추출기로 정보를 추출합니다.
+        결과는 (청크 타입, 청크 텍스트, 모델, 추출 프롬프트)의 해시로 캐시하므로
+        수정된 자료를 다시 파싱하면 내용이 바뀐 청크만 LLM을 다시 호출합니다.
+        """
+        extractors = {
+            'organization': ('조직', self.extract_organization_info),
+            'finance': ('재무', self.extract_finance_info),
+            'technology': ('기술', self.extract_technology_info),
+        }
+        label, extractor = extractors.get(chunk['type'], ('일반', self.extract_general_info))
+        logger.info(f"{label} 정보 청크 처리 중 (페이지 {chunk['pages']})")
+        
+        if not self.use_llm:
+            return extractor(chunk['text'])
+        
+        # 프롬프트(추출기 소스)가 바뀌면 캐시 키도 바뀝니다.
+        key_source = "\x00".join([chunk['type'], MODEL_ID, inspect.getsource(extractor), chunk['text']])
+        cache_path = Path(CHUNK_CACHE_DIR) / f"{hashlib.sha256(key_source.encode('utf-8')).hexdigest()}.json"
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                logger.info(f"{label} 정보 청크 캐시 적중 (페이지 {chunk['pages']})")
+                return json.load(f)['content']
+        except (OSError, json.JSONDecodeError, KeyError):
+            pass
+        
+        content = extractor(chunk['text'])
+        if '추출 실패' not in content[:30]:  # 실패 메시지는 캐시하지 않음
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(cache_path, 'w', encoding='utf-8') as f:
+                json.dump({'type': chunk['type'], 'pages': chunk['pages'], 'content': content}, f, ensure_ascii=False)
+        return content
+
     def extract_general_info(self, chunk_text: str) -> str:
         """일반 정보 추출 (기본 템플릿 방식)"""
         if not self.use_llm:
@@ -1341,10 +1572,115 @@ PDF 전체 내용:
         print("="*80)
 
 
+def collect_pdf_files(patterns: List[str]) -> List[str]:
+    """디렉토리(하위 *.pdf) 또는 glob 패턴들에서 PDF 목록을 만듭니다. (중복 제거, 순서 유지)"""
+    files = []
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            files.extend(sorted(glob(os.path.join(pattern, '*.pdf'))))
+        else:
+            files.extend(sorted(glob(pattern)))
+    return list(dict.fromkeys(files))
+
+
+def _prepare_document(pdf_path: str) -> Tuple[Dict[str, Any], float]:
+    """배치 작업자 프로세스에서 한 문서의 CPU 단계를 실행합니다. (작업자 안에서는 추가 프로세스를 만들지 않음)"""
+    start = time.perf_counter()
+    prepared = IRPDFParser(use_llm=False, extract_workers=1).prepare_smart_chunks(pdf_path)
+    # 분석 단계는 raw_text만 쓰므로 지연 추출용 PDFPage 대신 일반 dict로 넘깁니다.
+    prepared['pdf_data']['pages'] = [dict(page) for page in prepared['pdf_data']['pages']]
+    return prepared, time.perf_counter() - start
+
+
+async def _run_batch_async(pdf_files: List[str], parser_instance: "IRPDFParser", output_dir: str,
+                           extract_workers: int, analysis_workers: int) -> Dict[str, Dict[str, Any]]:
+    """
+    추출(CPU)은 프로세스 풀에서, 청크 분석(LLM)은 큐를 소비하는 비동기 작업자에서 실행합니다.
+    먼저 추출이 끝난 문서부터 분석하므로 LLM 응답을 기다리는 동안에도 다음 문서 추출이 계속됩니다.
+    """
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+    reports = {pdf_path: {'pdf_path': pdf_path, 'status': 'pending'} for pdf_path in pdf_files}
+
+    async def extract(executor: ProcessPoolExecutor, pdf_path: str):
+        try:
+            prepared, seconds = await loop.run_in_executor(executor, _prepare_document, pdf_path)
+            reports[pdf_path]['extract_seconds'] = round(seconds, 3)
+            await queue.put((pdf_path, prepared))
+        except Exception as e:
+            reports[pdf_path].update(status='failed', stage='extract', error=str(e))
+            logger.error(f"추출 실패: {pdf_path}: {str(e)}")
+
+    async def analyze():
+        while True:
+            pdf_path, prepared = await queue.get()
+            start = time.perf_counter()
+            try:
+                results = await asyncio.to_thread(parser_instance.analyze_smart_chunks, prepared, output_dir)
+                pdf_name = Path(pdf_path).stem
+                reports[pdf_path].update(
+                    status='success',
+                    chunks=results['statistics']['chunks_processed'],
+                    tables=results['statistics']['tables_extracted'],
+                    outputs=[str(Path(output_dir) / f"{pdf_name}_smart_chunk_analysis.json"),
+                             str(Path(output_dir) / f"{pdf_name}_smart_chunk_summary.md")]
+                )
+            except Exception as e:
+                reports[pdf_path].update(status='failed', stage='analyze', error=str(e))
+                logger.error(f"분석 실패: {pdf_path}: {str(e)}")
+            finally:
+                report = reports[pdf_path]
+                report['analyze_seconds'] = round(time.perf_counter() - start, 3)
+                report['seconds'] = round(report.get('extract_seconds', 0) + report['analyze_seconds'], 3)
+                done = sum(1 for r in reports.values() if r['status'] != 'pending')
+                print(f"{'✅' if report['status'] == 'success' else '🚨'} [{done}/{len(pdf_files)}] {Path(pdf_path).name}: "
+                      f"추출 {report.get('extract_seconds', 0):.1f}s, 분석 {report['analyze_seconds']:.1f}s")
+                queue.task_done()
+
+    analyzers = [asyncio.create_task(analyze()) for _ in range(analysis_workers)]
+    with ProcessPoolExecutor(max_workers=extract_workers) as executor:
+        await asyncio.gather(*(extract(executor, pdf_path) for pdf_path in pdf_files))
+    await queue.join()
+    for task in analyzers:
+        task.cancel()
+    return reports
+
+
+def run_batch(pdf_files: List[str], output_dir: str = "raw_data_parsing", use_llm: bool = True,
+              extract_workers: int = EXTRACT_WORKERS, analysis_workers: int = 2) -> bool:
+    """여러 IR PDF를 스마트 청크 방식으로 처리하고 파일별 소요 시간을 담은 배치 보고서를 저장합니다."""
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    extract_workers = max(1, min(extract_workers, len(pdf_files)))
+    analysis_workers = max(1, min(analysis_workers, len(pdf_files)))
+    print(f"🚀 IR PDF 배치 처리: {len(pdf_files)}개 파일, 추출 프로세스 {extract_workers}개, 분석 작업자 {analysis_workers}개")
+
+    parser_instance = IRPDFParser(use_llm=use_llm)
+    batch_start = time.perf_counter()
+    reports = asyncio.run(_run_batch_async(pdf_files, parser_instance, output_dir, extract_workers, analysis_workers))
+
+    files = [reports[pdf_path] for pdf_path in pdf_files]
+    succeeded = sum(1 for r in files if r['status'] == 'success')
+    report = {
+        'finished_at': datetime.now().isoformat(timespec="seconds"),
+        'total_seconds': round(time.perf_counter() - batch_start, 3),
+        'extract_workers': extract_workers,
+        'analysis_workers': analysis_workers,
+        'succeeded': succeeded,
+        'failed': len(files) - succeeded,
+        'files': files,
+    }
+    report_path = Path(output_dir) / f"batch_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(report_path, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    print(f"\n📋 {succeeded}/{len(files)}개 성공 ({report['total_seconds']:.1f}s). 배치 보고서: {report_path}")
+    return succeeded == len(files)
+
+
 def main():
     """메인 실행 함수"""
     parser = argparse.ArgumentParser(description="IR PDF 파서 및 요약기")
-    parser.add_argument("pdf_path", type=str, help="분석할 IR PDF 파일의 경로")
+    parser.add_argument("pdf_path", type=str, nargs="?", help="분석할 IR PDF 파일의 경로")
     parser.add_argument(
         "--method", 
         type=str, 
@@ -1357,8 +1693,23 @@ def main():
         action="store_true",
         help="LLM 사용을 비활성화합니다."
     )
+    parser.add_argument("--batch", nargs="+", metavar="DIR_OR_GLOB",
+                        help="배치 모드: PDF 디렉토리 또는 glob 패턴 (스마트 청크 방식으로 처리)")
+    parser.add_argument("--workers", type=int, default=EXTRACT_WORKERS, help="배치 모드: 추출 프로세스 수")
+    parser.add_argument("--analysis-workers", type=int, default=2, help="배치 모드: 동시에 LLM 분석할 문서 수")
+    parser.add_argument("--output-dir", type=str, default="raw_data_parsing", help="배치 모드: 결과 저장 디렉토리")
     args = parser.parse_args()
 
+    if args.batch:
+        pdf_files = collect_pdf_files(args.batch)
+        if not pdf_files:
+            parser.error(f"PDF 파일을 찾을 수 없습니다: {args.batch}")
+        run_batch(pdf_files, output_dir=args.output_dir, use_llm=not args.no_llm,
+                  extract_workers=args.workers, analysis_workers=args.analysis_workers)
+        return
+    if not args.pdf_path:
+        parser.error("pdf_path 또는 --batch가 필요합니다.")
+
     print(f"IR PDF 파서 시작: {args.pdf_path}")
     print(f"분석 방법: {args.method}, LLM 사용: {not args.no_llm}")
 
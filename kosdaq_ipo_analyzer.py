@@ -6,7 +6,7 @@ from glob import glob
 from typing import Dict, Any, List
 import requests
 from bs4 import BeautifulSoup
-import time
+from rate_limiter import get_limiter, host_of, limited_call
 from langchain_ollama import ChatOllama
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
@@ -386,8 +386,12 @@ def crawl_news_articles(news_list: List[Dict[str, Any]], max_articles_to_crawl:
                     'Upgrade-Insecure-Requests': '1'
                 }
                 
-                response = requests.get(url, headers=headers, timeout=15)
-                response.raise_for_status()
+                # 고정 대기 대신 뉴스 사이트(호스트)별 공유 토큰 버킷으로 요청 속도를 제한합니다.
+                def fetch_article():
+                    response = requests.get(url, headers=headers, timeout=15)
+                    response.raise_for_status()  # 429면 백오프 후 재시도
+                    return response
+                response = limited_call(get_limiter(host_of(url)), fetch_article)
                 response.encoding = response.apparent_encoding  # 인코딩 자동 감지
                 
                 print(f"    ✅ HTTP 응답 성공 (상태 코드: {response.status_code})")
@@ -406,7 +410,6 @@ def crawl_news_articles(news_list: List[Dict[str, Any]], max_articles_to_crawl:
                 print("    " + "-" * 50)
 
                 crawled_count += 1
-                time.sleep(2)  # 서버 부하 방지를 위해 대기 시간 증가
                 
             except requests.exceptions.RequestException as e:
                 print(f"    ❌ HTTP 요청 실패: {e}")
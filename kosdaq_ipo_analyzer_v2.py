@@ -14,7 +14,7 @@ import re
 from glob import glob
 from typing import Dict, Any, List, Optional, Tuple
 import argparse
-from langchain_ollama import ChatOllama
+from llm_gateway import get_llm
 from langchain_core.prompts import PromptTemplate
 from langchain_core.output_parsers import StrOutputParser
 
@@ -515,11 +515,7 @@ def get_grade_from_score(score: float) -> str:
 def setup_llm():
     """LLM을 초기화합니다."""
     print("🤖 LLM을 로드합니다...")
-    return ChatOllama(
-        model="qwen3:32b",
-        base_url="http://192.168.110.102:11434",
-        temperature=0
-    )
+    return get_llm(temperature=0, base_url="http://192.168.110.102:11434")
 
 def create_analysis_prompt():
     """LLM 분석을 위한 프롬프트를 생성합니다."""
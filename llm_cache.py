@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+LLM 응답 디스크 캐시 (SQLite)
+
+모델 ID, 온도 등 호출 파라미터와 렌더링된 프롬프트의 해시를 키로 LLM 응답을 저장합니다.
+입력이 바뀌지 않은 재실행, 재시도, 파이프라인 일부만 디버깅하는 경우 LLM 호출 없이 즉시 응답합니다.
+- 전체 용량 상한을 넘으면 가장 오래 사용하지 않은 항목부터 삭제 (LRU)
+- 웹 검색 결과가 포함되는 프롬프트는 TTL을 두어 일정 시간 후 만료
+- 적중/미스 카운터 제공
+
+llm_gateway.get_llm()이 기본으로 이 캐시를 사용합니다. 환경 변수로 설정합니다.
+    QVP_LLM_CACHE            0이면 캐시 비활성화 (기본 1)
+    QVP_LLM_CACHE_PATH       SQLite 파일 경로
+    QVP_LLM_CACHE_MAX_MB     캐시 최대 용량(MB)
+    QVP_LLM_WEB_CACHE_TTL    웹 검색 기반 프롬프트의 TTL(초)
+
+사용법:
+    python llm_cache.py stats    # 캐시 통계 출력
+    python llm_cache.py purge    # 만료 항목 삭제
+    python llm_cache.py clear    # 전체 삭제
+"""
+
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+import argparse
+import warnings
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+warnings.filterwarnings("ignore", message="The function `loads` is in beta")
+
+# --- 설정 ---
+CACHE_ENABLED = os.environ.get("QVP_LLM_CACHE", "1") not in ("0", "false", "False", "")
+CACHE_PATH = os.environ.get("QVP_LLM_CACHE_PATH", ".cache/llm_responses.sqlite")
+CACHE_MAX_BYTES = int(float(os.environ.get("QVP_LLM_CACHE_MAX_MB", "1024")) * 1024 * 1024)
+WEB_CACHE_TTL = float(os.environ.get("QVP_LLM_WEB_CACHE_TTL", str(24 * 3600)))
+
+
+def make_cache_key(prompt: str, llm_string: str) -> str:
+    """호출 파라미터(모델, 온도 등)와 프롬프트로 캐시 키를 만듭니다."""
+    return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+
+class _SQLiteStore:
+    """여러 캐시 뷰가 공유하는 SQLite 저장소와 카운터"""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "evictions": 0}
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS llm_cache (
+                    key TEXT PRIMARY KEY,
+                    llm_string TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    expires_at REAL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_llm_cache_last_access ON llm_cache(last_access)")
+
+    def connect(self) -> sqlite3.Connection:
+        """스레드마다 별도의 커넥션을 사용합니다."""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self.local.conn = conn
+        return conn
+
+    def count(self, name: str, n: int = 1):
+        with self.lock:
+            self.counters[name] += n
+
+
+class SQLiteResponseCache(BaseCache):
+    """
+    LangChain BaseCache 구현. ttl이 주어지면 이 뷰로 저장한 항목은 ttl초 후 만료됩니다.
+    refresh=True인 뷰는 조회하지 않고 새 응답으로 덮어쓰기만 합니다.
+    """
+
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = CACHE_MAX_BYTES,
+                 ttl: Optional[float] = None, refresh: bool = False,
+                 _store: Optional[_SQLiteStore] = None):
+        self.ttl = ttl
+        self.refresh = refresh
+        self._store = _store or _SQLiteStore(path, max_bytes)
+
+    def with_ttl(self, ttl: Optional[float]) -> "SQLiteResponseCache":
+        """같은 저장소/카운터를 공유하면서 TTL만 다른 캐시 뷰를 반환합니다."""
+        return SQLiteResponseCache(ttl=ttl, refresh=self.refresh, _store=self._store)
+
+    def refreshing(self) -> "SQLiteResponseCache":
+        """
+        캐시된 응답을 무시하고 새로 생성한 응답으로 덮어쓰는 뷰를 반환합니다.
+        캐시된 응답이 파싱에 실패해 같은 프롬프트로 재시도할 때 사용합니다.
+        """
+        return SQLiteResponseCache(ttl=self.ttl, refresh=True, _store=self._store)
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        if self.refresh:
+            return None
+        key = make_cache_key(prompt, llm_string)
+        now = time.time()
+        conn = self._store.connect()
+        row = conn.execute("SELECT value, expires_at FROM llm_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            self._store.count("misses")
+            return None
+
+        value, expires_at = row
+        if expires_at is not None and expires_at < now:
+            with conn:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._store.count("expired")
+            self._store.count("misses")
+            return None
+
+        try:
+            generations = loads(value)
+        except Exception:
+            # 직렬화 형식이 바뀐 오래된 항목은 버립니다.
+            with conn:
+                conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            self._store.count("misses")
+            return None
+
+        with conn:
+            conn.execute("UPDATE llm_cache SET last_access = ? WHERE key = ?", (now, key))
+        self._store.count("hits")
+        return generations
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = make_cache_key(prompt, llm_string)
+        value = dumps(return_val)
+        now = time.time()
+        expires_at = now + self.ttl if self.ttl else None
+        conn = self._store.connect()
+        with self._store.lock, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, llm_string, value, size, created_at, last_access, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, llm_string, value, len(value), now, now, expires_at),
+            )
+            self._evict(conn)
+            self._store.counters["writes"] += 1
+
+    def _evict(self, conn: sqlite3.Connection):
+        """용량 상한을 넘으면 만료 항목, 그다음 오래 사용하지 않은 항목 순으로 삭제합니다."""
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self._store.max_bytes:
+            return
+        conn.execute("DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        evicted = []
+        for key, size in conn.execute("SELECT key, size FROM llm_cache ORDER BY last_access ASC"):
+            if total <= self._store.max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM llm_cache WHERE key = ?", evicted)
+        self._store.counters["evictions"] += len(evicted)
+
+    def purge_expired(self) -> int:
+        """만료된 항목을 삭제하고 삭제 개수를 반환합니다."""
+        conn = self._store.connect()
+        with self._store.lock, conn:
+            cursor = conn.execute("DELETE FROM llm_cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+        return cursor.rowcount
+
+    def clear(self, **kwargs: Any) -> None:
+        conn = self._store.connect()
+        with self._store.lock, conn:
+            conn.execute("DELETE FROM llm_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        """현재 프로세스의 적중/미스 카운터와 저장소 크기를 반환합니다."""
+        conn = self._store.connect()
+        entries, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+        with self._store.lock:
+            counters = dict(self._store.counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_rate": counters["hits"] / lookups if lookups else 0.0,
+            "entries": entries,
+            "bytes": total,
+            "max_bytes": self._store.max_bytes,
+            "path": self._store.path,
+        }
+
+
+_default_cache: Optional[SQLiteResponseCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_response_cache(ttl: Optional[float] = None) -> Optional[SQLiteResponseCache]:
+    """기본 응답 캐시를 반환합니다. 비활성화되어 있으면 None을 반환합니다."""
+    global _default_cache
+    if not CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SQLiteResponseCache()
+    return _default_cache.with_ttl(ttl) if ttl else _default_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="LLM 응답 캐시 관리")
+    parser.add_argument("command", choices=["stats", "purge", "clear"], help="stats: 통계, purge: 만료 항목 삭제, clear: 전체 삭제")
+    parser.add_argument("--path", type=str, default=CACHE_PATH, help="캐시 SQLite 파일 경로")
+    args = parser.parse_args()
+
+    cache = SQLiteResponseCache(path=args.path)
+    if args.command == "purge":
+        print(f"🧹 만료 항목 {cache.purge_expired()}개 삭제")
+    elif args.command == "clear":
+        cache.clear()
+        print("🗑️ 캐시를 모두 삭제했습니다.")
+    stats = cache.stats()
+    print(f"📦 {stats['path']}: {stats['entries']}개 항목, {stats['bytes'] / 1024 / 1024:.1f}MB / {stats['max_bytes'] / 1024 / 1024:.0f}MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+공용 Ollama LLM 게이트웨이
+
+모든 파이프라인 단계가 같은 LLM 접속 계층을 공유하도록 합니다.
+- 호스트/모델/온도별로 ChatOllama 클라이언트를 1개씩만 만들어 HTTP 커넥션 풀을 재사용
+- 호스트별 동시 요청 수 제한 (동기/비동기 호출과 모든 이벤트 루프가 같은 세마포어를 공유)
+- 여러 Ollama 서버가 있으면 진행 중 요청이 가장 적은 서버로 라우팅
+- 동기(invoke/batch)와 비동기(ainvoke/abatch) 진입점 제공
+- llm_cache의 디스크 응답 캐시 연동 (캐시 적중 시 서버 호출 없음)
+
+환경 변수로 설정합니다.
+    QVP_OLLAMA_HOSTS            쉼표로 구분한 Ollama 서버 주소 목록
+    QVP_OLLAMA_MAX_CONCURRENCY  서버당 최대 동시 요청 수
+    QVP_OLLAMA_TIMEOUT          요청 타임아웃(초)
+
+사용 예:
+    from llm_gateway import get_llm
+    llm = get_llm(temperature=0)
+    chain = prompt | llm | StrOutputParser()
+"""
+
+import os
+import asyncio
+import itertools
+import threading
+from contextlib import contextmanager, asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+from pydantic import ConfigDict, Field
+from langchain_ollama import ChatOllama
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import BaseMessage
+from langchain_core.outputs import ChatResult
+
+from llm_cache import get_response_cache
+
+# --- 설정 ---
+MODEL_ID = "qwen3:32b"
+DEFAULT_HOSTS = ["http://192.168.120.102:11434"]
+
+OLLAMA_HOSTS = [h.strip() for h in os.environ.get("QVP_OLLAMA_HOSTS", "").split(",") if h.strip()] or DEFAULT_HOSTS
+MAX_CONCURRENCY_PER_HOST = int(os.environ.get("QVP_OLLAMA_MAX_CONCURRENCY", "4"))
+REQUEST_TIMEOUT = float(os.environ.get("QVP_OLLAMA_TIMEOUT", "600"))
+ASYNC_SLOT_POLL_INTERVAL = 0.05  # 비동기 호출이 빈 슬롯을 기다릴 때 확인 간격(초)
+
+
+class OllamaGateway:
+    """여러 Ollama 서버에 대한 커넥션 풀과 동시성 제한을 관리하는 클래스"""
+
+    def __init__(self, hosts: Optional[Sequence[str]] = None,
+                 max_concurrency_per_host: int = MAX_CONCURRENCY_PER_HOST,
+                 timeout: float = REQUEST_TIMEOUT):
+        self.hosts: List[str] = []
+        self.max_concurrency_per_host = max(1, max_concurrency_per_host)
+        self.timeout = timeout
+
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, int] = {}
+        # 동기/비동기 호출과 여러 이벤트 루프가 호스트별 한도를 함께 지키도록 세마포어는 호스트당 하나입니다.
+        self._sync_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._clients: Dict[tuple, ChatOllama] = {}
+        self._round_robin = itertools.count()
+
+        for host in hosts or OLLAMA_HOSTS:
+            self._register_host(host)
+
+    @property
+    def capacity(self) -> int:
+        """전체 서버 풀이 동시에 처리할 수 있는 요청 수"""
+        return len(self.hosts) * self.max_concurrency_per_host
+
+    def _register_host(self, host: str) -> str:
+        host = host.rstrip("/")
+        with self._lock:
+            if host not in self._sync_slots:
+                self.hosts.append(host)
+                self._inflight[host] = 0
+                self._sync_slots[host] = threading.BoundedSemaphore(self.max_concurrency_per_host)
+        return host
+
+    def pick_host(self, base_url: Optional[str] = None) -> str:
+        """요청을 보낼 서버를 고릅니다. base_url이 주어지면 해당 서버로 고정합니다."""
+        if base_url:
+            return self._register_host(base_url)
+        with self._lock:
+            least = min(self._inflight[h] for h in self.hosts)
+            candidates = [h for h in self.hosts if self._inflight[h] == least]
+            return candidates[next(self._round_robin) % len(candidates)]
+
+    def client(self, host: str, model: str = MODEL_ID, temperature: float = 0, **kwargs) -> ChatOllama:
+        """(서버, 모델, 온도, 옵션)마다 하나의 ChatOllama를 만들어 재사용합니다."""
+        key = (host, model, temperature, repr(sorted(kwargs.items())))
+        with self._lock:
+            llm = self._clients.get(key)
+            if llm is None:
+                limits = httpx.Limits(
+                    max_connections=self.max_concurrency_per_host,
+                    max_keepalive_connections=self.max_concurrency_per_host,
+                )
+                llm = ChatOllama(
+                    model=model,
+                    base_url=host,
+                    temperature=temperature,
+                    client_kwargs={"timeout": self.timeout, "limits": limits},
+                    **kwargs,
+                )
+                self._clients[key] = llm
+        return llm
+
+    @contextmanager
+    def slot(self, host: str):
+        """동기 호출용 동시성 슬롯을 점유합니다."""
+        semaphore = self._sync_slots[host]
+        semaphore.acquire()
+        with self._lock:
+            self._inflight[host] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._inflight[host] -= 1
+            semaphore.release()
+
+    @asynccontextmanager
+    async def aslot(self, host: str):
+        """
+        비동기 호출용 동시성 슬롯을 점유합니다. 동기 호출과 같은 세마포어를 쓰되,
+        이벤트 루프를 막지 않도록 non-blocking으로 시도하며 기다립니다. (취소되어도 슬롯이 새지 않음)
+        """
+        semaphore = self._sync_slots[host]
+        while not semaphore.acquire(blocking=False):
+            await asyncio.sleep(ASYNC_SLOT_POLL_INTERVAL)
+        with self._lock:
+            self._inflight[host] += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._inflight[host] -= 1
+            semaphore.release()
+
+    def chat_model(self, model: str = MODEL_ID, temperature: float = 0,
+                   base_url: Optional[str] = None, use_cache: bool = True,
+                   cache_ttl: Optional[float] = None, refresh_cache: bool = False,
+                   **kwargs) -> "GatewayChatModel":
+        """
+        LangChain 체인에 그대로 끼워 쓸 수 있는 채팅 모델을 반환합니다.
+        cache_ttl은 웹 검색 결과처럼 시간이 지나면 달라지는 내용을 담은 프롬프트에 지정합니다.
+        refresh_cache=True면 캐시를 조회하지 않고 새로 생성한 응답으로 덮어씁니다.
+        (응답을 쓸 수 없어 같은 프롬프트를 다시 보내는 재시도에서 캐시된 실패 응답이 반복되지 않도록)
+        """
+        cache = get_response_cache(cache_ttl) if use_cache else None
+        if cache is not None and refresh_cache:
+            cache = cache.refreshing()
+        return GatewayChatModel(
+            gateway=self,
+            model=model,
+            temperature=temperature,
+            base_url=base_url,
+            ollama_kwargs=kwargs,
+            cache=cache if cache is not None else False,
+        )
+
+    def invoke(self, prompt: Any, model: str = MODEL_ID, temperature: float = 0, **kwargs) -> BaseMessage:
+        return self.chat_model(model, temperature, **kwargs).invoke(prompt)
+
+    async def ainvoke(self, prompt: Any, model: str = MODEL_ID, temperature: float = 0, **kwargs) -> BaseMessage:
+        return await self.chat_model(model, temperature, **kwargs).ainvoke(prompt)
+
+    def batch(self, prompts: List[Any], model: str = MODEL_ID, temperature: float = 0,
+              max_workers: Optional[int] = None, **kwargs) -> List[Any]:
+        """여러 프롬프트를 서버 풀 용량만큼 동시에 실행합니다. 결과 순서는 입력 순서와 같고, 실패한 항목은 예외 객체로 반환됩니다."""
+        llm = self.chat_model(model, temperature, **kwargs)
+        return llm.batch(prompts, config={"max_concurrency": max_workers or self.capacity}, return_exceptions=True)
+
+    async def abatch(self, prompts: List[Any], model: str = MODEL_ID, temperature: float = 0,
+                     max_workers: Optional[int] = None, **kwargs) -> List[Any]:
+        llm = self.chat_model(model, temperature, **kwargs)
+        return await llm.abatch(prompts, config={"max_concurrency": max_workers or self.capacity}, return_exceptions=True)
+
+    def map(self, func, items: List[Any], max_workers: Optional[int] = None) -> List[Any]:
+        """LLM을 호출하는 임의의 함수를 서버 풀 용량만큼 스레드로 병렬 실행합니다. (순서 유지)"""
+        if not items:
+            return []
+        with ThreadPoolExecutor(max_workers=max_workers or self.capacity) as executor:
+            return list(executor.map(func, items))
+
+
+class GatewayChatModel(BaseChatModel):
+    """OllamaGateway를 통해 라우팅/동시성 제한을 거쳐 ChatOllama를 호출하는 채팅 모델"""
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    gateway: Any = Field(exclude=True)
+    model: str = MODEL_ID
+    temperature: float = 0
+    base_url: Optional[str] = None
+    ollama_kwargs: Dict[str, Any] = Field(default_factory=dict)
+
+    @property
+    def _llm_type(self) -> str:
+        return "qvp-ollama-gateway"
+
+    @property
+    def _identifying_params(self) -> Dict[str, Any]:
+        return {"model": self.model, "temperature": self.temperature, **self.ollama_kwargs}
+
+    def _generate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                  run_manager=None, **kwargs: Any) -> ChatResult:
+        host = self.gateway.pick_host(self.base_url)
+        backend = self.gateway.client(host, self.model, self.temperature, **self.ollama_kwargs)
+        with self.gateway.slot(host):
+            return backend._generate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+    async def _agenerate(self, messages: List[BaseMessage], stop: Optional[List[str]] = None,
+                         run_manager=None, **kwargs: Any) -> ChatResult:
+        host = self.gateway.pick_host(self.base_url)
+        backend = self.gateway.client(host, self.model, self.temperature, **self.ollama_kwargs)
+        async with self.gateway.aslot(host):
+            return await backend._agenerate(messages, stop=stop, run_manager=run_manager, **kwargs)
+
+
+_default_gateway: Optional[OllamaGateway] = None
+_default_gateway_lock = threading.Lock()
+
+
+def get_gateway() -> OllamaGateway:
+    """프로세스 전체에서 공유하는 기본 게이트웨이를 반환합니다."""
+    global _default_gateway
+    with _default_gateway_lock:
+        if _default_gateway is None:
+            _default_gateway = OllamaGateway()
+        return _default_gateway
+
+
+def get_llm(model: str = MODEL_ID, temperature: float = 0, base_url: Optional[str] = None, **kwargs) -> GatewayChatModel:
+    """기본 게이트웨이에 연결된 채팅 모델을 반환합니다. ChatOllama 대신 사용합니다."""
+    return get_gateway().chat_model(model=model, temperature=temperature, base_url=base_url, **kwargs)
+
+
+def invoke(prompt: Any, model: str = MODEL_ID, temperature: float = 0, **kwargs) -> BaseMessage:
+    return get_gateway().invoke(prompt, model, temperature, **kwargs)
+
+
+async def ainvoke(prompt: Any, model: str = MODEL_ID, temperature: float = 0, **kwargs) -> BaseMessage:
+    return await get_gateway().ainvoke(prompt, model, temperature, **kwargs)
+
+
+def batch(prompts: List[Any], model: str = MODEL_ID, temperature: float = 0, **kwargs) -> List[Any]:
+    return get_gateway().batch(prompts, model, temperature, **kwargs)
+
+
+async def abatch(prompts: List[Any], model: str = MODEL_ID, temperature: float = 0, **kwargs) -> List[Any]:
+    return await get_gateway().abatch(prompts, model, temperature, **kwargs)
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+IR 마크다운 검색기
+
+문서를 한 번만 청크로 나누고 임베딩한 뒤, 질의(필드 설명 등)마다 관련 청크 top-k만 골라
+LLM 프롬프트에 넣을 컨텍스트를 만듭니다. 문서 전체를 매 프롬프트에 넣는 대신 사용합니다.
+임베딩은 embedding_store에 저장해 두므로 바뀌지 않은 청크/질의는 다시 인코딩하지 않습니다.
+"""
+
+import hashlib
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+    import torch
+    from sentence_transformers import SentenceTransformer
+    from langchain.text_splitter import RecursiveCharacterTextSplitter
+    from embedding_store import get_embedding_store
+    RETRIEVAL_AVAILABLE = True
+except ImportError:
+    RETRIEVAL_AVAILABLE = False
+
+# --- 설정 ---
+EMBEDDING_MODEL_ID = "dragonkue/bge-m3-ko"
+CHUNK_SIZE = 1500
+CHUNK_OVERLAP = 300
+CONTEXT_SEPARATOR = "\n\n---\n\n"
+QUERY_CACHE_SIZE = 256  # 보관할 질의 목록 임베딩 수 (넘으면 오래된 것부터 삭제)
+
+_model_lock = threading.Lock()
+_models: Dict[str, "SentenceTransformer"] = {}
+_query_cache_lock = threading.Lock()
+_query_cache: Dict[Tuple[str, Tuple[str, ...]], "np.ndarray"] = {}
+
+
+def get_embedding_model(model_id: str = EMBEDDING_MODEL_ID) -> "SentenceTransformer":
+    """임베딩 모델을 프로세스당 한 번만 로드합니다."""
+    with _model_lock:
+        model = _models.get(model_id)
+        if model is None:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            print(f"Embedding 모델을 로드합니다... ({model_id}, {device})")
+            model = _models[model_id] = SentenceTransformer(model_id, device=device)
+        return model
+
+
+def encode_texts(texts: Sequence[str], model_id: str = EMBEDDING_MODEL_ID) -> "np.ndarray":
+    """
+    텍스트 목록을 정규화된 임베딩 행렬로 만듭니다.
+    임베딩 저장소에 있는 텍스트는 다시 인코딩하지 않으며, 모두 있으면 모델도 로드하지 않습니다.
+    """
+    def encode(batch: List[str]) -> "np.ndarray":
+        return get_embedding_model(model_id).encode(batch, normalize_embeddings=True, convert_to_numpy=True)
+
+    store = get_embedding_store(model_id)
+    return store.get_or_encode(texts, encode) if store else encode(list(texts))
+
+
+def encode_queries(queries: Sequence[str], model_id: str = EMBEDDING_MODEL_ID) -> "np.ndarray":
+    """질의 목록을 정규화된 임베딩 행렬로 만듭니다. 같은 질의 목록은 프로세스당 한 번만 인코딩합니다."""
+    key = (model_id, tuple(queries))
+    with _query_cache_lock:
+        matrix = _query_cache.get(key)
+    if matrix is None:
+        matrix = encode_texts(queries, model_id)
+        with _query_cache_lock:
+            _query_cache[key] = matrix
+            while len(_query_cache) > QUERY_CACHE_SIZE:
+                del _query_cache[next(iter(_query_cache))]
+    return matrix
+
+
+class MarkdownRetriever:
+    """문서 청크 임베딩을 보관하고 질의별 top-k 청크를 찾는 클래스"""
+
+    def __init__(self, text: str, chunk_size: int = CHUNK_SIZE, chunk_overlap: int = CHUNK_OVERLAP,
+                 model_id: str = EMBEDDING_MODEL_ID):
+        splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+        self.chunks: List[str] = splitter.split_text(text)
+        self.model_id = model_id
+        # 정규화된 임베딩이므로 내적이 곧 코사인 유사도입니다.
+        self.embeddings = encode_texts(self.chunks, model_id)
+
+    @property
+    def model(self) -> "SentenceTransformer":
+        return get_embedding_model(self.model_id)
+
+    def search_many(self, queries: Sequence[str], k: int = 3) -> List[List[int]]:
+        """여러 질의를 한 번에 임베딩하고, 질의마다 유사도 순 상위 k개 청크 인덱스를 반환합니다."""
+        if not queries or not self.chunks:
+            return [[] for _ in queries]
+        return self.top_k(encode_queries(queries, self.model_id), k)
+
+    def top_k(self, query_embeddings: "np.ndarray", k: int = 3) -> List[List[int]]:
+        """미리 인코딩한 질의 행렬로 행렬곱 한 번에 질의별 상위 k개 청크 인덱스를 구합니다."""
+        if not self.chunks:
+            return [[] for _ in range(len(query_embeddings))]
+        k = min(k, len(self.chunks))
+        scores = query_embeddings @ self.embeddings.T
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        return [sorted(row, key=lambda i: -scores[qi, i]) for qi, row in enumerate(top.tolist())]
+
+    def search(self, query: str, k: int = 3) -> List[int]:
+        return self.search_many([query], k)[0]
+
+    def context_for(self, queries: Sequence[str], k: int = 3) -> str:
+        """질의들의 top-k 청크 합집합을 문서 순서대로 이어 붙인 컨텍스트를 반환합니다."""
+        indices = sorted({i for hits in self.search_many(queries, k) for i in hits})
+        return CONTEXT_SEPARATOR.join(self.chunks[i] for i in indices)
+
+
+_retrievers: Dict[str, MarkdownRetriever] = {}
+_retrievers_lock = threading.Lock()
+
+
+def get_retriever(text: str, **kwargs) -> Optional[MarkdownRetriever]:
+    """문서 내용별로 검색기를 한 번만 만들어 재사용합니다. 의존성이 없으면 None을 반환합니다."""
+    if not RETRIEVAL_AVAILABLE:
+        return None
+    key = hashlib.sha1(text.encode("utf-8")).hexdigest()
+    with _retrievers_lock:
+        retriever = _retrievers.get(key)
+        if retriever is None:
+            retriever = _retrievers[key] = MarkdownRetriever(text, **kwargs)
+        return retriever
@@ -0,0 +1,273 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+프로세스 내 파이프라인 실행기 (DAG)
+
+각 단계를 입력/출력 아티팩트 이름을 선언한 노드로 정의하면,
+- 입력이 모두 준비된 단계부터 실행하고 서로 독립적인 단계는 스레드로 동시에 실행
+- 단계 간 결과는 파일을 다시 읽지 않고 메모리로 전달
+- 단계별 시작/종료 시각과 소요 시간, 상태를 실행 매니페스트(JSON)로 기록
+- 실패한 단계에 의존하는 단계는 실행하지 않고 skipped로 기록
+- ArtifactStore를 주면 단계 입력(초기 입력/선행 결과의 해시, 단계 버전)의 지문이 같은
+  저장 결과가 있을 때 단계를 건너뛰고 저장된 결과를 사용 (make 방식 증분 실행, 중단 후 재개)
+
+사용 예:
+    stages = [
+        PipelineStage("research", run_research, inputs=["swot_file"]),
+        PipelineStage("competitive", run_competitive, inputs=["research"]),
+    ]
+    runner = PipelineRunner(stages, manifest_path="bm_result/run_manifest.json",
+                            store=ArtifactStore(".cache/pipeline"))
+    artifacts = runner.run({"swot_file": "result/ROBOS_swot_analysis.json"})
+"""
+
+import os
+import json
+import time
+import hashlib
+import threading
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+
+def hash_value(value: Any) -> str:
+    """JSON으로 직렬화한 값의 내용 해시"""
+    data = json.dumps(value, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """파일 내용 해시"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+class PipelineStage:
+    """
+    파이프라인 노드. func는 inputs 이름을 키워드 인자로 받아 output 아티팩트를 반환합니다.
+    version은 프롬프트/코드가 바뀌었을 때 저장된 결과를 무효화하는 데 쓰입니다.
+    """
+
+    def __init__(self, name: str, func: Callable[..., Any], inputs: Sequence[str] = (),
+                 output: Optional[str] = None, description: str = "", version: str = ""):
+        self.name = name
+        self.func = func
+        self.inputs = list(inputs)
+        self.output = output or name
+        self.description = description or name
+        self.version = version
+
+    def fingerprint(self, input_hashes: Dict[str, str]) -> str:
+        """단계 이름, 버전, 입력 해시로 만든 지문. 같으면 같은 결과를 만든다고 봅니다."""
+        return hash_value({
+            "stage": self.name,
+            "version": self.version,
+            "inputs": {name: input_hashes[name] for name in self.inputs},
+        })
+
+
+class ArtifactStore:
+    """단계 결과를 (단계 이름, 지문)별 JSON 파일로 저장하는 아티팩트 저장소"""
+
+    def __init__(self, root: str = ".cache/pipeline"):
+        self.root = root
+
+    def _path(self, stage_name: str, fingerprint: str) -> str:
+        return os.path.join(self.root, stage_name, f"{fingerprint}.json")
+
+    def get(self, stage_name: str, fingerprint: str) -> Optional[Any]:
+        """저장된 결과를 반환합니다. 없거나 읽을 수 없으면 None"""
+        path = self._path(stage_name, fingerprint)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)["value"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return None
+
+    def put(self, stage_name: str, fingerprint: str, value: Any):
+        path = self._path(stage_name, fingerprint)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        record = {
+            "stage": stage_name,
+            "fingerprint": fingerprint,
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "value": value,
+        }
+        # 중간에 죽어도 깨진 파일이 남지 않도록 임시 파일에 쓴 뒤 교체합니다.
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, ensure_ascii=False, indent=4, default=str)
+        os.replace(tmp_path, path)
+
+
+class PipelineRunner:
+    """선언된 입력/출력으로 단계 간 의존성을 계산해 실행하는 DAG 실행기"""
+
+    def __init__(self, stages: Sequence[PipelineStage], max_workers: int = 4,
+                 manifest_path: Optional[str] = None, store: Optional[ArtifactStore] = None,
+                 force: bool = False):
+        self.stages = list(stages)
+        self.max_workers = max(1, max_workers)
+        self.manifest_path = manifest_path
+        self.store = store
+        self.force = force  # True면 저장된 결과를 무시하고 모두 다시 실행 (결과는 다시 저장)
+        self.manifest: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+        names = [stage.name for stage in self.stages]
+        if len(set(names)) != len(names):
+            raise ValueError(f"단계 이름이 중복되었습니다: {names}")
+        outputs = [stage.output for stage in self.stages]
+        if len(set(outputs)) != len(outputs):
+            raise ValueError(f"출력 아티팩트 이름이 중복되었습니다: {outputs}")
+        self._producers = {stage.output: stage for stage in self.stages}
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        visiting, done = set(), set()
+
+        def visit(stage: PipelineStage, path: List[str]):
+            if stage.name in done:
+                return
+            if stage.name in visiting:
+                raise ValueError(f"파이프라인에 순환 의존성이 있습니다: {' -> '.join(path + [stage.name])}")
+            visiting.add(stage.name)
+            for name in stage.inputs:
+                producer = self._producers.get(name)
+                if producer:
+                    visit(producer, path + [stage.name])
+            visiting.discard(stage.name)
+            done.add(stage.name)
+
+        for stage in self.stages:
+            visit(stage, [])
+
+    def dependencies(self, stage: PipelineStage) -> List[str]:
+        """stage의 입력을 만드는 선행 단계 이름 목록"""
+        return [self._producers[name].name for name in stage.inputs if name in self._producers]
+
+    def _write_manifest(self, manifest: Dict[str, Any]):
+        if not self.manifest_path:
+            return
+        os.makedirs(os.path.dirname(self.manifest_path) or ".", exist_ok=True)
+        with self._lock:
+            with open(self.manifest_path, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, ensure_ascii=False, indent=4)
+
+    def _update(self, record: Dict[str, Any], **fields):
+        # 매니페스트 저장(json.dump)과 겹치지 않도록 잠금 안에서 갱신합니다.
+        with self._lock:
+            record.update(fields)
+
+    def _run_stage(self, stage: PipelineStage, kwargs: Dict[str, Any], record: Dict[str, Any]) -> Any:
+        print(f"\n--- STAGE: {stage.description} ---")
+        self._update(record, status="running", started_at=datetime.now().isoformat(timespec="seconds"))
+        start = time.perf_counter()
+        status, error = "failed", None
+        try:
+            result = stage.func(**kwargs)
+            if result is None:
+                raise RuntimeError(f"{stage.name} 단계가 결과를 만들지 못했습니다.")
+            status = "success"
+            return result
+        except Exception as e:
+            error = str(e)
+            print(f"🚨 {stage.name} 단계 실패: {e}")
+            raise
+        finally:
+            fields = {
+                "status": status,
+                "seconds": round(time.perf_counter() - start, 3),
+                "finished_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            if error:
+                fields["error"] = error
+            self._update(record, **fields)
+
+    def run(self, artifacts: Optional[Dict[str, Any]] = None, run_id: Optional[str] = None,
+            input_hashes: Optional[Dict[str, str]] = None, metadata: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        초기 아티팩트로 파이프라인을 실행하고 전체 아티팩트 딕셔너리를 반환합니다.
+        매니페스트는 self.manifest에 남고 manifest_path가 있으면 파일로도 저장됩니다.
+        input_hashes로 초기 아티팩트의 해시를 직접 지정할 수 있습니다. (예: 파일 경로 대신 파일 내용 해시)
+        metadata는 매니페스트에 그대로 기록됩니다. (재개 시 입력 파일을 찾는 용도 등)
+        """
+        artifacts = dict(artifacts or {})
+        hashes = {name: hash_value(value) for name, value in artifacts.items()}
+        hashes.update(input_hashes or {})
+        missing = [name for stage in self.stages for name in stage.inputs
+                   if name not in artifacts and name not in self._producers]
+        if missing:
+            raise ValueError(f"어느 단계도 만들지 않고 초기값도 없는 입력이 있습니다: {sorted(set(missing))}")
+
+        manifest = self.manifest = {
+            "run_id": run_id or datetime.now().strftime("%Y%m%d_%H%M%S"),
+            "started_at": datetime.now().isoformat(timespec="seconds"),
+            "status": "running",
+            "metadata": metadata or {},
+            "stages": {
+                stage.name: {
+                    "status": "pending",
+                    "inputs": stage.inputs,
+                    "output": stage.output,
+                    "depends_on": self.dependencies(stage),
+                }
+                for stage in self.stages
+            },
+        }
+        records = manifest["stages"]
+        run_start = time.perf_counter()
+
+        pending = {stage.name: stage for stage in self.stages}
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                for name, stage in list(pending.items()):
+                    dep_status = [records[dep]["status"] for dep in self.dependencies(stage)]
+                    if any(status in ("failed", "skipped") for status in dep_status):
+                        self._update(records[name], status="skipped")
+                        print(f"⏭️ {name} 단계 건너뜀 (선행 단계 실패)")
+                        del pending[name]
+                    elif all(status in ("success", "cached") for status in dep_status):
+                        del pending[name]
+                        fingerprint = stage.fingerprint(hashes)
+                        self._update(records[name], fingerprint=fingerprint)
+                        cached = None
+                        if self.store and not self.force:
+                            cached = self.store.get(stage.name, fingerprint)
+                        if cached is not None:
+                            artifacts[stage.output] = cached
+                            hashes[stage.output] = hash_value(cached)
+                            self._update(records[name], status="cached", seconds=0.0)
+                            print(f"♻️ {name} 단계 건너뜀 (입력이 같은 저장 결과 사용)")
+                            continue
+                        kwargs = {input_name: artifacts[input_name] for input_name in stage.inputs}
+                        running[executor.submit(self._run_stage, stage, kwargs, records[name])] = stage
+                self._write_manifest(manifest)
+
+                if not running:
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stage = running.pop(future)
+                    if future.exception() is None:
+                        artifacts[stage.output] = future.result()
+                        hashes[stage.output] = hash_value(artifacts[stage.output])
+                        if self.store:
+                            self.store.put(stage.name, records[stage.name]["fingerprint"], artifacts[stage.output])
+                        print(f"✅ {stage.name} 단계 완료 ({records[stage.name]['seconds']:.1f}s)")
+
+        failed = [name for name, record in records.items() if record["status"] not in ("success", "cached")]
+        manifest["status"] = "failed" if failed else "success"
+        manifest["finished_at"] = datetime.now().isoformat(timespec="seconds")
+        manifest["total_seconds"] = round(time.perf_counter() - run_start, 3)
+        self._write_manifest(manifest)
+        return artifacts
+
+    @property
+    def succeeded(self) -> bool:
+        return self.manifest.get("status") == "success"
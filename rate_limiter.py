@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+호스트별 토큰 버킷 요청 속도 제한기
+
+검색/크롤링 요청 앞에 고정 time.sleep(2)를 두는 대신, 백엔드 호스트마다 하나의 토큰 버킷을
+모든 스레드와 asyncio 태스크가 공유합니다.
+- rate: 초당 보충되는 토큰 수 (평균 허용 요청 속도), burst: 한 번에 몰아 쓸 수 있는 토큰 수
+- 429/레이트 리밋 예외나 빈 결과를 받으면 속도를 절반으로 줄이고 잠시 차단 (adaptive backoff)
+- 요청이 성공하면 속도를 조금씩 원래 값으로 복구
+
+사용 예:
+    from rate_limiter import get_limiter, limited_call
+    limiter = get_limiter("duckduckgo.com")
+    result = limited_call(limiter, search.run, query, is_empty=lambda r: not r.strip())
+"""
+
+import time
+import asyncio
+import threading
+from urllib.parse import urlparse
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# --- 설정 ---
+# 호스트별 (초당 요청 수, 버스트 크기). 목록에 없는 호스트는 DEFAULT_LIMIT을 사용합니다.
+HOST_LIMITS: Dict[str, Tuple[float, int]] = {
+    "duckduckgo.com": (0.5, 3),
+}
+DEFAULT_LIMIT: Tuple[float, int] = (1.0, 2)
+
+MIN_RATE_FACTOR = 1 / 16      # 백오프로 줄어들 수 있는 최저 속도 (기본 속도 대비)
+BACKOFF_SECONDS = 5.0         # 레이트 리밋 신호를 받은 뒤 첫 차단 시간 (연속 발생 시 2배씩 증가)
+MAX_BACKOFF_SECONDS = 120.0
+RECOVERY_STEP = 0.1           # 성공할 때마다 기본 속도의 10%씩 복구
+
+
+class TokenBucket:
+    """스레드/asyncio 모두에서 안전한 토큰 버킷. 토큰을 먼저 예약하고 잠금 밖에서 기다립니다."""
+
+    def __init__(self, rate: float, burst: int = 1, name: str = ""):
+        self.name = name
+        self.base_rate = rate
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.blocked_until = 0.0
+        self.backoff = BACKOFF_SECONDS
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        토큰 하나를 예약하고 기다려야 할 시간(초)을 반환합니다. 토큰은 음수가 될 수 있습니다.
+        차단 중에는 updated가 차단 해제 시각이므로, 밀린 요청도 해제 후 줄어든 속도로 나눠서 나갑니다.
+        """
+        with self._lock:
+            now = time.monotonic()
+            if now > self.updated:
+                self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+            self.tokens -= 1
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0.0
+            return (self.updated - now) + wait
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, reason: str = ""):
+        """레이트 리밋 신호: 속도를 절반으로 줄이고 일정 시간 새 요청을 막습니다."""
+        with self._lock:
+            self.rate = max(self.base_rate * MIN_RATE_FACTOR, self.rate / 2)
+            self.blocked_until = time.monotonic() + self.backoff
+            # 차단 중에는 토큰을 보충하지 않고, 해제 시점에 요청 하나만 바로 나가도록 합니다.
+            self.tokens = min(self.tokens, 1.0)
+            self.updated = max(self.updated, self.blocked_until)
+            print(f"  ⏳ [Rate Limit] {self.name}: {reason or '제한 감지'} → {self.backoff:.0f}초 대기, 속도 {self.rate:.2f}/s")
+            self.backoff = min(MAX_BACKOFF_SECONDS, self.backoff * 2)
+
+    def reward(self):
+        """요청 성공: 속도를 조금씩 기본값으로 되돌립니다."""
+        with self._lock:
+            self.rate = min(self.base_rate, self.rate + self.base_rate * RECOVERY_STEP)
+            if self.rate >= self.base_rate:
+                self.backoff = BACKOFF_SECONDS
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def host_of(url: str) -> str:
+    """URL에서 호스트 이름을 꺼냅니다. (www. 제거)"""
+    host = urlparse(url).netloc.lower() or url.lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+def get_limiter(host: str) -> TokenBucket:
+    """호스트별 공유 토큰 버킷을 반환합니다."""
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            rate, burst = HOST_LIMITS.get(host, DEFAULT_LIMIT)
+            limiter = _limiters[host] = TokenBucket(rate, burst, name=host)
+        return limiter
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """HTTP 429 또는 레이트 리밋을 뜻하는 예외인지 판단합니다."""
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429:
+        return True
+    text = f"{type(error).__name__} {error}".lower()
+    return "429" in text or "ratelimit" in text or "rate limit" in text or "too many requests" in text
+
+
+def limited_call(limiter: TokenBucket, func: Callable[..., Any], *args,
+                 is_empty: Optional[Callable[[Any], bool]] = None, retries: int = 2, **kwargs) -> Any:
+    """
+    토큰을 얻은 뒤 func를 호출합니다.
+    레이트 리밋 예외면 백오프 후 최대 retries번 재시도하고, 빈 결과면 백오프만 하고 결과를 그대로 반환합니다.
+    """
+    for attempt in range(retries + 1):
+        limiter.acquire()
+        try:
+            result = func(*args, **kwargs)
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == retries:
+                raise
+            limiter.penalize(str(e)[:80])
+            continue
+        if is_empty and is_empty(result):
+            limiter.penalize("빈 결과")
+        else:
+            limiter.reward()
+        return result
+
+
+async def alimited_call(limiter: TokenBucket, func: Callable[..., Any], *args,
+                        is_empty: Optional[Callable[[Any], bool]] = None, retries: int = 2, **kwargs) -> Any:
+    """limited_call의 비동기 버전. func는 코루틴 함수여야 합니다."""
+    for attempt in range(retries + 1):
+        await limiter.aacquire()
+        try:
+            result = await func(*args, **kwargs)
+        except Exception as e:
+            if not is_rate_limit_error(e) or attempt == retries:
+                raise
+            limiter.penalize(str(e)[:80])
+            continue
+        if is_empty and is_empty(result):
+            limiter.penalize("빈 결과")
+        else:
+            limiter.reward()
+        return result
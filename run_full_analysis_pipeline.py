@@ -1,8 +1,19 @@
 import os
-import subprocess
+import json
+import time
 import argparse
 import sys
+import threading
 from glob import glob
+from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import advanced_deep_research
+import competitive_analysis
+import extract_lean_canvas
+import generate_strategic_report
+from pipeline_runner import PipelineStage, PipelineRunner, ArtifactStore, hash_file
+from llm_gateway import get_gateway
 
 # ==============================================================================
 # ▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼ 설정 부분 ▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼▼
@@ -12,35 +23,15 @@ from glob import glob
 #
 INPUT_SWOT_FILE = 'result/ROBOS_swot_analysis_20250611_163629.json'
 #
+# 단계 결과 저장소. 입력(SWOT 파일, 선행 결과, 단계 코드/프롬프트)이 같으면 저장된 결과를 재사용합니다.
+ARTIFACT_STORE_DIR = '.cache/pipeline'
+#
+# 배치 모드에서 웹 검색 단계(리서치/경쟁 분석)를 동시에 실행할 회사 수 상한 (검색 차단 방지)
+MAX_SEARCH_COMPANIES = 2
+#
 # ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲ 설정 부분 ▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲▲
 # ==============================================================================
 
-def find_latest_file(pattern):
-    """주어진 패턴에 맞는 파일 중 가장 최신 파일을 찾습니다."""
-    files = glob(pattern)
-    if not files:
-        return None
-    return max(files, key=os.path.getmtime)
-
-def run_script(script_name, arguments):
-    """주어진 인자와 함께 파이썬 스크립트를 실행하고, 출력을 실시간으로 보여줍니다."""
-    command = [sys.executable, script_name] + arguments
-    print(f"\n{'='*20} RUNNING: {' '.join(command)} {'='*20}\n")
-    try:
-        # capture_output=True를 제거하여 하위 프로세스의 출력이 실시간으로 터미널에 표시되도록 함
-        subprocess.run(command, check=True, text=True)
-    except subprocess.CalledProcessError as e:
-        # 에러가 발생하면 check=True에 의해 예외가 발생하므로, 별도 에러 메시지 출력
-        print(f"\n🚨🚨🚨 ERROR: {script_name} failed to execute with return code {e.returncode}. 🚨🚨🚨")
-        return False
-    except FileNotFoundError:
-        print(f"🚨🚨🚨 ERROR: Script '{script_name}' not found. Make sure it's in the same directory. 🚨🚨🚨")
-        return False
-    except Exception as e:
-        print(f"🚨🚨🚨 ERROR: Unexpected error running {script_name}: {e} 🚨🚨🚨")
-        return False
-    return True
-
 def get_identifier_from_swot(swot_file_path):
     """SWOT 파일 경로에서 고유 식별자를 추출합니다."""
     base_name = os.path.basename(swot_file_path)
@@ -48,13 +39,95 @@ def get_identifier_from_swot(swot_file_path):
     identifier = base_name.replace('_swot_analysis', '').replace('.json', '')
     return identifier
 
-def main(swot_file_path):
+# 웹 검색을 하는 단계는 회사 수와 관계없이 MAX_SEARCH_COMPANIES개까지만 동시에 실행합니다.
+search_slots = threading.BoundedSemaphore(MAX_SEARCH_COMPANIES)
+
+def module_version(module):
+    """단계 모듈 소스(프롬프트 템플릿 포함)의 해시. 프롬프트나 코드가 바뀌면 저장된 결과를 다시 만듭니다."""
+    return hash_file(module.__file__)[:16]
+
+def build_stages(identifier):
+    """
+    파이프라인 단계(DAG)를 정의합니다. 각 단계는 이전 단계의 결과를 메모리로 받습니다.
+    (결과 파일은 각 단계가 기존처럼 bm_result/에도 저장합니다.)
+    """
+    adv_report_path = f'bm_result/advanced_deep_research_report_{identifier}.json'
+    comp_report_path = f'bm_result/competitive_analysis_report_{identifier}.json'
+
+    def run_research(swot_file):
+        with search_slots:
+            return advanced_deep_research.process_single_file(swot_file)
+
+    def run_competitive(research):
+        with search_slots:
+            return competitive_analysis.process_single_report(adv_report_path, report_data=research)
+
+    def run_lean_canvas(competitive):
+        return extract_lean_canvas.process_single_report(comp_report_path, report_data=competitive)
+
+    def run_strategic_report(research, competitive, lean_canvas):
+        return generate_strategic_report.run_pipeline(identifier, inputs={
+            "initial_analysis": research.get("final_report_korean", ""),
+            "competitor_analysis": competitive.get("final_competitive_report", ""),
+            "lean_canvas": json.dumps(lean_canvas, ensure_ascii=False, indent=2),
+        })
+
+    return [
+        PipelineStage("research", run_research, inputs=["swot_file"],
+                      description="STAGE 1: Advanced Deep Research",
+                      version=module_version(advanced_deep_research)),
+        PipelineStage("competitive", run_competitive, inputs=["research"],
+                      description="STAGE 2: Competitive Analysis",
+                      version=module_version(competitive_analysis)),
+        PipelineStage("lean_canvas", run_lean_canvas, inputs=["competitive"],
+                      description="STAGE 3: Lean Canvas Extraction",
+                      version=module_version(extract_lean_canvas)),
+        PipelineStage("strategic_report", run_strategic_report, inputs=["research", "competitive", "lean_canvas"],
+                      description="STAGE 4: Strategic Report Generation",
+                      version=module_version(generate_strategic_report)),
+    ]
+
+def stage_output_paths(identifier):
+    """단계별 결과 파일 경로"""
+    return {
+        "research": f'bm_result/advanced_deep_research_report_{identifier}.json',
+        "competitive": f'bm_result/competitive_analysis_report_{identifier}.json',
+        "lean_canvas": f'bm_result/lean_canvas_{identifier}.json',
+        "strategic_report": f'bm_result/strategic_report_{identifier}.json',
+    }
+
+def materialize_outputs(identifier, artifacts):
+    """저장소에서 재사용한 단계의 결과 파일이 bm_result/에 없으면 다시 써 둡니다."""
+    for name, path in stage_output_paths(identifier).items():
+        if name in artifacts and not os.path.exists(path):
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(artifacts[name], f, ensure_ascii=False, indent=4)
+            print(f"♻️ Restored {path} from the artifact store")
+
+def find_resume_target():
+    """가장 최근에 성공하지 못한 실행의 SWOT 파일 경로를 매니페스트에서 찾습니다."""
+    manifests = sorted(glob('bm_result/run_manifest_*.json'), key=os.path.getmtime, reverse=True)
+    for manifest_path in manifests:
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            continue
+        swot_file = manifest.get("metadata", {}).get("swot_file")
+        if manifest.get("status") != "success" and swot_file:
+            return swot_file
+    return None
+
+def main(swot_file_path, force=False):
     """
-    전체 분석 파이프라인을 실행합니다.
+    전체 분석 파이프라인을 한 프로세스 안에서 실행합니다.
     1. Advanced Deep Research
     2. Competitive Analysis
     3. Lean Canvas Extraction
     4. Strategic Report Generation
+    단계별 소요 시간은 bm_result/run_manifest_<identifier>.json에 기록됩니다.
+    입력이 바뀌지 않은 단계는 저장된 결과를 재사용하므로, 실패 후 다시 실행하면 실패한 단계부터 이어서 실행됩니다.
+    force=True면 저장된 결과를 무시하고 모든 단계를 다시 실행합니다.
     """
     
     # bm_result 디렉토리 생성
@@ -63,7 +136,7 @@ def main(swot_file_path):
     # 입력된 SWOT 파일이 실제로 존재하는지 확인
     if not os.path.exists(swot_file_path):
         print(f"🚨 ERROR: Input SWOT file not found at '{swot_file_path}'")
-        print(f"�� TIP: Make sure the SWOT analysis file exists in the result directory")
+        print(f"💡 TIP: Make sure the SWOT analysis file exists in the result directory")
         print(f"       Analysis results will be saved to the bm_result directory")
         return False
 
@@ -77,76 +150,149 @@ def main(swot_file_path):
         print(f"🚨 ERROR: Failed to extract identifier from {swot_file_path}: {e}")
         return False
 
-    # --- 단계 1: Advanced Deep Research 실행 ---
-    print("\n--- STAGE 1: Advanced Deep Research ---")
-    if not run_script('advanced_deep_research.py', [swot_file_path]):
-        print("🚨 Stage 1 failed. Stopping pipeline.")
-        return False
-    
-    # 1단계의 결과물 경로를 구성합니다.
-    adv_report_path = f'bm_result/advanced_deep_research_report_{identifier}.json'
-    if not os.path.exists(adv_report_path):
-        print(f"🚨 ERROR: Stage 1 did not produce the expected output file: {adv_report_path}")
-        return False
-    print(f"✅ Stage 1 completed. Output: {adv_report_path}")
-
-    # --- 단계 2: Competitive Analysis 실행 ---
-    print("\n--- STAGE 2: Competitive Analysis ---")
-    if not run_script('competitive_analysis.py', [adv_report_path]):
-        print("🚨 Stage 2 failed. Stopping pipeline.")
-        return False
-
-    # 2단계의 결과물 경로를 구성합니다.
-    comp_report_path = f'bm_result/competitive_analysis_report_{identifier}.json'
-    if not os.path.exists(comp_report_path):
-        print(f"🚨 ERROR: Stage 2 did not produce the expected output file: {comp_report_path}")
-        return False
-    print(f"✅ Stage 2 completed. Output: {comp_report_path}")
+    manifest_path = f'bm_result/run_manifest_{identifier}.json'
+    runner = PipelineRunner(build_stages(identifier), manifest_path=manifest_path,
+                            store=ArtifactStore(ARTIFACT_STORE_DIR), force=force)
+    artifacts = runner.run(
+        {"swot_file": swot_file_path},
+        run_id=identifier,
+        input_hashes={"swot_file": hash_file(swot_file_path)},  # 경로가 아니라 파일 내용으로 판단
+        metadata={"swot_file": swot_file_path},
+    )
+    materialize_outputs(identifier, artifacts)
 
-    # --- 단계 3: Lean Canvas Extraction 실행 ---
-    print("\n--- STAGE 3: Lean Canvas Extraction ---")
-    if not run_script('extract_lean_canvas.py', [comp_report_path]):
-        print("🚨 Stage 3 failed. Stopping pipeline.")
-        return False
-    
-    lean_canvas_path = f'bm_result/lean_canvas_{identifier}.json'
-    if not os.path.exists(lean_canvas_path):
-        print(f"🚨 ERROR: Stage 3 did not produce the expected output file: {lean_canvas_path}")
-        return False
-    print(f"✅ Stage 3 completed. Output: {lean_canvas_path}")
+    print("\n--- Stage timings ---")
+    for name, record in runner.manifest["stages"].items():
+        seconds = record.get("seconds")
+        print(f"   - {name}: {record['status']}" + (f" ({seconds:.1f}s)" if seconds is not None else ""))
+    print(f"📋 Run manifest: {manifest_path} (total {runner.manifest['total_seconds']:.1f}s)")
 
-    # --- 단계 4: Strategic Report Generation ---
-    print("\n--- STAGE 4: Strategic Report Generation ---")
-    # 4단계 스크립트는 파일 경로 대신 identifier를 인자로 받습니다.
-    if not run_script('generate_strategic_report.py', [identifier]):
-        print("🚨 Stage 4 failed. Stopping pipeline.")
+    if not runner.succeeded:
+        print("🚨 Pipeline stopped because a stage failed.")
         return False
-    
-    # 4단계의 결과물 경로를 구성합니다.
-    strategic_report_path = f'bm_result/strategic_report_{identifier}.json'
-    if not os.path.exists(strategic_report_path):
-        print(f"🚨 ERROR: Stage 4 did not produce the expected output file: {strategic_report_path}")
-        return False
-    print(f"✅ Stage 4 completed. Output: {strategic_report_path}")
 
+    paths = stage_output_paths(identifier)
     print("\n\n🎉🎉🎉 Full analysis pipeline completed successfully! 🎉🎉🎉")
     print(f"📁 All outputs are located in the bm_result/ directory:")
-    print(f"   - Initial research: {adv_report_path}")
-    print(f"   - Competitive analysis: {comp_report_path}")
-    print(f"   - Lean Canvas: {lean_canvas_path}")
-    print(f"   - Final strategic report: {strategic_report_path}")
+    print(f"   - Initial research: {paths['research']}")
+    print(f"   - Competitive analysis: {paths['competitive']}")
+    print(f"   - Lean Canvas: {paths['lean_canvas']}")
+    print(f"   - Final strategic report: {paths['strategic_report']}")
     return True
 
+def collect_swot_files(patterns=None, list_file=None):
+    """glob 패턴들과 목록 파일(한 줄에 경로 하나, #은 주석)에서 SWOT 파일 목록을 만듭니다. (중복 제거, 순서 유지)"""
+    files = []
+    for pattern in patterns or []:
+        files.extend(sorted(glob(pattern)))
+    if list_file:
+        with open(list_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith('#'):
+                    files.extend(sorted(glob(line)) or [line])
+    return list(dict.fromkeys(files))
+
+def read_manifest(identifier):
+    try:
+        with open(f'bm_result/run_manifest_{identifier}.json', 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+def run_batch(swot_files, max_workers=None, force=False):
+    """
+    여러 회사의 파이프라인을 동시에 실행하고 회사별 상태/소요 시간을 모은 요약을 저장합니다.
+    동시 실행 회사 수는 LLM 서버 풀 용량으로, 웹 검색 단계는 MAX_SEARCH_COMPANIES로 제한합니다.
+    """
+    os.makedirs('bm_result', exist_ok=True)
+    workers = max(1, min(len(swot_files), max_workers or get_gateway().capacity))
+    print(f"🚀 Batch pipeline: {len(swot_files)} companies, {workers} workers (search stages: {MAX_SEARCH_COMPANIES} at a time)")
+
+    def run_one(swot_file):
+        start = time.perf_counter()
+        try:
+            success = main(swot_file, force=force)
+            error = None
+        except Exception as e:
+            success, error = False, str(e)
+            print(f"🚨 ERROR: {swot_file}: {e}")
+        identifier = get_identifier_from_swot(swot_file)
+        stages = read_manifest(identifier).get("stages", {})
+        return {
+            "swot_file": swot_file,
+            "identifier": identifier,
+            "status": "success" if success else "failed",
+            "seconds": round(time.perf_counter() - start, 3),
+            "error": error,
+            "stages": {name: {"status": r.get("status"), "seconds": r.get("seconds")} for name, r in stages.items()},
+        }
+
+    batch_start = time.perf_counter()
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(run_one, swot_file): swot_file for swot_file in swot_files}
+        for future in as_completed(futures):
+            result = future.result()
+            results[result["swot_file"]] = result
+            print(f"{'✅' if result['status'] == 'success' else '🚨'} [{len(results)}/{len(swot_files)}] {result['identifier']}: {result['status']} ({result['seconds']:.1f}s)")
+
+    companies = [results[swot_file] for swot_file in swot_files]
+    succeeded = sum(1 for c in companies if c["status"] == "success")
+    summary = {
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "total_seconds": round(time.perf_counter() - batch_start, 3),
+        "workers": workers,
+        "succeeded": succeeded,
+        "failed": len(companies) - succeeded,
+        "companies": companies,
+    }
+    summary_path = f"bm_result/batch_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=4)
+
+    print(f"\n{'='*20} BATCH SUMMARY {'='*20}")
+    for c in companies:
+        stage_text = ", ".join(f"{name}:{r['status']}" for name, r in c["stages"].items())
+        print(f"   {'✅' if c['status'] == 'success' else '🚨'} {c['identifier']}: {c['seconds']:.1f}s [{stage_text}]")
+    print(f"📋 {succeeded}/{len(companies)} succeeded in {summary['total_seconds']:.1f}s. Summary: {summary_path}")
+    return succeeded == len(companies)
+
 if __name__ == "__main__":
-    if not INPUT_SWOT_FILE or INPUT_SWOT_FILE == ' 여기에 경로 입력 ':
+    parser = argparse.ArgumentParser(description="Run the full analysis pipeline (research -> competitive -> lean canvas -> strategic report).")
+    parser.add_argument("swot_file", nargs="?", default=None, help="Input SWOT analysis JSON file (default: INPUT_SWOT_FILE)")
+    parser.add_argument("--resume", action="store_true", help="Resume the most recent run that did not finish successfully")
+    parser.add_argument("--force", action="store_true", help="Ignore stored stage results and re-run every stage")
+    parser.add_argument("--batch", nargs="+", metavar="GLOB", help="Batch mode: glob patterns of SWOT files (e.g. 'result/*_swot_analysis_*.json')")
+    parser.add_argument("--batch-file", type=str, help="Batch mode: text file listing SWOT files, one path or glob per line")
+    parser.add_argument("--workers", type=int, default=None, help="Batch mode: companies processed at once (default: LLM server pool capacity)")
+    args = parser.parse_args()
+
+    if args.batch or args.batch_file:
+        swot_files = collect_swot_files(args.batch, args.batch_file)
+        if not swot_files:
+            print("🚨 No SWOT files matched the batch input.")
+            sys.exit(1)
+        sys.exit(0 if run_batch(swot_files, args.workers, force=args.force) else 1)
+
+    swot_file = args.swot_file
+    if swot_file is None and args.resume:
+        swot_file = find_resume_target()
+        if swot_file:
+            print(f"🔁 Resuming unfinished run for: {swot_file}")
+        else:
+            print("ℹ️ No unfinished run found. Falling back to INPUT_SWOT_FILE.")
+    swot_file = swot_file or INPUT_SWOT_FILE
+
+    if not swot_file or swot_file == ' 여기에 경로 입력 ':
         print("🚨 Please set the 'INPUT_SWOT_FILE' variable at the top of the script before running.")
         sys.exit(1)
     else:
         try:
-            success = main(INPUT_SWOT_FILE)
+            success = main(swot_file, force=args.force)
             if not success:
                 print("\n🚨 Pipeline execution failed. Please check the error messages above.")
                 sys.exit(1)
         except Exception as e:
             print(f"\n🚨 ERROR: An unexpected error occurred: {e}")
-            sys.exit(1) 
\ No newline at end of file
+            sys.exit(1)
@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""
+웹 검색 결과 디스크 캐시 (SQLite)
+
+리서치 단계들(advanced_deep_research, competitive_analysis, IPO_deep_research)이 보내는
+웹 검색 결과를 (검색 백엔드, 정규화한 검색어)를 키로 저장합니다.
+- 대소문자/전각 문자/구두점/공백/불용어만 다른 검색어는 같은 항목으로 취급 (단어 순서와 따옴표 구문은 유지)
+- 캐시에 있으면 네트워크 호출과 검색 전 대기(rate limit sleep) 없이 즉시 반환
+- 같은 검색어를 여러 스레드가 동시에 요청하면 한 번만 검색하고 결과를 공유
+- TTL이 지나면 만료
+
+환경 변수로 설정합니다.
+    QVP_SEARCH_CACHE          0이면 캐시 비활성화 (기본 1)
+    QVP_SEARCH_CACHE_PATH     SQLite 파일 경로
+    QVP_SEARCH_CACHE_TTL      검색 결과 TTL(초)
+
+사용법:
+    python search_cache.py stats    # 캐시 통계 출력
+    python search_cache.py purge    # 만료 항목 삭제
+    python search_cache.py clear    # 전체 삭제
+"""
+
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import argparse
+import unicodedata
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+# --- 설정 ---
+CACHE_ENABLED = os.environ.get("QVP_SEARCH_CACHE", "1") not in ("0", "false", "False", "")
+CACHE_PATH = os.environ.get("QVP_SEARCH_CACHE_PATH", ".cache/search_results.sqlite")
+SEARCH_CACHE_TTL = float(os.environ.get("QVP_SEARCH_CACHE_TTL", str(3 * 24 * 3600)))
+
+# 검색 결과에 거의 영향을 주지 않는 영어 불용어
+STOPWORDS = {"a", "an", "the", "of", "in", "on", "for", "and", "or", "to", "about", "with"}
+
+
+def canonicalize_query(query: str) -> str:
+    """
+    검색어를 정규화합니다.
+    NFKC 정규화, 소문자화, 구두점/불용어 제거, 공백 정리만 하고 단어 순서와 큰따옴표 구문은 그대로 둡니다.
+    'ROBOS 경쟁사,  Market Share' 와 'robos 경쟁사 market share'는 같은 키가 되지만
+    'A 인수 B'와 'B 인수 A', '"A B"'와 'A B'는 서로 다른 키가 됩니다.
+    """
+    text = unicodedata.normalize("NFKC", query).casefold()
+    text = re.sub(r"[\u201c\u201d\u201e\u201f]", '"', text)  # 둥근 큰따옴표는 일반 큰따옴표로
+    text = re.sub(r'[^\w\s.%+#&"-]', " ", text)
+    tokens, quoted = [], False
+    for token in text.replace('"', ' " ').split():  # 따옴표를 독립 토큰으로 분리
+        if token == '"':
+            quoted = not quoted
+            tokens.append(token)
+            continue
+        token = token.strip(".-")
+        # 따옴표 구문 안의 불용어는 정확한 구문 검색의 일부이므로 남깁니다.
+        if token and (quoted or token not in STOPWORDS):
+            tokens.append(token)
+    return " ".join(tokens)
+
+
+def is_empty_search_result(result: Any) -> bool:
+    """검색 결과가 비어 있는지 판단합니다. (레이트 리밋에 걸리면 빈 결과가 오는 경우가 많음)"""
+    text = str(result or "").strip()
+    return not text or text == "[]" or text.startswith("No good DuckDuckGo Search Result")
+
+
+def make_search_key(query: str, backend: str) -> str:
+    return hashlib.sha256(f"{backend}\x00{canonicalize_query(query)}".encode("utf-8")).hexdigest()
+
+
+class SearchCache:
+    """(백엔드, 정규화 검색어)별 검색 결과를 SQLite에 저장하는 캐시"""
+
+    def __init__(self, path: str = CACHE_PATH, ttl: float = SEARCH_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.counters = {"hits": 0, "misses": 0, "expired": 0, "writes": 0, "shared": 0}
+        # 같은 키를 동시에 검색하지 않도록 키별 잠금을 둡니다.
+        self._key_locks: Dict[str, threading.Lock] = {}
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+        with self.connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    backend TEXT NOT NULL,
+                    query TEXT NOT NULL,
+                    canonical_query TEXT NOT NULL,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL
+                )
+            """)
+
+    def connect(self) -> sqlite3.Connection:
+        """스레드마다 별도의 커넥션을 사용합니다."""
+        conn = getattr(self.local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            self.local.conn = conn
+        return conn
+
+    def count(self, name: str, n: int = 1):
+        with self.lock:
+            self.counters[name] += n
+
+    def get(self, query: str, backend: str) -> Optional[str]:
+        key = make_search_key(query, backend)
+        conn = self.connect()
+        row = conn.execute("SELECT value, expires_at FROM search_cache WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return None
+        value, expires_at = row
+        if expires_at is not None and expires_at < time.time():
+            with conn:
+                conn.execute("DELETE FROM search_cache WHERE key = ?", (key,))
+            self.count("expired")
+            return None
+        return value
+
+    def put(self, query: str, backend: str, value: str, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        conn = self.connect()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, backend, query, canonical_query, value, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (make_search_key(query, backend), backend, query, canonicalize_query(query), value, now, now + ttl if ttl else None),
+            )
+        self.count("writes")
+
+    def search(self, query: str, fetch: Callable[[str], str], backend: str, ttl: Optional[float] = None) -> str:
+        """
+        캐시에 있으면 저장된 결과를, 없으면 fetch(query)로 검색해 저장한 뒤 반환합니다.
+        fetch가 예외를 던지면 저장하지 않고 그대로 전파합니다. 빈 결과도 저장하지 않습니다.
+        """
+        value = self.get(query, backend)
+        if value is not None:
+            self.count("hits")
+            return value
+
+        key = make_search_key(query, backend)
+        with self.lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            # 기다리는 동안 다른 스레드가 같은 검색을 끝냈을 수 있습니다.
+            value = self.get(query, backend)
+            if value is not None:
+                self.count("shared")
+                return value
+            self.count("misses")
+            value = fetch(query)
+            if not is_empty_search_result(value):
+                self.put(query, backend, value, ttl)
+            return value
+
+    def purge_expired(self) -> int:
+        conn = self.connect()
+        with conn:
+            cursor = conn.execute("DELETE FROM search_cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+        return cursor.rowcount
+
+    def clear(self):
+        conn = self.connect()
+        with conn:
+            conn.execute("DELETE FROM search_cache")
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self.connect()
+        entries = conn.execute("SELECT COUNT(*) FROM search_cache").fetchone()[0]
+        with self.lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["shared"] + counters["misses"]
+        return {
+            **counters,
+            "hit_rate": (counters["hits"] + counters["shared"]) / lookups if lookups else 0.0,
+            "entries": entries,
+            "path": self.path,
+        }
+
+
+_default_cache: Optional[SearchCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_search_cache() -> Optional[SearchCache]:
+    """기본 검색 캐시를 반환합니다. 비활성화되어 있으면 None을 반환합니다."""
+    global _default_cache
+    if not CACHE_ENABLED:
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = SearchCache()
+        return _default_cache
+
+
+def cached_search(query: str, fetch: Callable[[str], str], backend: str, ttl: Optional[float] = None) -> str:
+    """
+    기본 검색 캐시를 거쳐 검색합니다. 캐시가 꺼져 있으면 fetch(query)를 바로 호출합니다.
+    검색 전 대기(rate limit)는 fetch 안에 두어 캐시 적중 시에는 기다리지 않도록 합니다.
+    """
+    cache = get_search_cache()
+    if cache is None:
+        return fetch(query)
+    return cache.search(query, fetch, backend, ttl)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="웹 검색 결과 캐시 관리")
+    parser.add_argument("command", choices=["stats", "purge", "clear"], help="stats: 통계, purge: 만료 항목 삭제, clear: 전체 삭제")
+    parser.add_argument("--path", type=str, default=CACHE_PATH, help="캐시 SQLite 파일 경로")
+    args = parser.parse_args()
+
+    cache = SearchCache(path=args.path)
+    if args.command == "purge":
+        print(f"🧹 만료 항목 {cache.purge_expired()}개 삭제")
+    elif args.command == "clear":
+        cache.clear()
+        print("🗑️ 캐시를 모두 삭제했습니다.")
+    stats = cache.stats()
+    print(f"📦 {stats['path']}: {stats['entries']}개 항목")
+
+
+if __name__ == "__main__":
+    main()
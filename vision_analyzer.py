@@ -9,27 +9,32 @@ LLM의 출력에서 <think> 블록을 정규식으로 제거한 후 JSON 파싱
 
 import re
 import json
+import hashlib
 import logging
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import List, Dict, Any, Optional
 
 # 로컬 LLM 연동 (langchain_ollama)
 try:
-    from langchain_ollama import ChatOllama
+    from llm_gateway import get_llm, get_gateway
     from langchain_core.output_parsers import StrOutputParser
     from langchain_core.prompts import PromptTemplate
     OLLAMA_AVAILABLE = True
 except ImportError:
     OLLAMA_AVAILABLE = False
     print("⚠️ langchain_ollama가 설치되지 않았습니다. pip install langchain-ollama langchain-core 로 설치하세요.")
-    class ChatOllama: pass
+    get_llm = None
+    get_gateway = None
     class StrOutputParser: pass
     class PromptTemplate: pass
 
 # --- 설정 ---
 MODEL_ID = "qwen3:32b" # 모델 ID는 환경에 맞게 수정하세요 (예: "qwen2:32b")
-BASE_URL = "http://192.168.120.102:11434" # Ollama 서버 주소
+BASE_URL = None # Ollama 서버 주소 (None이면 llm_gateway의 서버 풀에서 라우팅)
+LLM_CONCURRENCY = None # 섹션 인덱싱/주제별 추출 동시 호출 수 (None이면 게이트웨이 서버 풀 용량)
+SECTION_CACHE_DIR = ".cache/vision_sections" # 섹션 내용 해시별 요약/키워드 캐시
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -42,15 +47,19 @@ class VisionMDAnalyzer:
     핵심 정보를 추출하고 구조화하는 클래스. (최종 안정화 버전)
     """
 
-    def __init__(self, model_id: str = MODEL_ID, base_url: str = BASE_URL):
+    def __init__(self, model_id: str = MODEL_ID, base_url: Optional[str] = BASE_URL,
+                 concurrency: Optional[int] = LLM_CONCURRENCY):
+        self.model_id = model_id
+        self.concurrency = concurrency
         if not OLLAMA_AVAILABLE:
             logger.error("필수 라이브러리가 설치되지 않아 LLM을 사용할 수 없습니다.")
             self.use_llm = False
             return
         try:
-            self.llm = ChatOllama(model=model_id, base_url=base_url, temperature=0)
+            self.llm = get_llm(model=model_id, base_url=base_url, temperature=0)
+            self.concurrency = concurrency or get_gateway().capacity
             self.use_llm = True
-            logger.info(f"LLM 초기화 완료: {model_id} at {base_url}")
+            logger.info(f"LLM 초기화 완료: {model_id} at {base_url or '게이트웨이 서버 풀'}")
         except Exception as e:
             logger.error(f"LLM 초기화 실패: {e}. LLM 기능 없이 실행됩니다.")
             self.use_llm = False
@@ -100,22 +109,47 @@ class VisionMDAnalyzer:
         template = """다음 텍스트의 핵심 내용을 한국어로 한 문장으로 요약하고, 가장 중요한 키워드를 5개만 쉼표(,)로 구분하여 나열해줘.\n\n--- 텍스트 시작 ---\n{text}\n--- 텍스트 끝 ---\n\n결과는 다음 형식으로만 출력해줘.\n요약: [여기에 요약]\n키워드: [여기에 키워드]\n/no_think\n"""
         prompt = PromptTemplate.from_template(template)
         chain = prompt | self.llm | StrOutputParser()
-        indexed_chunks = []
-        for i, chunk in enumerate(chunks):
-            logger.info(f"  - 인덱싱 처리 중... ({i+1}/{len(chunks)}) : {chunk['header']}")
-            try:
-                response = chain.invoke({"text": chunk['content']})
-                summary_match = re.search(r"요약:\s*(.*)", response)
-                keywords_match = re.search(r"키워드:\s*(.*)", response)
-                summary = summary_match.group(1).strip() if summary_match else "요약 실패"
-                keywords = [kw.strip() for kw in keywords_match.group(1).strip().split(',')] if keywords_match else []
-                indexed_chunks.append({**chunk, 'summary': summary, 'keywords': keywords})
-            except Exception as e:
-                logger.warning(f"  - 인덱싱 실패: {chunk['header']}. 원본 내용만 사용. 오류: {e}")
-                indexed_chunks.append({**chunk, 'summary': '', 'keywords': []})
+
+        # 섹션 내용이 같으면 캐시된 요약을 쓰고, 나머지만 동시에 LLM으로 인덱싱합니다.
+        cache_paths = [self._section_cache_path(template, chunk['content']) for chunk in chunks]
+        indexes = [self._load_section_index(path) for path in cache_paths]
+        missing = [i for i, index in enumerate(indexes) if index is None]
+        logger.info(f"  - 캐시 적중 {len(chunks) - len(missing)}개, LLM 인덱싱 {len(missing)}개 (동시 {self.concurrency})")
+        responses = chain.batch([{"text": chunks[i]['content']} for i in missing],
+                                config={"max_concurrency": self.concurrency}, return_exceptions=True)
+        for i, response in zip(missing, responses):
+            if isinstance(response, Exception):
+                logger.warning(f"  - 인덱싱 실패: {chunks[i]['header']}. 원본 내용만 사용. 오류: {response}")
+                indexes[i] = {'summary': '', 'keywords': []}
+                continue
+            summary_match = re.search(r"요약:\s*(.*)", response)
+            keywords_match = re.search(r"키워드:\s*(.*)", response)
+            summary = summary_match.group(1).strip() if summary_match else "요약 실패"
+            keywords = [kw.strip() for kw in keywords_match.group(1).strip().split(',')] if keywords_match else []
+            indexes[i] = {'summary': summary, 'keywords': keywords}
+            if summary_match:
+                self._save_section_index(cache_paths[i], indexes[i])
+        indexed_chunks = [{**chunk, **index} for chunk, index in zip(chunks, indexes)]
         logger.info("인덱싱 완료.")
         return indexed_chunks
 
+    def _section_cache_path(self, template: str, content: str) -> Path:
+        """(모델, 프롬프트, 섹션 내용) 해시로 캐시 파일 경로를 만듭니다."""
+        key = hashlib.sha256(f"{self.model_id}\x00{template}\x00{content}".encode('utf-8')).hexdigest()
+        return Path(SECTION_CACHE_DIR) / f"{key}.json"
+
+    def _load_section_index(self, path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+
+    def _save_section_index(self, path: Path, index: Dict[str, Any]):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(index, f, ensure_ascii=False)
+
     def _group_chunks_by_theme(self, indexed_chunks: List[Dict[str, Any]]) -> Dict[str, List[str]]:
         if not self.use_llm: return {}
         logger.info("3-1단계: 주제별 그룹화 시작...")
@@ -279,27 +313,37 @@ class VisionMDAnalyzer:
 /no_think"""
         }
         detailed_info = {}
+        tasks = []
         for theme, headers in grouped_headers.items():
             if theme not in extraction_prompts or not headers: continue
-            logger.info(f"  - 심층 분석 중... ({theme})")
             context = "\n\n---\n\n".join(chunk_map.get(h, '') for h in headers if h in chunk_map)
             if not context.strip():
                 logger.warning(f"  - '{theme}' 주제에 해당하는 내용이 없어 건너뜁니다.")
                 detailed_info[theme] = {}
                 continue
-            template = extraction_prompts[theme]
-            prompt = PromptTemplate.from_template(template)
+            detailed_info[theme] = None  # 주제 순서 유지용 자리
+            tasks.append((theme, context))
+
+        def extract_theme(task):
+            theme, context = task
+            logger.info(f"  - 심층 분석 중... ({theme})")
+            prompt = PromptTemplate.from_template(extraction_prompts[theme])
             chain = prompt | self.llm | StrOutputParser()
             try:
                 raw_output = chain.invoke({"context": context})
                 extracted_data = self._clean_and_parse_json(raw_output)
                 if extracted_data is not None:
-                    detailed_info[theme] = extracted_data
-                else:
-                    detailed_info[theme] = {"error": "LLM 출력에서 JSON을 찾지 못함"}
+                    return extracted_data
+                return {"error": "LLM 출력에서 JSON을 찾지 못함"}
             except Exception as e:
                 logger.error(f"  - '{theme}' 정보 추출 실패: {e}")
-                detailed_info[theme] = {"error": str(e)}
+                return {"error": str(e)}
+
+        # 주제별 프롬프트는 서로 독립적이므로 동시에 실행합니다. (결과는 주제 순서대로)
+        if tasks:
+            with ThreadPoolExecutor(max_workers=min(self.concurrency, len(tasks))) as executor:
+                for (theme, _), extracted_data in zip(tasks, executor.map(extract_theme, tasks)):
+                    detailed_info[theme] = extracted_data
         logger.info("심층 정보 추출 완료.")
         return detailed_info
 
@@ -355,12 +399,13 @@ def main():
     parser.add_argument("md_path", type=str, help="분석할 마크다운 파일의 경로")
     parser.add_argument("--output_dir", type=str, default="analysis_results", help="분석 결과가 저장될 디렉토리")
     parser.add_argument("--model", type=str, default=MODEL_ID, help="Ollama 모델 ID")
-    parser.add_argument("--url", type=str, default=BASE_URL, help="Ollama 서버 URL")
+    parser.add_argument("--url", type=str, default=BASE_URL, help="Ollama 서버 URL (미지정 시 게이트웨이 서버 풀 사용)")
+    parser.add_argument("--concurrency", type=int, default=LLM_CONCURRENCY, help="동시 LLM 호출 수 (미지정 시 게이트웨이 서버 풀 용량)")
     args = parser.parse_args()
     if not OLLAMA_AVAILABLE:
         logger.error("필수 라이브러리가 없어 프로그램을 종료합니다. 설치 안내를 확인하세요.")
         return
-    analyzer = VisionMDAnalyzer(model_id=args.model, base_url=args.url)
+    analyzer = VisionMDAnalyzer(model_id=args.model, base_url=args.url, concurrency=args.concurrency)
     if not analyzer.use_llm:
         logger.error("LLM을 사용할 수 없어 프로그램을 종료합니다.")
         return